@@ -0,0 +1,295 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+An asyncio transport for EClient.
+The protocol frames the messages in data_received() and decodes them inline
+on the event loop: there is no reader thread, no message queue and no run()
+loop. All the EClient requests work unchanged, they just have to be called
+from the event loop thread. Request/response calls also have awaitable
+versions (reqContractDetailsAsync, reqHistoricalDataAsync) that resolve to
+the list of answers.
+"""
+
+import asyncio
+import logging
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.common import BarData, TagValueList, TickerId
+from ibapi.const import NO_VALID_ID
+from ibapi.contract import Contract
+from ibapi.errors import CONNECT_FAIL, NOT_CONNECTED
+from ibapi.object_implem import Object
+from ibapi.server_versions import MIN_CLIENT_VER, MAX_CLIENT_VER
+from ibapi.utils import BadMessage, ClientException
+
+logger = logging.getLogger(__name__)
+
+
+def isWarning(errorCode) -> bool:
+    # 21xx codes are warnings, the request goes on
+    return 2100 <= errorCode < 2200
+
+
+class AsyncConnection(Object):
+    """Stands in for connection.Connection on top of an asyncio transport"""
+
+    def __init__(self, host, port, transport):
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.wrapper = None
+
+    def isConnected(self):
+        return self.transport is not None
+
+    def sendMsg(self, msg):
+        if not self.isConnected():
+            logger.debug("sendMsg attempted while not connected")
+            return 0
+        self.transport.write(msg)
+        return len(msg)
+
+    def flush(self):
+        # the transport already coalesces the writes of one loop iteration
+        pass
+
+    def disconnect(self):
+        if self.transport is not None:
+            logger.debug("disconnecting")
+            self.transport.close()
+            self.transport = None
+
+
+class EClientProtocol(asyncio.Protocol):
+    def __init__(self, client):
+        self.client = client
+        self.buf = bytearray()
+
+    def data_received(self, data):
+        buf = self.buf
+        buf += data
+        pos = 0
+        with memoryview(buf) as view:
+            while True:
+                (size, msg, pos) = comm.read_msg_from(view, pos)
+                if msg is None:
+                    break
+                if msg:
+                    self.client.processMsg(msg)
+        del buf[:pos]
+
+    def connection_lost(self, exc):
+        logger.debug("connection lost: %s", exc)
+        self.client.connectionLost(self)
+
+
+class RequestWrapper(Object):
+    """Forwards every callback to the application's wrapper. The answers to
+    a request started with expect() are also collected into its future."""
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.pending = {}
+
+    def __getattr__(self, name):
+        return getattr(self.wrapper, name)
+
+    def expect(self, reqId) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[reqId] = (future, [])
+        return future
+
+    def collect(self, reqId, answer):
+        entry = self.pending.get(reqId)
+        if entry is not None:
+            entry[1].append(answer)
+
+    def finish(self, reqId):
+        entry = self.pending.pop(reqId, None)
+        if entry is not None and not entry[0].done():
+            entry[0].set_result(entry[1])
+
+    def fail(self, reqId, ex):
+        entry = self.pending.pop(reqId, None)
+        if entry is not None and not entry[0].done():
+            entry[0].set_exception(ex)
+
+    def failAll(self, ex):
+        for reqId in list(self.pending):
+            self.fail(reqId, ex)
+
+    def error(self, reqId: TickerId, errorCode: int, errorString: str, advancedOrderRejectJson=""):
+        self.wrapper.error(reqId, errorCode, errorString, advancedOrderRejectJson)
+        if reqId in self.pending and not isWarning(errorCode):
+            self.fail(reqId, ClientException(errorCode, errorString, advancedOrderRejectJson))
+
+    def contractDetails(self, reqId: int, contractDetails):
+        self.collect(reqId, contractDetails)
+        self.wrapper.contractDetails(reqId, contractDetails)
+
+    def bondContractDetails(self, reqId: int, contractDetails):
+        self.collect(reqId, contractDetails)
+        self.wrapper.bondContractDetails(reqId, contractDetails)
+
+    def contractDetailsEnd(self, reqId: int):
+        self.wrapper.contractDetailsEnd(reqId)
+        self.finish(reqId)
+
+    def historicalData(self, reqId: int, bar: BarData):
+        self.collect(reqId, bar)
+        self.wrapper.historicalData(reqId, bar)
+
+    def historicalDataBulk(self, reqId: int, bars, start: str, end: str):
+        self.collect(reqId, bars)
+        self.wrapper.historicalDataBulk(reqId, bars, start, end)
+
+    def historicalDataEnd(self, reqId: int, start: str, end: str):
+        self.wrapper.historicalDataEnd(reqId, start, end)
+        self.finish(reqId)
+
+
+class AsyncEClient(EClient):
+    def __init__(self, wrapper):
+        self.requests = RequestWrapper(wrapper)
+        EClient.__init__(self, self.requests)
+        self.handshake = None
+
+    async def connectAsync(self, host, port, clientId):
+        """Same as EClient.connect(), returns once the server version is
+        known and startApi has been sent"""
+
+        try:
+            self.validateInvalidSymbols(host)
+        except ClientException as ex:
+            self.wrapper.error(NO_VALID_ID, ex.code, ex.msg + ex.text)
+            return
+
+        self.host = host
+        self.port = port
+        self.clientId = clientId
+        logger.debug("Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId)
+
+        loop = asyncio.get_running_loop()
+        try:
+            (transport, _) = await loop.create_connection(
+                lambda: EClientProtocol(self), host, port
+            )
+        except OSError:
+            self.wrapper.error(NO_VALID_ID, CONNECT_FAIL.code(), CONNECT_FAIL.msg())
+            logger.info("could not connect")
+            return
+
+        self.conn = AsyncConnection(host, port, transport)
+        self.setConnState(EClient.CONNECTING)
+
+        v100prefix = "API\0"
+        v100version = "v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)
+        if self.connectOptions:
+            v100version = v100version + " " + self.connectOptions
+        self.conn.sendMsg(str.encode(v100prefix, "ascii") + comm.make_msg(v100version))
+
+        from ibapi.decoder import Decoder
+
+        self.decoder = Decoder(
+            self.wrapper,
+            self.serverVersion(),
+            self.fastMarketData,
+            self.bulkHistoricalData,
+        )
+        if self.profiler is not None:
+            self.decoder.setProfiler(self.profiler)
+        self.handshake = loop.create_future()
+        try:
+            await self.handshake
+        except ClientException:
+            logger.warning("Disconnected; resetting connection")
+            self.reset()
+            return
+        finally:
+            self.handshake = None
+
+        self.setConnState(EClient.CONNECTED)
+        logger.info("sent startApi")
+        self.startApi()
+        self.wrapper.connectAck()
+
+    def processMsg(self, text):
+        """Decodes one message and dispatches it, on the event loop thread"""
+
+        fields = comm.read_fields(text)
+        logger.debug("fields %s", fields)
+        # sometimes news come before the server version
+        if self.handshake is not None and not self.handshake.done() and len(fields) == 2:
+            # set right away, the next messages may be in the same chunk
+            (server_version, conn_time) = fields
+            logger.debug("ANSWER Version:%s time:%s", server_version, conn_time)
+            self.connTime = conn_time
+            self.serverVersion_ = int(server_version)
+            self.decoder.serverVersion = self.serverVersion()
+            self.handshake.set_result(fields)
+            return
+        try:
+            self.decoder.interpret(fields)
+        except BadMessage:
+            logger.info("BadMessage")
+
+    def connectionLost(self, protocol):
+        ex = ClientException(NOT_CONNECTED.code(), NOT_CONNECTED.msg(), "")
+        if self.handshake is not None and not self.handshake.done():
+            self.handshake.set_exception(ex)
+        self.requests.failAll(ex)
+        # nothing more to do if disconnect() was called
+        if self.conn is not None and self.conn.transport is not None:
+            self.conn.transport = None
+            self.setConnState(EClient.DISCONNECTED)
+            self.wrapper.connectionClosed()
+            self.reset()
+
+    def run(self):
+        """There is no reader thread to loop on: messages are decoded by the
+        protocol as they arrive, on the event loop running connectAsync()"""
+
+        raise RuntimeError(
+            "AsyncEClient has no message loop of its own; await connectAsync() "
+            "inside a running asyncio event loop (e.g. asyncio.run()) instead of calling run()"
+        )
+
+    async def reqContractDetailsAsync(self, reqId: int, contract: Contract) -> list:
+        """reqContractDetails(), resolves to the list of ContractDetails"""
+
+        future = self.requests.expect(reqId)
+        self.reqContractDetails(reqId, contract)
+        return await future
+
+    async def reqHistoricalDataAsync(
+        self,
+        reqId: TickerId,
+        contract: Contract,
+        endDateTime: str,
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        useRTH: int,
+        formatDate: int,
+        chartOptions: TagValueList,
+    ) -> list:
+        """reqHistoricalData() without keepUpToDate, resolves to the list of
+        BarData, or to a one element list holding the bars with
+        setBulkHistoricalData(True)"""
+
+        future = self.requests.expect(reqId)
+        self.reqHistoricalData(
+            reqId,
+            contract,
+            endDateTime,
+            durationStr,
+            barSizeSetting,
+            whatToShow,
+            useRTH,
+            formatDate,
+            False,
+            chartOptions,
+        )
+        return await future
@@ -10,15 +10,18 @@ It takes care of almost everything:
 The user just needs to override EWrapper methods to receive the answers.
 """
 
+import copy
 import logging
 import queue
 import socket
 import sys
 
-from ibapi import decoder, reader, comm
-from ibapi.comm import make_field, make_field_handle_empty
+from ibapi import reader, comm
+from ibapi.comm import make_contract_fields, make_field, make_field_handle_empty
 from ibapi.common import *  # @UnusedWildImport
-from ibapi.connection import Connection
+from ibapi.connection import Connection, DEFAULT_RECV_BUF_SIZE
+from ibapi.msg_queue import MsgQueue, BLOCK
+from ibapi.conflation import MarketDataConflator
 from ibapi.const import NO_VALID_ID, MAX_MSG_LEN, UNSET_INTEGER, UNSET_DOUBLE
 from ibapi.contract import Contract
 from ibapi.errors import (
@@ -33,6 +36,7 @@ from ibapi.execution import ExecutionFilter
 from ibapi.message import OUT
 from ibapi.order import Order, COMPETE_AGAINST_BEST_OFFSET_UP_TO_MID
 from ibapi.order_cancel import OrderCancel
+from ibapi.order_template import OrderTemplate, OrderTemplateSlot
 from ibapi.scanner import ScannerSubscription
 from ibapi.server_versions import (
     MIN_SERVER_VER_OPTIONAL_CAPABILITIES,
@@ -121,7 +125,7 @@ from ibapi.server_versions import (
     MIN_SERVER_VER_RFQ_FIELDS
 )
 
-from ibapi.utils import ClientException, log_
+from ibapi.utils import ClientException, apiLogging, log_
 from ibapi.utils import (
     current_fn_name,
     BadMessage,
@@ -143,7 +147,7 @@ class EClient(object):
     # TODO: support redirect !!
 
     def __init__(self, wrapper):
-        self.msg_queue = queue.Queue()
+        self.msg_queue = MsgQueue()
         self.wrapper = wrapper
         self.decoder = None
         self.nKeybIntHard = 0
@@ -161,6 +165,15 @@ class EClient(object):
         self.decode = None
         self.setConnState(EClient.DISCONNECTED)
         self.connectOptions = None
+        self.recvBufSize = DEFAULT_RECV_BUF_SIZE
+        self.useSelector = False
+        self.inlineDecode = False
+        self.msgBatchSize = 1
+        self.fastMarketData = False
+        self.bulkHistoricalData = False
+        self.sendBatching = False
+        self.profiler = None
+        self.conflator = None
         self.reset()
 
     def reset(self):
@@ -183,11 +196,12 @@ class EClient(object):
     def setConnState(self, connState):
         _connState = self.connState
         self.connState = connState
-        logger.debug(f"{id(self)} connState: {_connState} -> {self.connState}")
+        logger.debug("%s connState: %s -> %s", id(self), _connState, self.connState)
 
     def sendMsg(self, msg):
         full_msg = comm.make_msg(msg)
-        logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
+        if apiLogging.on:
+            logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
         self.conn.sendMsg(full_msg)
 
     def logRequest(self, fnName, fnParams):
@@ -219,7 +233,8 @@ class EClient(object):
         """Initiates the message exchange between the client application and
         the TWS/IB Gateway."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -264,16 +279,17 @@ class EClient(object):
             self.host = host
             self.port = port
             self.clientId = clientId
+            apiLogging.refresh()
             logger.debug(
                 "Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId
             )
 
-            self.conn = Connection(self.host, self.port)
+            self.conn = Connection(self.host, self.port, self.recvBufSize)
 
             self.conn.connect()
             self.setConnState(EClient.CONNECTING)
 
-            # TODO: support async mode
+            # see ibapi.async_client for the asyncio transport
 
             v100prefix = "API\0"
             v100version = "v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)
@@ -288,7 +304,17 @@ class EClient(object):
             logger.debug("REQUEST %s", msg2)
             self.conn.sendMsg(msg2)
 
-            self.decoder = decoder.Decoder(self.wrapper, self.serverVersion())
+            # imported on first use, while TWS answers the handshake
+            from ibapi.decoder import Decoder
+
+            self.decoder = Decoder(
+                self.wrapper,
+                self.serverVersion(),
+                self.fastMarketData,
+                self.bulkHistoricalData,
+            )
+            if self.profiler is not None:
+                self.decoder.setProfiler(self.profiler)
             fields = []
 
             # sometimes I get news before the server version, thus the loop
@@ -319,8 +345,14 @@ class EClient(object):
 
             self.setConnState(EClient.CONNECTED)
 
-            self.reader = reader.EReader(self.conn, self.msg_queue)
-            self.reader.start()  # start thread
+            if self.inlineDecode:
+                # run() reads the socket itself, time out as often as the queue poll
+                self.conn.socket.settimeout(0.2)
+            else:
+                if self.useSelector:
+                    self.conn.startSelector()
+                self.reader = reader.EReader(self.conn, self.msg_queue)
+                self.reader.start()  # start thread
             logger.info("sent startApi")
             self.startApi()
             self.wrapper.connectAck()
@@ -347,7 +379,7 @@ class EClient(object):
 
         connConnected = self.conn and self.conn.isConnected()
         logger.debug(
-            f"{id(self)} isConn: {self.connState}, connConnected: {str(connConnected)}"
+            "%s isConn: %s, connConnected: %s", id(self), self.connState, connConnected
         )
         return EClient.CONNECTED == self.connState and connConnected
 
@@ -363,6 +395,86 @@ class EClient(object):
     def setConnectOptions(self, opts):
         self.connectOptions = opts
 
+    def setRecvBufferSize(self, size):
+        """Initial size in bytes of the reader's receive buffer, it grows
+        when a burst does not fit. Takes effect on the next connect()."""
+        self.recvBufSize = size
+
+    def setUseSelector(self, useSelector):
+        """Makes the reader thread block on socket readiness and run() block
+        on the message queue, instead of both polling with timeouts. Idle
+        CPU use is zero, but msgLoopTmo() is never called in this mode.
+        Takes effect on the next connect()."""
+        self.useSelector = useSelector
+
+    def setInlineDecode(self, inlineDecode):
+        """Makes run() read the socket and decode the messages itself, with
+        no reader thread and no queue hand-off in between. msgLoopRec() is
+        then called once per socket read rather than once per message.
+        Takes precedence over setUseSelector(), takes effect on the next
+        connect()."""
+        self.inlineDecode = inlineDecode
+
+    def setMsgBatchSize(self, msgBatchSize):
+        """Lets run() take up to msgBatchSize messages off the queue per
+        wakeup; msgLoopRec() is then called once per batch."""
+        self.msgBatchSize = msgBatchSize
+
+    def setFastMarketData(self, fastMarketData):
+        """Tick callbacks get shared attribute objects, which must not be
+        modified or kept, and float sizes instead of Decimal. Meant for
+        consumers that mostly need the price."""
+        self.fastMarketData = fastMarketData
+        if self.decoder is not None:
+            self.decoder.setFastMarketData(fastMarketData)
+
+    def setBulkHistoricalData(self, bulkHistoricalData):
+        """Historical data responses are delivered whole, as columns, to
+        EWrapper.historicalDataBulk() instead of one historicalData() call
+        per bar. historicalDataEnd() is still called."""
+        self.bulkHistoricalData = bulkHistoricalData
+        if self.decoder is not None:
+            self.decoder.setBulkHistoricalData(bulkHistoricalData)
+
+    def setMsgQueue(self, maxsize, policy=BLOCK):
+        """Bounds the queue between the reader thread and run() to maxsize
+        messages (0: unbounded). policy says what the reader does when it
+        is full, see ibapi.msg_queue. Call it before connect(); there is no
+        queue with setInlineDecode(True)."""
+        self.msg_queue = MsgQueue(maxsize, policy)
+
+    def queueMetrics(self) -> dict:
+        """depth, high-water mark, drops and message age at dequeue of the
+        reader to run() queue"""
+        return self.msg_queue.metrics()
+
+    def setConflation(self, conflation):
+        """Keeps only the latest market data update per (reqId, tickType)
+        within each batch the message loop handles, see ibapi.conflation.
+        Batches are the socket reads with setInlineDecode(True), else the
+        queue drains of setMsgBatchSize(). Order related messages are never
+        conflated and keep their order."""
+        self.conflator = MarketDataConflator() if conflation else None
+
+    def setProfiler(self, profiler):
+        """Counts and times the incoming messages per message type into
+        profiler, an ibapi.profiler.MsgProfiler; None stops profiling."""
+        self.profiler = profiler
+        if self.decoder is not None:
+            self.decoder.setProfiler(profiler)
+
+    def setSendBatching(self, sendBatching):
+        """Coalesces the requests that the callbacks of one pass of run()
+        send (e.g. reqMktData for every symbol in nextValidId) into a
+        single socket write at the end of the pass. flush() sends them
+        right away; placeOrder() flushes for orders with transmit set."""
+        self.sendBatching = sendBatching
+
+    def flush(self):
+        """Sends the requests held back by setSendBatching() now"""
+        if self.conn is not None:
+            self.conn.flush()
+
     def setOptionalCapabilities(self, optCapab):
         self.optCapab = optCapab
 
@@ -374,35 +486,78 @@ class EClient(object):
         # intended to be overloaded
         pass
 
+    def processMsg(self, text) -> bool:
+        """Decodes one message and calls the wrapper; returns False if the
+        message is too long to be valid"""
+
+        if len(text) > MAX_MSG_LEN:
+            self.wrapper.error(
+                NO_VALID_ID,
+                BAD_LENGTH.code(),
+                f"{BAD_LENGTH.msg()}:{len(text)}:{text}",
+            )
+            return False
+        fields = comm.read_fields(text)
+        logger.debug("fields %s", fields)
+        self.decoder.interpret(fields)
+        return True
+
+    def getMsgs(self, timeout) -> list:
+        """Waits for a message, then takes what else is queued up to msgBatchSize"""
+
+        msgs = [self.msg_queue.get(block=True, timeout=timeout)]
+        while len(msgs) < self.msgBatchSize:
+            try:
+                msgs.append(self.msg_queue.get_nowait())
+            except queue.Empty:
+                break
+        return msgs
+
     def run(self):
         """This is the function that has the message loop."""
 
+        if self.inlineDecode:
+            self.runInline()
+            return
+
+        timeout = None if self.useSelector else 0.2
+        badLength = False
         try:
-            while self.isConnected() or not self.msg_queue.empty():
+            while (self.isConnected() or not self.msg_queue.empty()) and not badLength:
                 try:
                     try:
-                        text = self.msg_queue.get(block=True, timeout=0.2)
-                        if len(text) > MAX_MSG_LEN:
-                            self.wrapper.error(
-                                NO_VALID_ID,
-                                BAD_LENGTH.code(),
-                                f"{BAD_LENGTH.msg()}:{len(text)}:{text}",
-                            )
-                            break
+                        msgs = self.getMsgs(timeout)
                     except queue.Empty:
                         logger.debug("queue.get: empty")
                         self.msgLoopTmo()
                     else:
-                        fields = comm.read_fields(text)
-                        logger.debug("fields %s", fields)
-                        self.decoder.interpret(fields)
-                        self.msgLoopRec()
+                        if self.conflator is not None:
+                            msgs = self.conflator.conflate(msgs)
+                        # a callback may have disconnected with messages still queued
+                        conn = self.conn
+                        batching = self.sendBatching and conn is not None and conn.isConnected()
+                        if batching:
+                            conn.startBatch()
+                        try:
+                            for text in msgs:
+                                # None: the reader thread finished
+                                if text is None:
+                                    continue
+                                try:
+                                    if not self.processMsg(text):
+                                        badLength = True
+                                        break
+                                except BadMessage:
+                                    logger.info("BadMessage")
+                            else:
+                                self.msgLoopRec()
+                        finally:
+                            if batching:
+                                conn.endBatch()
                 except (KeyboardInterrupt, SystemExit):
                     logger.info("detected KeyboardInterrupt, SystemExit")
                     self.keyboardInterrupt()
                     self.keyboardInterruptHard()
-                except BadMessage:
-                    logger.info("BadMessage")
 
                 logger.debug(
                     "conn:%d queue.sz:%d", self.isConnected(), self.msg_queue.qsize()
@@ -410,10 +565,61 @@ class EClient(object):
         finally:
             self.disconnect()
 
+    def runInline(self):
+        """The message loop of setInlineDecode(True) mode"""
+
+        buf = bytearray(self.conn.recvBufSize)
+        end = 0
+        try:
+            while self.isConnected():
+                try:
+                    prevEnd = end
+                    end = self.conn.recvInto(buf, end)
+                    if end == prevEnd:
+                        self.msgLoopTmo()
+                        continue
+
+                    conn = self.conn
+                    batching = self.sendBatching and conn is not None and conn.isConnected()
+                    if batching:
+                        conn.startBatch()
+                    try:
+                        pos = 0
+                        msgs = []
+                        with memoryview(buf)[:end] as view:
+                            while True:
+                                (size, text, pos) = comm.read_msg_from(view, pos)
+                                if text is None:
+                                    break
+                                if text:
+                                    msgs.append(text)
+                        if pos:
+                            buf[: end - pos] = buf[pos:end]
+                            end -= pos
+                        if self.conflator is not None:
+                            msgs = self.conflator.conflate(msgs)
+                        for text in msgs:
+                            try:
+                                if not self.processMsg(text):
+                                    return
+                            except BadMessage:
+                                logger.info("BadMessage")
+                        self.msgLoopRec()
+                    finally:
+                        if batching:
+                            conn.endBatch()
+                except (KeyboardInterrupt, SystemExit):
+                    logger.info("detected KeyboardInterrupt, SystemExit")
+                    self.keyboardInterrupt()
+                    self.keyboardInterruptHard()
+        finally:
+            self.disconnect()
+
     def reqCurrentTime(self):
         """Asks the current system time on the server side."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -434,7 +640,8 @@ class EClient(object):
         """The default detail level is ERROR. For more details, see API
         Logging."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -485,7 +692,8 @@ class EClient(object):
         mktDataOptions:TagValueList - For internal use only.
             Use default value XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -537,16 +745,7 @@ class EClient(object):
                 ]
 
             flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),  # srv v15 and above
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),  # srv v14 and above
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
             ]  # srv v2 and above
 
             if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
@@ -616,7 +815,8 @@ class EClient(object):
         reqId: TickerId - The ID that was specified in the call to
             reqMktData()."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -647,7 +847,8 @@ class EClient(object):
         marketDataType:int - 1 for real-time streaming market data or 2 for
             frozen market data"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -675,7 +876,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqSmartComponents(self, reqId: int, bboExchange: str):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -703,7 +905,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqMarketRule(self, marketRuleId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -729,7 +932,8 @@ class EClient(object):
         numberOfTicks: int,
         ignoreSize: bool,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -782,7 +986,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelTickByTickData(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -821,7 +1026,8 @@ class EClient(object):
         optionPrice:double - The price of the option.
         underPrice:double - Price of the underlying."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -857,16 +1063,7 @@ class EClient(object):
                 make_field(reqId),
                 # send contract fields
                 make_field(contract.conId),
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
             ]
             if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
                 flds += [
@@ -896,7 +1093,8 @@ class EClient(object):
 
         reqId:TickerId - The request ID."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -937,7 +1135,8 @@ class EClient(object):
         volatility:double - The volatility.
         underPrice:double - Price of the underlying."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -973,16 +1172,7 @@ class EClient(object):
                 make_field(reqId),
                 # send contract fields
                 make_field(contract.conId),
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
             ]
             if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
                 flds += [
@@ -1012,7 +1202,8 @@ class EClient(object):
 
         reqId:TickerId - The request ID."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1067,7 +1258,8 @@ class EClient(object):
         customerAccount:str - customer account
         professionalCustomer:bool - professinal customer"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1187,12 +1379,92 @@ class EClient(object):
         order:Order - This structure contains the details of tradedhe order.
             Note: Each client MUST connect with a unique clientId."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
+
+        if not self.isConnected():
+            self.wrapper.error(orderId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
+            return
+
+        if not self._validatePlaceOrder(orderId, contract, order):
+            return
+
+        try:
+            msg = self._encodePlaceOrder(orderId, contract, order)
+        except ClientException as ex:
+            self.wrapper.error(orderId, ex.code, ex.msg + ex.text)
+            return
+
+        self.sendMsg(msg)
+        if order.transmit:
+            # the last leg of a bracket sends the whole bracket
+            self.conn.flush()
+
+    def compileOrderTemplate(self, contract: Contract, order: Order):
+        """Encodes everything about an order that doesn't change between
+        placements, so that placeOrderTemplate() only has to fill in the
+        ids, quantity and prices. Returns None (after reporting through
+        error()) if the order can't be placed on this connection.
+
+        contract:Contract - The contract the template will trade.
+        order:Order - The order attributes; orderId, totalQuantity, lmtPrice,
+            auxPrice and parentId are ignored and supplied at placement."""
+
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
+
+        if not self.isConnected():
+            self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
+            return None
+
+        if not self._validatePlaceOrder(NO_VALID_ID, contract, order):
+            return None
+
+        order = copy.copy(order)
+        for name in OrderTemplate.SLOTS[1:]:
+            setattr(order, name, OrderTemplateSlot(name))
+
+        try:
+            text = self._encodePlaceOrder(OrderTemplateSlot("orderId"), contract, order)
+        except ClientException as ex:
+            self.wrapper.error(NO_VALID_ID, ex.code, ex.msg + ex.text)
+            return None
+
+        return OrderTemplate(
+            text,
+            order.transmit,
+            wholeQuantity=self.serverVersion() < MIN_SERVER_VER_FRACTIONAL_POSITIONS,
+            zeroLmtPrice=self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
+            zeroAuxPrice=self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT,
+        )
+
+    def placeOrderTemplate(
+        self,
+        template: OrderTemplate,
+        orderId: OrderId,
+        totalQuantity,
+        lmtPrice: float = UNSET_DOUBLE,
+        auxPrice: float = UNSET_DOUBLE,
+        parentId: OrderId = 0,
+    ):
+        """Places (or modifies, when orderId is reused) an order compiled
+        with compileOrderTemplate()."""
 
         if not self.isConnected():
             self.wrapper.error(orderId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
+        self.conn.sendMsg(
+            template.render(orderId, totalQuantity, lmtPrice, auxPrice, parentId)
+        )
+        if template.transmit:
+            # the last leg of a bracket sends the whole bracket
+            self.conn.flush()
+
+    def _validatePlaceOrder(self, orderId: OrderId, contract: Contract, order: Order):
+        """Reports through wrapper.error and returns False if the connected
+        server can't handle some attribute of the order."""
+
         if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL:
             if contract.deltaNeutralContract:
                 self.wrapper.error(
@@ -1200,7 +1472,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support delta-neutral orders.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS2:
             if order.scaleSubsLevelSize != UNSET_INTEGER:
@@ -1210,7 +1482,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support Subsequent Level Size for Scale orders.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_ALGO_ORDERS:
             if order.algoStrategy:
@@ -1219,7 +1491,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support algo orders.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_NOT_HELD:
             if order.notHeld:
@@ -1228,7 +1500,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support notHeld parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SEC_ID_TYPE:
             if contract.secIdType or contract.secId:
@@ -1238,7 +1510,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support secIdType and secId parameters.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_PLACE_ORDER_CONID:
             if contract.conId and contract.conId > 0:
@@ -1247,7 +1519,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support conId parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
             if order.exemptCode != -1:
@@ -1256,7 +1528,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support exemptCode parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
             if contract.comboLegs:
@@ -1268,7 +1540,7 @@ class EClient(object):
                             UPDATE_TWS.msg()
                             + "  It does not support exemptCode parameter.",
                         )
-                        return
+                        return False
 
         if self.serverVersion() < MIN_SERVER_VER_HEDGE_ORDERS:
             if order.hedgeType:
@@ -1277,7 +1549,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support hedge orders.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
             if order.optOutSmartRouting:
@@ -1287,7 +1559,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support optOutSmartRouting parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_CONID:
             if (
@@ -1303,7 +1575,7 @@ class EClient(object):
                     + "  It does not support deltaNeutral parameters: "
                     + "ConId, SettlingFirm, ClearingAccount, ClearingIntent.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE:
             if (
@@ -1318,7 +1590,7 @@ class EClient(object):
                     UPDATE_TWS.msg() + "  It does not support deltaNeutral parameters: "
                     "OpenClose, ShortSale, ShortSaleSlot, DesignatedLocation.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS3:
             if (
@@ -1341,7 +1613,7 @@ class EClient(object):
                         + "  It does not support Scale order parameters: PriceAdjustValue, PriceAdjustInterval, "
                         + "ProfitOffset, AutoReset, InitPosition, InitFillQty and RandomPercent",
                     )
-                    return
+                    return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE
@@ -1356,7 +1628,7 @@ class EClient(object):
                             UPDATE_TWS.msg()
                             + "  It does not support per-leg prices for order combo legs.",
                         )
-                        return
+                        return False
 
         if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
             if order.trailingPercent != UNSET_DOUBLE:
@@ -1366,7 +1638,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support trailing percent parameter",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
             if contract.tradingClass:
@@ -1376,7 +1648,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support tradingClass parameter in placeOrder.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SCALE_TABLE:
             if order.scaleTable or order.activeStartTime or order.activeStopTime:
@@ -1386,7 +1658,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support scaleTable, activeStartTime and activeStopTime parameters",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_ALGO_ID:
             if order.algoId:
@@ -1395,7 +1667,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support algoId parameter",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_ORDER_SOLICITED:
             if order.solicited:
@@ -1405,7 +1677,7 @@ class EClient(object):
                     UPDATE_TWS.msg()
                     + "  It does not support order solicited parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
             if order.modelCode:
@@ -1414,7 +1686,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support model code parameter.",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_EXT_OPERATOR:
             if order.extOperator:
@@ -1423,7 +1695,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + "  It does not support ext operator parameter",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_SOFT_DOLLAR_TIER:
             if order.softDollarTier.name or order.softDollarTier.val:
@@ -1432,7 +1704,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + " It does not support soft dollar tier",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_CASH_QTY:
             if order.cashQty:
@@ -1441,7 +1713,7 @@ class EClient(object):
                     UPDATE_TWS.code(),
                     UPDATE_TWS.msg() + " It does not support cash quantity parameter",
                 )
-                return
+                return False
 
         if self.serverVersion() < MIN_SERVER_VER_DECISION_MAKER and (
             order.mifid2DecisionMaker != "" or order.mifid2DecisionAlgo != ""
@@ -1452,7 +1724,7 @@ class EClient(object):
                 UPDATE_TWS.msg()
                 + " It does not support MIFID II decision maker parameters",
             )
-            return
+            return False
 
         if self.serverVersion() < MIN_SERVER_VER_MIFID_EXECUTION and (
             order.mifid2ExecutionTrader != "" or order.mifid2ExecutionAlgo != ""
@@ -1462,7 +1734,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + " It does not support MIFID II execution parameters",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE
@@ -1474,7 +1746,7 @@ class EClient(object):
                 UPDATE_TWS.msg()
                 + " It does not support dontUseAutoPriceForHedge parameter",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER
@@ -1485,7 +1757,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + " It does not support oms container parameter",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_PRICE_MGMT_ALGO
@@ -1497,7 +1769,7 @@ class EClient(object):
                 UPDATE_TWS.msg()
                 + " It does not support Use price management algo requests",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_DURATION
@@ -1508,7 +1780,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + " It does not support duration attribute",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_POST_TO_ATS
@@ -1519,7 +1791,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + " It does not support postToAts attribute",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_AUTO_CANCEL_PARENT
@@ -1530,7 +1802,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + " It does not support autoCancelParent attribute",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_ADVANCED_ORDER_REJECT
@@ -1542,7 +1814,7 @@ class EClient(object):
                 UPDATE_TWS.msg()
                 + "  It does not support advanced error override attribute",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_MANUAL_ORDER_TIME
@@ -1553,7 +1825,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + "  It does not support manual order time attribute",
             )
-            return
+            return False
 
         if self.serverVersion() < MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
             if (
@@ -1570,7 +1842,7 @@ class EClient(object):
                     + "  It does not support PEG BEST / PEG MID order parameters: minTradeQty, minCompeteSize, "
                     + "competeAgainstBestOffset, midOffsetAtWhole and midOffsetAtHalf",
                 )
-                return
+                return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_CUSTOMER_ACCOUNT
@@ -1581,7 +1853,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + "  It does not support customer account parameter",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_PROFESSIONAL_CUSTOMER
@@ -1592,7 +1864,7 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + "  It does not support professional customer parameter",
             )
-            return
+            return False
 
         if (
             self.serverVersion() < MIN_SERVER_VER_RFQ_FIELDS
@@ -1603,450 +1875,442 @@ class EClient(object):
                 UPDATE_TWS.code(),
                 UPDATE_TWS.msg() + "  It does not support external user id and manual order indicator parameters",
             )
-            return
+            return False
 
-        try:
-            VERSION = 27 if (self.serverVersion() < MIN_SERVER_VER_NOT_HELD) else 45
+        return True
 
-            # send place order msg
-            flds = []
-            flds += [make_field(OUT.PLACE_ORDER)]
+    def _encodePlaceOrder(self, orderId: OrderId, contract: Contract, order: Order):
+        """Builds the PLACE_ORDER message text; may raise ClientException."""
 
-            if self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER:
-                flds += [make_field(VERSION)]
+        VERSION = 27 if (self.serverVersion() < MIN_SERVER_VER_NOT_HELD) else 45
 
-            flds += [make_field(orderId)]
+        # send place order msg
+        flds = []
+        flds += [make_field(OUT.PLACE_ORDER)]
 
-            # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_PLACE_ORDER_CONID:
-                flds.append(make_field(contract.conId))
-            flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),  # srv v15 and above
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),  # srv v14 and above
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
-            ]  # srv v2 and above
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-                flds.append(make_field(contract.tradingClass))
+        if self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER:
+            flds += [make_field(VERSION)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
-                flds += [make_field(contract.secIdType), make_field(contract.secId)]
+        flds += [make_field(orderId)]
 
-            # send main order fields
-            flds.append(make_field(order.action))
+        # send contract fields
+        if self.serverVersion() >= MIN_SERVER_VER_PLACE_ORDER_CONID:
+            flds.append(make_field(contract.conId))
+        flds += [
+            make_contract_fields(contract),
+        ]  # srv v2 and above
+        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            flds.append(make_field(contract.tradingClass))
 
-            if self.serverVersion() >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-                flds.append(make_field(order.totalQuantity))
-            else:
-                flds.append(make_field(int(order.totalQuantity)))
+        if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
+            flds += [make_field(contract.secIdType), make_field(contract.secId)]
 
-            flds.append(make_field(order.orderType))
-            if self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE:
-                flds.append(
-                    make_field(order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0)
-                )
-            else:
-                flds.append(make_field_handle_empty(order.lmtPrice))
-            if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
-                flds.append(
-                    make_field(order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0)
-                )
-            else:
-                flds.append(make_field_handle_empty(order.auxPrice))
+        # send main order fields
+        flds.append(make_field(order.action))
 
-                # send extended order fields
-                flds += [
-                    make_field(order.tif),
-                    make_field(order.ocaGroup),
-                    make_field(order.account),
-                    make_field(order.openClose),
-                    make_field(order.origin),
-                    make_field(order.orderRef),
-                    make_field(order.transmit),
-                    make_field(order.parentId),  # srv v4 and above
-                    make_field(order.blockOrder),  # srv v5 and above
-                    make_field(order.sweepToFill),  # srv v5 and above
-                    make_field(order.displaySize),  # srv v5 and above
-                    make_field(order.triggerMethod),  # srv v5 and above
-                    make_field(order.outsideRth),  # srv v5 and above
-                    make_field(order.hidden),
-                ]  # srv v7 and above
+        if self.serverVersion() >= MIN_SERVER_VER_FRACTIONAL_POSITIONS or isinstance(
+            order.totalQuantity, OrderTemplateSlot
+        ):
+            # a template slot is made a whole number at placement
+            flds.append(make_field(order.totalQuantity))
+        else:
+            flds.append(make_field(int(order.totalQuantity)))
+
+        flds.append(make_field(order.orderType))
+        if self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE:
+            flds.append(
+                make_field(order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0)
+            )
+        else:
+            flds.append(make_field_handle_empty(order.lmtPrice))
+        if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
+            flds.append(
+                make_field(order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0)
+            )
+        else:
+            flds.append(make_field_handle_empty(order.auxPrice))
 
-            # Send combo legs for BAG requests (srv v8 and above)
-            if contract.secType == "BAG":
-                comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
-                flds.append(make_field(comboLegsCount))
-                if comboLegsCount > 0:
-                    for comboLeg in contract.comboLegs:
-                        assert comboLeg
-                        flds += [
-                            make_field(comboLeg.conId),
-                            make_field(comboLeg.ratio),
-                            make_field(comboLeg.action),
-                            make_field(comboLeg.exchange),
-                            make_field(comboLeg.openClose),
-                            make_field(comboLeg.shortSaleSlot),  # srv v35 and above
-                            make_field(comboLeg.designatedLocation),
-                        ]  # srv v35 and above
-                        if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-                            flds.append(make_field(comboLeg.exemptCode))
-
-            # Send order combo legs for BAG requests
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE
-                and contract.secType == "BAG"
-            ):
-                orderComboLegsCount = (
-                    len(order.orderComboLegs) if order.orderComboLegs else 0
-                )
-                flds.append(make_field(orderComboLegsCount))
-                if orderComboLegsCount:
-                    for orderComboLeg in order.orderComboLegs:
-                        assert orderComboLeg
-                        flds.append(make_field_handle_empty(orderComboLeg.price))
+            # send extended order fields
+            flds += [
+                make_field(order.tif),
+                make_field(order.ocaGroup),
+                make_field(order.account),
+                make_field(order.openClose),
+                make_field(order.origin),
+                make_field(order.orderRef),
+                make_field(order.transmit),
+                make_field(order.parentId),  # srv v4 and above
+                make_field(order.blockOrder),  # srv v5 and above
+                make_field(order.sweepToFill),  # srv v5 and above
+                make_field(order.displaySize),  # srv v5 and above
+                make_field(order.triggerMethod),  # srv v5 and above
+                make_field(order.outsideRth),  # srv v5 and above
+                make_field(order.hidden),
+            ]  # srv v7 and above
+
+        # Send combo legs for BAG requests (srv v8 and above)
+        if contract.secType == "BAG":
+            comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
+            flds.append(make_field(comboLegsCount))
+            if comboLegsCount > 0:
+                for comboLeg in contract.comboLegs:
+                    assert comboLeg
+                    flds += [
+                        make_field(comboLeg.conId),
+                        make_field(comboLeg.ratio),
+                        make_field(comboLeg.action),
+                        make_field(comboLeg.exchange),
+                        make_field(comboLeg.openClose),
+                        make_field(comboLeg.shortSaleSlot),  # srv v35 and above
+                        make_field(comboLeg.designatedLocation),
+                    ]  # srv v35 and above
+                    if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
+                        flds.append(make_field(comboLeg.exemptCode))
+
+        # Send order combo legs for BAG requests
+        if (
+            self.serverVersion() >= MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE
+            and contract.secType == "BAG"
+        ):
+            orderComboLegsCount = (
+                len(order.orderComboLegs) if order.orderComboLegs else 0
+            )
+            flds.append(make_field(orderComboLegsCount))
+            if orderComboLegsCount:
+                for orderComboLeg in order.orderComboLegs:
+                    assert orderComboLeg
+                    flds.append(make_field_handle_empty(orderComboLeg.price))
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS
-                and contract.secType == "BAG"
-            ):
-                smartComboRoutingParamsCount = (
-                    len(order.smartComboRoutingParams)
-                    if order.smartComboRoutingParams
-                    else 0
-                )
-                flds.append(make_field(smartComboRoutingParamsCount))
-                if smartComboRoutingParamsCount > 0:
-                    for tagValue in order.smartComboRoutingParams:
-                        flds += [make_field(tagValue.tag), make_field(tagValue.value)]
-
-            ######################################################################
-            # Send the shares allocation.
-            #
-            # This specifies the number of order shares allocated to each Financial
-            # Advisor managed account. The format of the allocation string is as
-            # follows:
-            #                      <account_code1>/<number_shares1>,<account_code2>/<number_shares2>,...N
-            # E.g.
-            #              To allocate 20 shares of a 100 share order to account 'U101' and the
-            #      residual 80 to account 'U203' enter the following share allocation string:
-            #          U101/20,U203/80
-            #####################################################################
-            # send deprecated sharesAllocation field
+        if (
+            self.serverVersion() >= MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS
+            and contract.secType == "BAG"
+        ):
+            smartComboRoutingParamsCount = (
+                len(order.smartComboRoutingParams)
+                if order.smartComboRoutingParams
+                else 0
+            )
+            flds.append(make_field(smartComboRoutingParamsCount))
+            if smartComboRoutingParamsCount > 0:
+                for tagValue in order.smartComboRoutingParams:
+                    flds += [make_field(tagValue.tag), make_field(tagValue.value)]
+
+        ######################################################################
+        # Send the shares allocation.
+        #
+        # This specifies the number of order shares allocated to each Financial
+        # Advisor managed account. The format of the allocation string is as
+        # follows:
+        #                      <account_code1>/<number_shares1>,<account_code2>/<number_shares2>,...N
+        # E.g.
+        #              To allocate 20 shares of a 100 share order to account 'U101' and the
+        #      residual 80 to account 'U203' enter the following share allocation string:
+        #          U101/20,U203/80
+        #####################################################################
+        # send deprecated sharesAllocation field
+        flds += [
+            make_field(""),  # srv v9 and above
+            make_field(order.discretionaryAmt),  # srv v10 and above
+            make_field(order.goodAfterTime),  # srv v11 and above
+            make_field(order.goodTillDate),  # srv v12 and above
+            make_field(order.faGroup),  # srv v13 and above
+            make_field(order.faMethod),  # srv v13 and above
+            make_field(order.faPercentage),
+        ]  # srv v13 and above
+        if self.serverVersion() < MIN_SERVER_VER_FA_PROFILE_DESUPPORT:
+            flds.append(make_field(""))  # send deprecated faProfile field
+
+        if self.serverVersion() >= MIN_SERVER_VER_MODELS_SUPPORT:
+            flds.append(make_field(order.modelCode))
+
+        # institutional short saleslot data (srv v18 and above)
+        flds += [
+            make_field(
+                order.shortSaleSlot
+            ),  # 0 for retail, 1 or 2 for institutions
+            make_field(order.designatedLocation),
+        ]  # populate only when shortSaleSlot = 2.
+        if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
+            flds.append(make_field(order.exemptCode))
+
+        # srv v19 and above fields
+        flds.append(make_field(order.ocaType))
+        # if( self.serverVersion() < 38) {
+        # will never happen
+        #      send( /* order.rthOnly */ false)
+        # }
+        flds += [
+            make_field(order.rule80A),
+            make_field(order.settlingFirm),
+            make_field(order.allOrNone),
+            make_field_handle_empty(order.minQty),
+            make_field_handle_empty(order.percentOffset),
+            make_field(False),
+            make_field(False),
+            make_field_handle_empty(UNSET_DOUBLE),
+            make_field(
+                order.auctionStrategy
+            ),  # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
+            make_field_handle_empty(order.startingPrice),
+            make_field_handle_empty(order.stockRefPrice),
+            make_field_handle_empty(order.delta),
+            make_field_handle_empty(order.stockRangeLower),
+            make_field_handle_empty(order.stockRangeUpper),
+            make_field(order.overridePercentageConstraints),  # srv v22 and above
+            # Volatility orders (srv v26 and above)
+            make_field_handle_empty(order.volatility),
+            make_field_handle_empty(order.volatilityType),
+            make_field(order.deltaNeutralOrderType),  # srv v28 and above
+            make_field_handle_empty(order.deltaNeutralAuxPrice),
+        ]  # srv v28 and above
+
+        if (
+            self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_CONID
+            and order.deltaNeutralOrderType
+        ):
+            flds += [
+                make_field(order.deltaNeutralConId),
+                make_field(order.deltaNeutralSettlingFirm),
+                make_field(order.deltaNeutralClearingAccount),
+                make_field(order.deltaNeutralClearingIntent),
+            ]
+
+        if (
+            self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE
+            and order.deltaNeutralOrderType
+        ):
             flds += [
-                make_field(""),  # srv v9 and above
-                make_field(order.discretionaryAmt),  # srv v10 and above
-                make_field(order.goodAfterTime),  # srv v11 and above
-                make_field(order.goodTillDate),  # srv v12 and above
-                make_field(order.faGroup),  # srv v13 and above
-                make_field(order.faMethod),  # srv v13 and above
-                make_field(order.faPercentage),
-            ]  # srv v13 and above
-            if self.serverVersion() < MIN_SERVER_VER_FA_PROFILE_DESUPPORT:
-                flds.append(make_field(""))  # send deprecated faProfile field
-
-            if self.serverVersion() >= MIN_SERVER_VER_MODELS_SUPPORT:
-                flds.append(make_field(order.modelCode))
-
-            # institutional short saleslot data (srv v18 and above)
+                make_field(order.deltaNeutralOpenClose),
+                make_field(order.deltaNeutralShortSale),
+                make_field(order.deltaNeutralShortSaleSlot),
+                make_field(order.deltaNeutralDesignatedLocation),
+            ]
+
+        flds += [
+            make_field(order.continuousUpdate),
+            make_field_handle_empty(order.referencePriceType),
+            make_field_handle_empty(order.trailStopPrice),
+        ]  # srv v30 and above
+
+        if self.serverVersion() >= MIN_SERVER_VER_TRAILING_PERCENT:
+            flds.append(make_field_handle_empty(order.trailingPercent))
+
+        # SCALE orders
+        if self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS2:
             flds += [
-                make_field(
-                    order.shortSaleSlot
-                ),  # 0 for retail, 1 or 2 for institutions
-                make_field(order.designatedLocation),
-            ]  # populate only when shortSaleSlot = 2.
-            if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-                flds.append(make_field(order.exemptCode))
-
-            # srv v19 and above fields
-            flds.append(make_field(order.ocaType))
-            # if( self.serverVersion() < 38) {
-            # will never happen
-            #      send( /* order.rthOnly */ false)
-            # }
+                make_field_handle_empty(order.scaleInitLevelSize),
+                make_field_handle_empty(order.scaleSubsLevelSize),
+            ]
+        else:
+            # srv v35 and above)
             flds += [
-                make_field(order.rule80A),
-                make_field(order.settlingFirm),
-                make_field(order.allOrNone),
-                make_field_handle_empty(order.minQty),
-                make_field_handle_empty(order.percentOffset),
-                make_field(False),
-                make_field(False),
-                make_field_handle_empty(UNSET_DOUBLE),
-                make_field(
-                    order.auctionStrategy
-                ),  # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
-                make_field_handle_empty(order.startingPrice),
-                make_field_handle_empty(order.stockRefPrice),
-                make_field_handle_empty(order.delta),
-                make_field_handle_empty(order.stockRangeLower),
-                make_field_handle_empty(order.stockRangeUpper),
-                make_field(order.overridePercentageConstraints),  # srv v22 and above
-                # Volatility orders (srv v26 and above)
-                make_field_handle_empty(order.volatility),
-                make_field_handle_empty(order.volatilityType),
-                make_field(order.deltaNeutralOrderType),  # srv v28 and above
-                make_field_handle_empty(order.deltaNeutralAuxPrice),
-            ]  # srv v28 and above
+                make_field(""),  # for not supported scaleNumComponents
+                make_field_handle_empty(order.scaleInitLevelSize),
+            ]  # for scaleComponentSize
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_CONID
-                and order.deltaNeutralOrderType
-            ):
-                flds += [
-                    make_field(order.deltaNeutralConId),
-                    make_field(order.deltaNeutralSettlingFirm),
-                    make_field(order.deltaNeutralClearingAccount),
-                    make_field(order.deltaNeutralClearingIntent),
-                ]
+        flds.append(make_field_handle_empty(order.scalePriceIncrement))
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE
-                and order.deltaNeutralOrderType
-            ):
-                flds += [
-                    make_field(order.deltaNeutralOpenClose),
-                    make_field(order.deltaNeutralShortSale),
-                    make_field(order.deltaNeutralShortSaleSlot),
-                    make_field(order.deltaNeutralDesignatedLocation),
-                ]
+        if (
+            self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS3
+            and order.scalePriceIncrement != UNSET_DOUBLE
+            and order.scalePriceIncrement > 0.0
+        ):
+            flds += [
+                make_field_handle_empty(order.scalePriceAdjustValue),
+                make_field_handle_empty(order.scalePriceAdjustInterval),
+                make_field_handle_empty(order.scaleProfitOffset),
+                make_field(order.scaleAutoReset),
+                make_field_handle_empty(order.scaleInitPosition),
+                make_field_handle_empty(order.scaleInitFillQty),
+                make_field(order.scaleRandomPercent),
+            ]
 
+        if self.serverVersion() >= MIN_SERVER_VER_SCALE_TABLE:
             flds += [
-                make_field(order.continuousUpdate),
-                make_field_handle_empty(order.referencePriceType),
-                make_field_handle_empty(order.trailStopPrice),
-            ]  # srv v30 and above
+                make_field(order.scaleTable),
+                make_field(order.activeStartTime),
+                make_field(order.activeStopTime),
+            ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_TRAILING_PERCENT:
-                flds.append(make_field_handle_empty(order.trailingPercent))
+        # HEDGE orders
+        if self.serverVersion() >= MIN_SERVER_VER_HEDGE_ORDERS:
+            flds.append(make_field(order.hedgeType))
+            if order.hedgeType:
+                flds.append(make_field(order.hedgeParam))
 
-            # SCALE orders
-            if self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS2:
-                flds += [
-                    make_field_handle_empty(order.scaleInitLevelSize),
-                    make_field_handle_empty(order.scaleSubsLevelSize),
-                ]
-            else:
-                # srv v35 and above)
-                flds += [
-                    make_field(""),  # for not supported scaleNumComponents
-                    make_field_handle_empty(order.scaleInitLevelSize),
-                ]  # for scaleComponentSize
+        if self.serverVersion() >= MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
+            flds.append(make_field(order.optOutSmartRouting))
 
-            flds.append(make_field_handle_empty(order.scalePriceIncrement))
+        if self.serverVersion() >= MIN_SERVER_VER_PTA_ORDERS:
+            flds += [
+                make_field(order.clearingAccount),
+                make_field(order.clearingIntent),
+            ]
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS3
-                and order.scalePriceIncrement != UNSET_DOUBLE
-                and order.scalePriceIncrement > 0.0
-            ):
-                flds += [
-                    make_field_handle_empty(order.scalePriceAdjustValue),
-                    make_field_handle_empty(order.scalePriceAdjustInterval),
-                    make_field_handle_empty(order.scaleProfitOffset),
-                    make_field(order.scaleAutoReset),
-                    make_field_handle_empty(order.scaleInitPosition),
-                    make_field_handle_empty(order.scaleInitFillQty),
-                    make_field(order.scaleRandomPercent),
-                ]
+        if self.serverVersion() >= MIN_SERVER_VER_NOT_HELD:
+            flds.append(make_field(order.notHeld))
 
-            if self.serverVersion() >= MIN_SERVER_VER_SCALE_TABLE:
+        if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
+            if contract.deltaNeutralContract:
                 flds += [
-                    make_field(order.scaleTable),
-                    make_field(order.activeStartTime),
-                    make_field(order.activeStopTime),
+                    make_field(True),
+                    make_field(contract.deltaNeutralContract.conId),
+                    make_field(contract.deltaNeutralContract.delta),
+                    make_field(contract.deltaNeutralContract.price),
                 ]
+            else:
+                flds.append(make_field(False))
 
-            # HEDGE orders
-            if self.serverVersion() >= MIN_SERVER_VER_HEDGE_ORDERS:
-                flds.append(make_field(order.hedgeType))
-                if order.hedgeType:
-                    flds.append(make_field(order.hedgeParam))
+        if self.serverVersion() >= MIN_SERVER_VER_ALGO_ORDERS:
+            flds.append(make_field(order.algoStrategy))
+            if order.algoStrategy:
+                algoParamsCount = len(order.algoParams) if order.algoParams else 0
+                flds.append(make_field(algoParamsCount))
+                if algoParamsCount > 0:
+                    for algoParam in order.algoParams:
+                        flds += [
+                            make_field(algoParam.tag),
+                            make_field(algoParam.value),
+                        ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
-                flds.append(make_field(order.optOutSmartRouting))
+        if self.serverVersion() >= MIN_SERVER_VER_ALGO_ID:
+            flds.append(make_field(order.algoId))
 
-            if self.serverVersion() >= MIN_SERVER_VER_PTA_ORDERS:
-                flds += [
-                    make_field(order.clearingAccount),
-                    make_field(order.clearingIntent),
-                ]
+        flds.append(make_field(order.whatIf))  # srv v36 and above
 
-            if self.serverVersion() >= MIN_SERVER_VER_NOT_HELD:
-                flds.append(make_field(order.notHeld))
+        # send miscOptions parameter
+        if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            miscOptionsStr = ""
+            if order.orderMiscOptions:
+                for tagValue in order.orderMiscOptions:
+                    miscOptionsStr += str(tagValue)
+            flds.append(make_field(miscOptionsStr))
 
-            if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
-                if contract.deltaNeutralContract:
-                    flds += [
-                        make_field(True),
-                        make_field(contract.deltaNeutralContract.conId),
-                        make_field(contract.deltaNeutralContract.delta),
-                        make_field(contract.deltaNeutralContract.price),
-                    ]
-                else:
-                    flds.append(make_field(False))
-
-            if self.serverVersion() >= MIN_SERVER_VER_ALGO_ORDERS:
-                flds.append(make_field(order.algoStrategy))
-                if order.algoStrategy:
-                    algoParamsCount = len(order.algoParams) if order.algoParams else 0
-                    flds.append(make_field(algoParamsCount))
-                    if algoParamsCount > 0:
-                        for algoParam in order.algoParams:
-                            flds += [
-                                make_field(algoParam.tag),
-                                make_field(algoParam.value),
-                            ]
-
-            if self.serverVersion() >= MIN_SERVER_VER_ALGO_ID:
-                flds.append(make_field(order.algoId))
-
-            flds.append(make_field(order.whatIf))  # srv v36 and above
-
-            # send miscOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
-                miscOptionsStr = ""
-                if order.orderMiscOptions:
-                    for tagValue in order.orderMiscOptions:
-                        miscOptionsStr += str(tagValue)
-                flds.append(make_field(miscOptionsStr))
+        if self.serverVersion() >= MIN_SERVER_VER_ORDER_SOLICITED:
+            flds.append(make_field(order.solicited))
 
-            if self.serverVersion() >= MIN_SERVER_VER_ORDER_SOLICITED:
-                flds.append(make_field(order.solicited))
+        if self.serverVersion() >= MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE:
+            flds += [
+                make_field(order.randomizeSize),
+                make_field(order.randomizePrice),
+            ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE:
+        if self.serverVersion() >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
+            if isPegBenchOrder(order.orderType):
                 flds += [
-                    make_field(order.randomizeSize),
-                    make_field(order.randomizePrice),
+                    make_field(order.referenceContractId),
+                    make_field(order.isPeggedChangeAmountDecrease),
+                    make_field(order.peggedChangeAmount),
+                    make_field(order.referenceChangeAmount),
+                    make_field(order.referenceExchangeId),
                 ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-                if isPegBenchOrder(order.orderType):
-                    flds += [
-                        make_field(order.referenceContractId),
-                        make_field(order.isPeggedChangeAmountDecrease),
-                        make_field(order.peggedChangeAmount),
-                        make_field(order.referenceChangeAmount),
-                        make_field(order.referenceExchangeId),
-                    ]
-
-                flds.append(make_field(len(order.conditions)))
-
-                if len(order.conditions) > 0:
-                    for cond in order.conditions:
-                        flds.append(make_field(cond.type()))
-                        flds += cond.make_fields()
+            flds.append(make_field(len(order.conditions)))
 
-                    flds += [
-                        make_field(order.conditionsIgnoreRth),
-                        make_field(order.conditionsCancelOrder),
-                    ]
+            if len(order.conditions) > 0:
+                for cond in order.conditions:
+                    flds.append(make_field(cond.type()))
+                    flds += cond.make_fields()
 
                 flds += [
-                    make_field(order.adjustedOrderType),
-                    make_field(order.triggerPrice),
-                    make_field(order.lmtPriceOffset),
-                    make_field(order.adjustedStopPrice),
-                    make_field(order.adjustedStopLimitPrice),
-                    make_field(order.adjustedTrailingAmount),
-                    make_field(order.adjustableTrailingUnit),
+                    make_field(order.conditionsIgnoreRth),
+                    make_field(order.conditionsCancelOrder),
                 ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_EXT_OPERATOR:
-                flds.append(make_field(order.extOperator))
+            flds += [
+                make_field(order.adjustedOrderType),
+                make_field(order.triggerPrice),
+                make_field(order.lmtPriceOffset),
+                make_field(order.adjustedStopPrice),
+                make_field(order.adjustedStopLimitPrice),
+                make_field(order.adjustedTrailingAmount),
+                make_field(order.adjustableTrailingUnit),
+            ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-                flds += [
-                    make_field(order.softDollarTier.name),
-                    make_field(order.softDollarTier.val),
-                ]
+        if self.serverVersion() >= MIN_SERVER_VER_EXT_OPERATOR:
+            flds.append(make_field(order.extOperator))
+
+        if self.serverVersion() >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
+            flds += [
+                make_field(order.softDollarTier.name),
+                make_field(order.softDollarTier.val),
+            ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_CASH_QTY:
-                flds.append(make_field(order.cashQty))
+        if self.serverVersion() >= MIN_SERVER_VER_CASH_QTY:
+            flds.append(make_field(order.cashQty))
 
-            if self.serverVersion() >= MIN_SERVER_VER_DECISION_MAKER:
-                flds.append(make_field(order.mifid2DecisionMaker))
-                flds.append(make_field(order.mifid2DecisionAlgo))
+        if self.serverVersion() >= MIN_SERVER_VER_DECISION_MAKER:
+            flds.append(make_field(order.mifid2DecisionMaker))
+            flds.append(make_field(order.mifid2DecisionAlgo))
 
-            if self.serverVersion() >= MIN_SERVER_VER_MIFID_EXECUTION:
-                flds.append(make_field(order.mifid2ExecutionTrader))
-                flds.append(make_field(order.mifid2ExecutionAlgo))
+        if self.serverVersion() >= MIN_SERVER_VER_MIFID_EXECUTION:
+            flds.append(make_field(order.mifid2ExecutionTrader))
+            flds.append(make_field(order.mifid2ExecutionAlgo))
 
-            if self.serverVersion() >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
-                flds.append(make_field(order.dontUseAutoPriceForHedge))
+        if self.serverVersion() >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
+            flds.append(make_field(order.dontUseAutoPriceForHedge))
 
-            if self.serverVersion() >= MIN_SERVER_VER_ORDER_CONTAINER:
-                flds.append(make_field(order.isOmsContainer))
+        if self.serverVersion() >= MIN_SERVER_VER_ORDER_CONTAINER:
+            flds.append(make_field(order.isOmsContainer))
 
-            if self.serverVersion() >= MIN_SERVER_VER_D_PEG_ORDERS:
-                flds.append(make_field(order.discretionaryUpToLimitPrice))
+        if self.serverVersion() >= MIN_SERVER_VER_D_PEG_ORDERS:
+            flds.append(make_field(order.discretionaryUpToLimitPrice))
 
-            if self.serverVersion() >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
-                flds.append(
-                    make_field_handle_empty(
-                        UNSET_INTEGER
-                        if order.usePriceMgmtAlgo is None
-                        else 1
-                        if order.usePriceMgmtAlgo
-                        else 0
-                    )
+        if self.serverVersion() >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
+            flds.append(
+                make_field_handle_empty(
+                    UNSET_INTEGER
+                    if order.usePriceMgmtAlgo is None
+                    else 1
+                    if order.usePriceMgmtAlgo
+                    else 0
                 )
+            )
 
-            if self.serverVersion() >= MIN_SERVER_VER_DURATION:
-                flds.append(make_field(order.duration))
+        if self.serverVersion() >= MIN_SERVER_VER_DURATION:
+            flds.append(make_field(order.duration))
 
-            if self.serverVersion() >= MIN_SERVER_VER_POST_TO_ATS:
-                flds.append(make_field(order.postToAts))
+        if self.serverVersion() >= MIN_SERVER_VER_POST_TO_ATS:
+            flds.append(make_field(order.postToAts))
 
-            if self.serverVersion() >= MIN_SERVER_VER_AUTO_CANCEL_PARENT:
-                flds.append(make_field(order.autoCancelParent))
+        if self.serverVersion() >= MIN_SERVER_VER_AUTO_CANCEL_PARENT:
+            flds.append(make_field(order.autoCancelParent))
 
-            if self.serverVersion() >= MIN_SERVER_VER_ADVANCED_ORDER_REJECT:
-                flds.append(make_field(order.advancedErrorOverride))
+        if self.serverVersion() >= MIN_SERVER_VER_ADVANCED_ORDER_REJECT:
+            flds.append(make_field(order.advancedErrorOverride))
 
-            if self.serverVersion() >= MIN_SERVER_VER_MANUAL_ORDER_TIME:
-                flds.append(make_field(order.manualOrderTime))
-
-            if self.serverVersion() >= MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
-                sendMidOffsets = False
-                if contract.exchange == "IBKRATS":
-                    flds.append(make_field_handle_empty(order.minTradeQty))
-                if isPegBestOrder(order.orderType):
-                    flds.append(make_field_handle_empty(order.minCompeteSize))
-                    flds.append(make_field_handle_empty(order.competeAgainstBestOffset))
-                    if (
-                        order.competeAgainstBestOffset
-                        == COMPETE_AGAINST_BEST_OFFSET_UP_TO_MID
-                    ):
-                        sendMidOffsets = True
-                elif isPegMidOrder(order.orderType):
-                    sendMidOffsets = True
-                if sendMidOffsets:
-                    flds.append(make_field_handle_empty(order.midOffsetAtWhole))
-                    flds.append(make_field_handle_empty(order.midOffsetAtHalf))
-
-            if self.serverVersion() >= MIN_SERVER_VER_CUSTOMER_ACCOUNT:
-                flds.append(make_field(order.customerAccount))
+        if self.serverVersion() >= MIN_SERVER_VER_MANUAL_ORDER_TIME:
+            flds.append(make_field(order.manualOrderTime))
 
-            if self.serverVersion() >= MIN_SERVER_VER_PROFESSIONAL_CUSTOMER:
-                flds.append(make_field(order.professionalCustomer))
+        if self.serverVersion() >= MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
+            sendMidOffsets = False
+            if contract.exchange == "IBKRATS":
+                flds.append(make_field_handle_empty(order.minTradeQty))
+            if isPegBestOrder(order.orderType):
+                flds.append(make_field_handle_empty(order.minCompeteSize))
+                flds.append(make_field_handle_empty(order.competeAgainstBestOffset))
+                if (
+                    order.competeAgainstBestOffset
+                    == COMPETE_AGAINST_BEST_OFFSET_UP_TO_MID
+                ):
+                    sendMidOffsets = True
+            elif isPegMidOrder(order.orderType):
+                sendMidOffsets = True
+            if sendMidOffsets:
+                flds.append(make_field_handle_empty(order.midOffsetAtWhole))
+                flds.append(make_field_handle_empty(order.midOffsetAtHalf))
 
-            if self.serverVersion() >= MIN_SERVER_VER_RFQ_FIELDS:
-                flds.append(make_field(order.externalUserId))
-                flds.append(make_field(order.manualOrderIndicator))
+        if self.serverVersion() >= MIN_SERVER_VER_CUSTOMER_ACCOUNT:
+            flds.append(make_field(order.customerAccount))
 
-            msg = "".join(flds)
+        if self.serverVersion() >= MIN_SERVER_VER_PROFESSIONAL_CUSTOMER:
+            flds.append(make_field(order.professionalCustomer))
 
-        except ClientException as ex:
-            self.wrapper.error(orderId, ex.code, ex.msg + ex.text)
-            return
+        if self.serverVersion() >= MIN_SERVER_VER_RFQ_FIELDS:
+            flds.append(make_field(order.externalUserId))
+            flds.append(make_field(order.manualOrderIndicator))
 
-        self.sendMsg(msg)
+        return "".join(flds)
 
     def cancelOrder(self, orderId: OrderId, orderCancel: OrderCancel):
         """Call this function to cancel an order.
@@ -2054,7 +2318,8 @@ class EClient(object):
         orderId:OrderId - The order ID that was specified previously in the call
             to placeOrder()"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2117,7 +2382,8 @@ class EClient(object):
         orderId will be generated. This association will persist over multiple
         API and TWS sessions."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2141,7 +2407,8 @@ class EClient(object):
         associated with the client. If set to FALSE, no association will be
         made."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2165,7 +2432,8 @@ class EClient(object):
         Note:  No association is made between the returned orders and the
         requesting client."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2184,7 +2452,8 @@ class EClient(object):
         If the order was created in TWS, it also gets canceled. If the order
         was initiated in the API, it also gets canceled."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2205,7 +2474,8 @@ class EClient(object):
 
         numIds:int - deprecated"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2232,7 +2502,8 @@ class EClient(object):
         acctCode:str -The account code for which to receive account and
             portfolio updates."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2312,7 +2583,8 @@ class EClient(object):
             $LEDGER:ALL - Single flag to relay all cash balance tags* in all
             currencies."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2340,7 +2612,8 @@ class EClient(object):
 
         reqId:int - The ID of the data request being canceled."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2359,7 +2632,8 @@ class EClient(object):
     def reqPositions(self):
         """Requests real-time position data for all accounts."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2382,7 +2656,8 @@ class EClient(object):
     def cancelPositions(self):
         """Cancels real-time position updates."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2407,7 +2682,8 @@ class EClient(object):
         Results are delivered via EWrapper.positionMulti() and
         EWrapper.positionMultiEnd()"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2439,7 +2715,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelPositionsMulti(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2468,7 +2745,8 @@ class EClient(object):
     ):
         """Requests account updates for account and/or model."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2502,7 +2780,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelAccountUpdatesMulti(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2531,7 +2810,8 @@ class EClient(object):
     #########################################################################
 
     def reqPnL(self, reqId: int, account: str, modelCode: str):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2560,7 +2840,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelPnL(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2579,7 +2860,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqPnLSingle(self, reqId: int, account: str, modelCode: str, conid: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2609,7 +2891,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelPnLSingle(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2646,7 +2929,8 @@ class EClient(object):
 
         NOTE: Time format must be 'yyyymmdd-hh:mm:ss' Eg: '20030702-14:55'"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2697,7 +2981,8 @@ class EClient(object):
         contract:Contract - The summary description of the contract being looked
             up."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2813,7 +3098,8 @@ class EClient(object):
     #########################################################################
 
     def reqMktDepthExchanges(self):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2859,7 +3145,8 @@ class EClient(object):
         mktDepthOptions:TagValueList - For internal use only. Use default value
             XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2965,7 +3252,8 @@ class EClient(object):
             reqMktDepth().
         isSmartDepth:bool - specifies SMART depth request"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3008,7 +3296,8 @@ class EClient(object):
         the currencyent day and any new ones. If set to FALSE, will only
         return new bulletins."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3027,7 +3316,8 @@ class EClient(object):
     def cancelNewsBulletins(self):
         """Call this function to stop receiving news bulletins."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3049,7 +3339,8 @@ class EClient(object):
 
         Note:  This request can only be made when connected to a FA managed account."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3070,7 +3361,8 @@ class EClient(object):
             1 = GROUPS
             3 = ACCOUNT ALIASES"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3102,7 +3394,8 @@ class EClient(object):
         cxml: str - The XML string containing the new FA configuration
             information."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3205,7 +3498,8 @@ class EClient(object):
                 1/1/1970 GMT.
         chartOptions:TagValueList - For internal use only. Use default value XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3255,16 +3549,7 @@ class EClient(object):
                     make_field(contract.conId),
                 ]
             flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
             ]
             if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
                 flds += [
@@ -3323,7 +3608,8 @@ class EClient(object):
 
         reqId:TickerId - The ticker ID. Must be a unique value."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3350,7 +3636,8 @@ class EClient(object):
         useRTH: int,
         formatDate: int,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3370,16 +3657,7 @@ class EClient(object):
                 make_field(OUT.REQ_HEAD_TIMESTAMP),
                 make_field(reqId),
                 make_field(contract.conId),
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
                 make_field(contract.tradingClass),
                 make_field(contract.includeExpired),
                 make_field(useRTH),
@@ -3396,7 +3674,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelHeadTimeStamp(self, reqId: TickerId):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3419,7 +3698,8 @@ class EClient(object):
     def reqHistogramData(
         self, tickerId: int, contract: Contract, useRTH: bool, timePeriod: str
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3439,16 +3719,7 @@ class EClient(object):
                 make_field(OUT.REQ_HISTOGRAM_DATA),
                 make_field(tickerId),
                 make_field(contract.conId),
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
                 make_field(contract.tradingClass),
                 make_field(contract.includeExpired),
                 make_field(useRTH),
@@ -3464,7 +3735,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelHistogramData(self, tickerId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3494,7 +3766,8 @@ class EClient(object):
         ignoreSize: bool,
         miscOptions: TagValueList,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3514,16 +3787,7 @@ class EClient(object):
                 make_field(OUT.REQ_HISTORICAL_TICKS),
                 make_field(reqId),
                 make_field(contract.conId),
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
                 make_field(contract.tradingClass),
                 make_field(contract.includeExpired),
                 make_field(startDateTime),
@@ -3557,7 +3821,8 @@ class EClient(object):
     def reqScannerParameters(self):
         """Requests an XML string that describes all possible scanner queries."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3582,7 +3847,8 @@ class EClient(object):
         scannerSubscriptionOptions:TagValueList - For internal use only.
             Use default value XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3665,7 +3931,8 @@ class EClient(object):
     def cancelScannerSubscription(self, reqId: int):
         """reqId:int - The ticker ID. Must be a unique value."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3720,7 +3987,8 @@ class EClient(object):
         realTimeBarOptions:TagValueList - For internal use only. Use default value XYZ.
         """
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3752,16 +4020,7 @@ class EClient(object):
                     make_field(contract.conId),
                 ]
             flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
+                make_contract_fields(contract),
             ]
             if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
                 flds += [
@@ -3792,7 +4051,8 @@ class EClient(object):
 
         reqId:TickerId - The id that was specified in the call to reqRealTimeBars()."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3843,7 +4103,8 @@ class EClient(object):
             ReportsFinStatements (financial statements)
             RESC (analyst estimates)"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3915,7 +4176,8 @@ class EClient(object):
 
         reqId:TickerId - The ID of the data request."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3944,7 +4206,8 @@ class EClient(object):
     #########################################################################
 
     def reqNewsProviders(self):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3969,7 +4232,8 @@ class EClient(object):
         articleId: str,
         newsArticleOptions: TagValueList,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4021,7 +4285,8 @@ class EClient(object):
         totalResults: int,
         historicalNewsOptions: TagValueList,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4079,7 +4344,8 @@ class EClient(object):
         reqId:int - The unique number that will be associated with the
             response"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4108,7 +4374,8 @@ class EClient(object):
         groupId:int - The ID of the group, currently it is a number from 1 to 7.
             This is the display group subscription request sent by the API to TWS."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4144,7 +4411,8 @@ class EClient(object):
                 Examples: 8314@SMART for IBM SMART; 8314@ARCA for IBM @ARCA.
             combo = if any combo is selected."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4177,7 +4445,8 @@ class EClient(object):
     def unsubscribeFromGroupEvents(self, reqId: int):
         """reqId:int - The requestId specified in subscribeToGroupEvents()."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4206,7 +4475,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4249,7 +4519,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4282,7 +4553,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4326,7 +4598,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4372,7 +4645,8 @@ class EClient(object):
         i.e. STK underlyingConId the contract ID of the underlying security.
         Response comes via EWrapper.securityDefinitionOptionParameter()"""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4411,7 +4685,8 @@ class EClient(object):
         registered professional advisors and hedge and mutual funds who have
         configured Soft Dollar Tiers in Account Management."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4422,7 +4697,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqFamilyCodes(self):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4441,7 +4717,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqMatchingSymbols(self, reqId: int, pattern: str):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4474,7 +4751,8 @@ class EClient(object):
         Each completed order will be fed back through the
         completedOrder() function on the EWrapper."""
 
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4485,7 +4763,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqWshMetaData(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4509,7 +4788,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelWshMetaData(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4533,7 +4813,8 @@ class EClient(object):
         wshEventData: WshEventData,
         MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS_DATE=None,
     ):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4602,7 +4883,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelWshEventData(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -4621,7 +4903,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqUserInfo(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if apiLogging.on:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
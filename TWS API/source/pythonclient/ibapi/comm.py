@@ -17,11 +17,17 @@ from ibapi.errors import INVALID_SYMBOL
 logger = logging.getLogger(__name__)
 
 
+# encoded contract fragments, see make_contract_fields()
+contractFieldsCache = {}
+CONTRACT_FIELDS_CACHE_SIZE = 4096
+
+
 def make_msg(text) -> bytes:
-    """adds the length prefix"""
+    """adds the length prefix, text is a str or already encoded bytes"""
 
-    msg = struct.pack(f"!I{len(text)}s", len(text), str.encode(text))
-    return msg
+    if isinstance(text, str):
+        text = text.encode()
+    return struct.pack("!I", len(text)) + text
 
 
 def make_field(val) -> str:
@@ -29,24 +35,66 @@ def make_field(val) -> str:
     if val is None:
         raise ValueError("Cannot send None to TWS")
 
-    # if string is not empty and contains invalid symbols
-    if val is not None and type(val) == str and val and not isAsciiPrintable(val):
-        raise ClientException(
-            INVALID_SYMBOL.code(),
-            INVALID_SYMBOL.msg(),
-            val.encode(sys.stdout.encoding, errors="ignore").decode(
-                sys.stdout.encoding
-            ),
-        )
+    if type(val) == str:
+        # if string is not empty and contains invalid symbols
+        if val and not isAsciiPrintable(val):
+            raise ClientException(
+                INVALID_SYMBOL.code(),
+                INVALID_SYMBOL.msg(),
+                val.encode(sys.stdout.encoding, errors="ignore").decode(
+                    sys.stdout.encoding
+                ),
+            )
+        return val + "\0"
 
     # bool type is encoded as int
-    if val is not None and type(val) == bool:
+    if type(val) == bool:
         val = int(val)
 
     field = str(val) + "\0"
     return field
 
 
+def make_contract_fields(contract) -> str:
+    """the symbol .. localSymbol fields that most requests send for a
+    contract; the encoded fragment is cached by the field values, so
+    subscribing to the same contracts again (or the same contract with a
+    different reqId) skips the per field validation"""
+
+    key = (
+        contract.symbol,
+        contract.secType,
+        contract.lastTradeDateOrContractMonth,
+        str(contract.strike),
+        contract.right,
+        str(contract.multiplier),
+        contract.exchange,
+        contract.primaryExchange,
+        contract.currency,
+        contract.localSymbol,
+    )
+    fragment = contractFieldsCache.get(key)
+    if fragment is None:
+        fragment = "".join(
+            (
+                make_field(contract.symbol),
+                make_field(contract.secType),
+                make_field(contract.lastTradeDateOrContractMonth),
+                make_field(contract.strike),
+                make_field(contract.right),
+                make_field(contract.multiplier),  # srv v15 and above
+                make_field(contract.exchange),
+                make_field(contract.primaryExchange),  # srv v14 and above
+                make_field(contract.currency),
+                make_field(contract.localSymbol),  # srv v2 and above
+            )
+        )
+        if len(contractFieldsCache) >= CONTRACT_FIELDS_CACHE_SIZE:
+            contractFieldsCache.clear()
+        contractFieldsCache[key] = fragment
+    return fragment
+
+
 def make_field_handle_empty(val) -> str:
     if val is None:
         raise ValueError("Cannot send None to TWS")
@@ -74,13 +122,31 @@ def read_msg(buf: bytes) -> tuple:
         return (size, "", buf)
 
 
-def read_fields(buf: bytes) -> tuple:
+def read_msg_from(buf, pos: int) -> tuple:
+    """same as read_msg but reads the frame starting at offset pos of buf
+    (a bytearray or memoryview) instead of slicing off the tail; returns the
+    offset of the next frame, or msg None if the frame is not complete yet"""
+
+    end = len(buf)
+    if end - pos < 4:
+        return (0, None, pos)
+    size = struct.unpack_from("!I", buf, pos)[0]
+    start = pos + 4
+    if end - start >= size:
+        return (size, bytes(buf[start : start + size]), start + size)
+    else:
+        return (size, None, pos)
+
+
+def read_fields(buf: bytes) -> list:
+    """msg payload is made of fields terminated/separated by NULL chars;
+    the fields are converted with the utils typed accessors (decimalOf,
+    strOf) or decode()"""
+
     if isinstance(buf, str):
         buf = buf.encode()
 
-    """ msg payload is made of fields terminated/separated by NULL chars """
     fields = buf.split(b"\0")
-
-    return tuple(
-        fields[0:-1]
-    )  # last one is empty; this may slow dow things though, TODO
+    # last one is empty, drop it in place rather than copying the rest
+    fields.pop()
+    return fields
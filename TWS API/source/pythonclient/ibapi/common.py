@@ -39,6 +39,8 @@ ListOfHistoricalSessions = list
 
 
 class BarData(Object):
+    __slots__ = ("date", "open", "high", "low", "close", "volume", "wap", "barCount")
+
     def __init__(self):
         self.date = ""
         self.open = 0.0
@@ -63,6 +65,18 @@ class BarData(Object):
 
 
 class RealTimeBar(Object):
+    __slots__ = (
+        "time",
+        "endTime",
+        "open_",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "wap",
+        "count",
+    )
+
     def __init__(
         self,
         time=0,
@@ -162,6 +176,8 @@ class SmartComponent(Object):
 
 
 class TickAttrib(Object):
+    __slots__ = ("canAutoExecute", "pastLimit", "preOpen")
+
     def __init__(self):
         self.canAutoExecute = False
         self.pastLimit = False
@@ -176,6 +192,8 @@ class TickAttrib(Object):
 
 
 class TickAttribBidAsk(Object):
+    __slots__ = ("bidPastLow", "askPastHigh")
+
     def __init__(self):
         self.bidPastLow = False
         self.askPastHigh = False
@@ -185,6 +203,8 @@ class TickAttribBidAsk(Object):
 
 
 class TickAttribLast(Object):
+    __slots__ = ("pastLimit", "unreported")
+
     def __init__(self):
         self.pastLimit = False
         self.unreported = False
@@ -215,6 +235,8 @@ class PriceIncrement(Object):
 
 
 class HistoricalTick(Object):
+    __slots__ = ("time", "price", "size")
+
     def __init__(self):
         self.time = 0
         self.price = 0.0
@@ -229,6 +251,8 @@ class HistoricalTick(Object):
 
 
 class HistoricalTickBidAsk(Object):
+    __slots__ = ("time", "tickAttribBidAsk", "priceBid", "priceAsk", "sizeBid", "sizeAsk")
+
     def __init__(self):
         self.time = 0
         self.tickAttribBidAsk = TickAttribBidAsk()
@@ -249,6 +273,8 @@ class HistoricalTickBidAsk(Object):
 
 
 class HistoricalTickLast(Object):
+    __slots__ = ("time", "tickAttribLast", "price", "size", "exchange", "specialConditions")
+
     def __init__(self):
         self.time = 0
         self.tickAttribLast = TickAttribLast()
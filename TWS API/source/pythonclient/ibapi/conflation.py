@@ -0,0 +1,75 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Market data conflation between the reader and the decoder.
+Within a batch of raw messages (one socket read in inline mode, one queue
+drain otherwise) only the latest TICK_PRICE, TICK_SIZE, TICK_GENERIC and
+TICK_STRING per (reqId, tickType), and the latest tick by tick BidAsk or
+MidPoint per reqId, is kept. Tick by tick trades are never conflated.
+
+Any other message (order status, open order, executions, errors...) first
+flushes the pending market data, then goes through as is: the other
+messages keep their order, and they see every tick that came before them.
+"""
+
+from ibapi.msg_queue import peekFields
+from ibapi.object_implem import Object
+
+# msgId -> number of leading fields making up the key:
+# msgId, version, reqId, tickType or msgId, reqId, tickType
+KEY_FIELDS = {
+    b"1": 4,  # TICK_PRICE
+    b"2": 4,  # TICK_SIZE
+    b"45": 4,  # TICK_GENERIC
+    b"46": 4,  # TICK_STRING
+    b"99": 3,  # TICK_BY_TICK
+}
+
+# BidAsk and MidPoint, Last and AllLast are trades
+CONFLATED_TICK_BY_TICK_TYPES = (b"3", b"4")
+
+
+def conflationKey(msg):
+    """the key of a market data message that can be conflated, else None"""
+
+    if msg is None:
+        return None
+    nFields = KEY_FIELDS.get(msg[: msg.find(b"\0")])
+    if nFields is None:
+        return None
+    fields = peekFields(msg, nFields)
+    if len(fields) < nFields:
+        return None
+    if nFields == 3 and fields[2] not in CONFLATED_TICK_BY_TICK_TYPES:
+        return None
+    return tuple(fields)
+
+
+class MarketDataConflator(Object):
+    def __init__(self):
+        self.nIn = 0
+        self.nOut = 0
+
+    def conflate(self, msgs: list) -> list:
+        """msgs with the market data conflated; a key keeps the place of its
+        first update in the batch and the content of its last one"""
+
+        out = []
+        dirty = {}
+        for msg in msgs:
+            key = conflationKey(msg)
+            if key is None:
+                if dirty:
+                    out.extend(dirty.values())
+                    dirty.clear()
+                out.append(msg)
+            else:
+                dirty[key] = msg
+        out.extend(dirty.values())
+        self.nIn += len(msgs)
+        self.nOut += len(out)
+        return out
+
+    def metrics(self) -> dict:
+        return {"in": self.nIn, "out": self.nOut, "conflated": self.nIn - self.nOut}
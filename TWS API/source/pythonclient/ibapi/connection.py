@@ -8,6 +8,7 @@ Just a thin wrapper around a socket.
 It allows us to keep some other info along with it.
 """
 
+import selectors
 import socket
 import threading
 import logging
@@ -20,14 +21,22 @@ from ibapi.const import NO_VALID_ID
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RECV_BUF_SIZE = 256 * 1024
+
 
 class Connection:
-    def __init__(self, host, port):
+    def __init__(self, host, port, recvBufSize=DEFAULT_RECV_BUF_SIZE):
         self.host = host
         self.port = port
+        self.recvBufSize = recvBufSize
         self.socket = None
         self.wrapper = None
         self.lock = threading.Lock()
+        self.selector = None
+        self.wakeupRecv = None
+        self.wakeupSend = None
+        self.batchThread = None
+        self.pending = []
 
     def connect(self):
         try:
@@ -47,11 +56,42 @@ class Connection:
 
         self.socket.settimeout(1)  # non-blocking
 
+    def startSelector(self):
+        """Switches to blocking reads driven by a selector. disconnect() wakes
+        up a reader waiting in waitReadable() through a socketpair, so no
+        timeout is needed to notice it."""
+
+        self.socket.settimeout(None)
+        (self.wakeupRecv, self.wakeupSend) = socket.socketpair()
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.socket, selectors.EVENT_READ)
+        self.selector.register(self.wakeupRecv, selectors.EVENT_READ)
+
+    def waitReadable(self) -> bool:
+        """Blocks until the socket has data (True) or disconnect() was called (False)"""
+
+        for key, _ in self.selector.select():
+            if key.fileobj is self.wakeupRecv:
+                return False
+        return True
+
+    def closeSelector(self):
+        with self.lock:
+            if self.selector is not None:
+                self.selector.close()
+                self.wakeupRecv.close()
+                self.wakeupSend.close()
+                self.selector = None
+                self.wakeupRecv = None
+                self.wakeupSend = None
+
     def disconnect(self):
         self.lock.acquire()
         try:
             if self.socket is not None:
                 logger.debug("disconnecting")
+                if self.wakeupSend is not None:
+                    self.wakeupSend.send(b"\0")
                 self.socket.close()
                 self.socket = None
                 logger.debug("disconnected")
@@ -64,24 +104,56 @@ class Connection:
         return self.socket is not None
 
     def sendMsg(self, msg):
-        logger.debug("acquiring lock")
-        self.lock.acquire()
-        logger.debug("acquired lock")
-        if not self.isConnected():
-            logger.debug("sendMsg attempted while not connected, releasing lock")
-            self.lock.release()
-            return 0
+        with self.lock:
+            if not self.isConnected():
+                logger.debug("sendMsg attempted while not connected")
+                return 0
+            if self.batchThread == threading.get_ident():
+                self.pending.append(msg)
+                return len(msg)
+            if self.pending:
+                # keep the order of the batch
+                self.pending.append(msg)
+                msg = b"".join(self.pending)
+                self.pending = []
+            return self._sendAll(msg)
+
+    def startBatch(self):
+        """Holds back the messages the calling thread sends until flush() or
+        endBatch(), which send them with one write. The messages of other
+        threads go out right away, in order after the held back ones."""
+
+        with self.lock:
+            self.batchThread = threading.get_ident()
+
+    def flush(self):
+        """Sends the held back messages now; the batch goes on"""
+
+        with self.lock:
+            if self.pending and self.isConnected():
+                msgs = self.pending
+                self.pending = []
+                self._sendAll(b"".join(msgs))
+
+    def endBatch(self):
+        self.flush()
+        with self.lock:
+            self.batchThread = None
+            self.pending = []
+
+    def _sendAll(self, msg) -> int:
+        # the lock is held; send() may take only part of msg
         try:
-            nSent = self.socket.send(msg)
+            with memoryview(msg) as view:
+                nSent = 0
+                while nSent < len(view):
+                    nSent += self.socket.send(view[nSent:])
         except socket.error:
             logger.debug("exception from sendMsg %s", sys.exc_info())
             raise
-        finally:
-            logger.debug("releasing lock")
-            self.lock.release()
-            logger.debug("release lock")
 
-        logger.debug("sendMsg: sent: %d", nSent)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("sendMsg: sent: %d", nSent)
 
         return nSent
 
@@ -110,6 +182,46 @@ class Connection:
 
         return buf
 
+    def recvInto(self, buf: bytearray, end: int) -> int:
+        """Reads everything available on the socket straight into buf from
+        offset end on, growing buf when it fills up. Returns the new end
+        offset; end is returned unchanged on a timeout. After startSelector()
+        it reads once, call it when waitReadable() says there is data."""
+
+        if not self.isConnected():
+            logger.debug("recvInto attempted while not connected")
+            return end
+
+        start = end
+        try:
+            while self.isConnected():
+                if end == len(buf):
+                    buf.extend(bytes(len(buf)))
+                with memoryview(buf)[end:] as view:
+                    nRecvd = self.socket.recv_into(view)
+                end += nRecvd
+                # with a selector, read once and go back to waiting for readiness
+                if end < len(buf) or self.selector is not None:
+                    break
+        except socket.timeout:
+            return end
+        except OSError:
+            # broken, or closed by disconnect() while waiting in recv_into()
+            logger.debug("socket broken, disconnecting")
+            self.disconnect()
+            return end
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("recvInto: recvd %d", end - start)
+
+        # receiving 0 bytes outside a timeout means the connection is either
+        # closed or broken
+        if end == start:
+            logger.debug("socket either closed or broken, disconnecting")
+            self.disconnect()
+
+        return end
+
     def _recvAllMsg(self):
         cont = True
         allbuf = b""
@@ -117,7 +229,8 @@ class Connection:
         while cont and self.isConnected():
             buf = self.socket.recv(4096)
             allbuf += buf
-            logger.debug("len %d raw:%s|", len(buf), buf)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("len %d raw:%s|", len(buf), buf)
 
             if len(buf) < 4096:
                 cont = False
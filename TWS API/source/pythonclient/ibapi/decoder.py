@@ -2,6 +2,8 @@
 Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
+import types
+
 from ibapi.const import NO_VALID_ID
 from ibapi.contract import getEnumTypeFromString
 
@@ -27,10 +29,38 @@ from ibapi.orderdecoder import OrderDecoder
 from ibapi.contract import FundDistributionPolicyIndicator
 from ibapi.contract import FundAssetType
 from ibapi.ineligibility_reason import IneligibilityReason
+from ibapi.decoder_specs import compileSpecs, SIZE_TICK_TYPES
 
 logger = logging.getLogger(__name__)
 
 
+class WrapperParam(Object):
+    """The name and annotation of a wrapper method parameter, the part of
+    inspect.Parameter the decoder uses"""
+
+    __slots__ = ("name", "annotation")
+
+    def __init__(self, name, annotation):
+        self.name = name
+        self.annotation = annotation
+
+    def __str__(self):
+        return f"{self.name}:{self.annotation}"
+
+
+def wrapperParamsOf(meth) -> dict:
+    """name -> WrapperParam for the positional parameters of meth, read off
+    its code object; inspect.signature() costs more than the import of
+    the whole package"""
+
+    code = meth.__code__
+    annotations = meth.__annotations__
+    return {
+        name: WrapperParam(name, annotations.get(name))
+        for name in code.co_varnames[: code.co_argcount]
+    }
+
+
 class HandleInfo(Object):
     def __init__(self, wrap=None, proc=None):
         self.wrapperMeth = wrap
@@ -45,11 +75,62 @@ class HandleInfo(Object):
 
 
 class Decoder(Object):
-    def __init__(self, wrapper, serverVersion):
+    paramsDiscovered = False
+
+    def __init__(
+        self, wrapper, serverVersion, fastMarketData=False, bulkHistoricalData=False
+    ):
         self.wrapper = wrapper
+        self.fastMarketData = fastMarketData
+        self.bulkHistoricalData = bulkHistoricalData
+        self.profiler = None
         self.serverVersion = serverVersion
         self.discoverParams()
 
+    @property
+    def serverVersion(self):
+        return self._serverVersion
+
+    @serverVersion.setter
+    def serverVersion(self, serverVersion):
+        self._serverVersion = serverVersion
+        self.compileSpecs()
+
+    def compileSpecs(self):
+        # the hot messages have decoders compiled for this server version
+        self.compiledProcs = compileSpecs(
+            self._serverVersion, self.fastMarketData, self.bulkHistoricalData
+        )
+        # handleInfo -> (bound wrapper method, converters), see compileSignature
+        self.signatures = {}
+
+    def setFastMarketData(self, fastMarketData):
+        """Shared tick attribute objects and float sizes, see decoder_specs"""
+        self.fastMarketData = fastMarketData
+        self.compileSpecs()
+
+    def setBulkHistoricalData(self, bulkHistoricalData):
+        """One historicalDataBulk() call per response, see decoder_specs"""
+        self.bulkHistoricalData = bulkHistoricalData
+        self.compileSpecs()
+
+    def setProfiler(self, profiler):
+        """Counts and times every message into profiler (a
+        profiler.MsgProfiler), None stops. interpret() is only replaced
+        while profiling, so there is no cost otherwise."""
+
+        if self.profiler is not None:
+            self.wrapper = self.wrapper.wrapper
+            del self.interpret
+        self.profiler = profiler
+        if profiler is not None:
+            from ibapi.profiler import TimedWrapper
+
+            self.wrapper = TimedWrapper(self.wrapper, profiler)
+            self.interpret = profiler.timed(types.MethodType(Decoder.interpret, self))
+        # the cached signatures hold bound methods of the previous wrapper
+        self.signatures = {}
+
     def processTickPriceMsg(self, fields):
         next(fields)
         decode(int, fields)
@@ -73,20 +154,7 @@ class Decoder(Object):
         self.wrapper.tickPrice(reqId, tickType, price, attrib)
 
         # process ver 2 fields
-        sizeTickType = TickTypeEnum.NOT_SET
-        if TickTypeEnum.BID == tickType:
-            sizeTickType = TickTypeEnum.BID_SIZE
-        elif TickTypeEnum.ASK == tickType:
-            sizeTickType = TickTypeEnum.ASK_SIZE
-        elif TickTypeEnum.LAST == tickType:
-            sizeTickType = TickTypeEnum.LAST_SIZE
-        elif TickTypeEnum.DELAYED_BID == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_BID_SIZE
-        elif TickTypeEnum.DELAYED_ASK == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_ASK_SIZE
-        elif TickTypeEnum.DELAYED_LAST == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_LAST_SIZE
-
+        sizeTickType = SIZE_TICK_TYPES.get(tickType, TickTypeEnum.NOT_SET)
         if sizeTickType != TickTypeEnum.NOT_SET:
             self.wrapper.tickSize(reqId, sizeTickType, size)
 
@@ -628,7 +696,7 @@ class Decoder(Object):
 
         bar = RealTimeBar()
         bar.time = decode(int, fields)
-        bar.open = decode(float, fields)
+        bar.open_ = decode(float, fields)
         bar.high = decode(float, fields)
         bar.low = decode(float, fields)
         bar.close = decode(float, fields)
@@ -639,7 +707,7 @@ class Decoder(Object):
         self.wrapper.realtimeBar(
             reqId,
             bar.time,
-            bar.open,
+            bar.open_,
             bar.high,
             bar.low,
             bar.close,
@@ -1412,20 +1480,13 @@ class Decoder(Object):
     ######################################################################
 
     def discoverParams(self):
-        meth2handleInfo = {}
+        # the HandleInfos are shared by every Decoder, inspect them once
+        if Decoder.paramsDiscovered:
+            return
         for handleInfo in self.msgId2handleInfo.values():
-            meth2handleInfo[handleInfo.wrapperMeth] = handleInfo
-
-        methods = inspect.getmembers(EWrapper, inspect.isfunction)
-        for _, meth in methods:
-            # logger.debug("meth %s", name)
-            sig = inspect.signature(meth)
-            handleInfo = meth2handleInfo.get(meth, None)
-            if handleInfo is not None:
-                handleInfo.wrapperParams = sig.parameters
-
-            # for (pname, param) in sig.parameters.items():
-            #     logger.debug("\tparam %s %s %s", pname, param.name, param.annotation)
+            if handleInfo.wrapperMeth is not None:
+                handleInfo.wrapperParams = wrapperParamsOf(handleInfo.wrapperMeth)
+        Decoder.paramsDiscovered = True
 
     def printParams(self):
         for _, handleInfo in self.msgId2handleInfo.items():
@@ -1437,13 +1498,50 @@ class Decoder(Object):
                             "\tparam %s %s %s", pname, param.name, param.annotation
                         )
 
+    def compileSignature(self, handleInfo) -> tuple:
+        """The wrapper's bound method and one converter per parameter, for
+        the current server version"""
+
+        codec = (
+            "unicode-escape"
+            if self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7
+            else "UTF-8"
+        )
+
+        def strArg(field):
+            try:
+                return field.decode(codec)
+            except UnicodeDecodeError:
+                return field.decode("latin-1")
+
+        def boolArg(field):
+            return field.lower() in (b"1", b"true")
+
+        def decimalArg(field):
+            return UNSET_DECIMAL if not field else decimalOf(field)
+
+        convertersByType = {int: int, float: float, Decimal: decimalArg, bool: boolArg}
+        converters = tuple(
+            convertersByType.get(param.annotation, strArg)
+            for (pname, param) in handleInfo.wrapperParams.items()
+            if pname != "self"
+        )
+        method = getattr(self.wrapper, handleInfo.wrapperMeth.__name__)
+        return (method, converters)
+
     def interpretWithSignature(self, fields, handleInfo):
         if handleInfo.wrapperParams is None:
             logger.debug("%s: no param info in %s", fields, handleInfo)
             return
 
+        compiled = self.signatures.get(handleInfo)
+        if compiled is None:
+            compiled = self.compileSignature(handleInfo)
+            self.signatures[handleInfo] = compiled
+        (method, converters) = compiled
+
         nIgnoreFields = 2  # bypass msgId and versionId faster this way
-        if len(fields) - nIgnoreFields != len(handleInfo.wrapperParams) - 1:
+        if len(fields) - nIgnoreFields != len(converters):
             logger.error(
                 "diff len fields and params %d %d for fields: %s and handleInfo: %s",
                 len(fields),
@@ -1453,35 +1551,11 @@ class Decoder(Object):
             )
             return
 
-        fieldIdx = nIgnoreFields
-        args = []
-        for pname, param in handleInfo.wrapperParams.items():
-            if pname != "self":
-                logger.debug("field %s ", fields[fieldIdx])
-                try:
-                    arg = fields[fieldIdx].decode(
-                        "unicode-escape"
-                        if self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7
-                        else "UTF-8"
-                    )
-                except UnicodeDecodeError:
-                    arg = fields[fieldIdx].decode("latin-1")
-                logger.debug("arg %s type %s", arg, param.annotation)
-                if param.annotation is int:
-                    arg = int(arg)
-                elif param.annotation is float:
-                    arg = float(arg)
-                elif param.annotation is Decimal:
-                    if arg is None or len(arg) == 0:
-                        return UNSET_DECIMAL
-                    else:
-                        return Decimal(arg)
-
-                args.append(arg)
-                fieldIdx += 1
-
-        method = getattr(self.wrapper, handleInfo.wrapperMeth.__name__)
-        logger.debug("calling %s with %s %s", method, self.wrapper, args)
+        args = [
+            convert(field)
+            for (convert, field) in zip(converters, fields[nIgnoreFields:])
+        ]
+        logger.debug("calling %s with %s", method, args)
         method(*args)
 
     def interpret(self, fields):
@@ -1492,20 +1566,26 @@ class Decoder(Object):
         sMsgId = fields[0]
         nMsgId = int(sMsgId)
 
-        handleInfo = self.msgId2handleInfo.get(nMsgId, None)
+        compiledProc = self.compiledProcs.get(nMsgId)
+        if compiledProc is None:
+            handleInfo = self.msgId2handleInfo.get(nMsgId, None)
 
-        if handleInfo is None:
-            logger.debug("%s: no handleInfo", fields)
-            return
+            if handleInfo is None:
+                logger.debug("%s: no handleInfo", fields)
+                return
 
         try:
-            if handleInfo.wrapperMeth is not None:
+            if compiledProc is not None:
+                compiledProc(self.wrapper, fields)
+            elif handleInfo.wrapperMeth is not None:
                 logger.debug("In interpret(), handleInfo: %s", handleInfo)
                 self.interpretWithSignature(fields, handleInfo)
             elif handleInfo.processMeth is not None:
                 handleInfo.processMeth(self, iter(fields))
         except BadMessage:
-            theBadMsg = ",".join(fields)
+            theBadMsg = ",".join(
+                field.decode(errors="backslashreplace") for field in fields
+            )
             self.wrapper.error(
                 NO_VALID_ID, BAD_MESSAGE.code(), BAD_MESSAGE.msg() + theBadMsg
             )
@@ -0,0 +1,295 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Compiled decoders for the hot market data messages.
+The generic Decoder.process*Msg functions call utils.decode() once per field
+and test the server version on every message. Here the layout of each
+message is resolved once per server version into a function that unpacks
+the fields tuple in a single pass and converts every field inline, with the
+same results as decode().
+
+With fastMarketData the tick decoders also hand out shared, prebuilt
+attribute objects (callbacks must not modify or keep them) and report sizes
+as float instead of Decimal, for consumers that mostly need the price.
+
+With bulkHistoricalData a HISTORICAL_DATA response is parsed column by column
+and delivered with a single historicalDataBulk() call instead of one
+historicalData() call per bar: as a NumPy structured array when numpy is
+installed, else as a dict of column lists.
+"""
+
+from ibapi.common import BarData, TickAttrib, TickAttribBidAsk, TickAttribLast
+from ibapi.const import UNSET_DOUBLE
+from ibapi.message import IN
+from ibapi.server_versions import (
+    MIN_SERVER_VER_PAST_LIMIT,
+    MIN_SERVER_VER_PRE_OPEN_BID_ASK,
+    MIN_SERVER_VER_SYNT_REALTIME_BARS,
+)
+from ibapi.ticktype import TickTypeEnum
+from ibapi.utils import BadMessage, UNSET_DECIMAL_STRS, decimalOf, strOf
+
+SIZE_TICK_TYPES = {
+    TickTypeEnum.BID: TickTypeEnum.BID_SIZE,
+    TickTypeEnum.ASK: TickTypeEnum.ASK_SIZE,
+    TickTypeEnum.LAST: TickTypeEnum.LAST_SIZE,
+    TickTypeEnum.DELAYED_BID: TickTypeEnum.DELAYED_BID_SIZE,
+    TickTypeEnum.DELAYED_ASK: TickTypeEnum.DELAYED_ASK_SIZE,
+    TickTypeEnum.DELAYED_LAST: TickTypeEnum.DELAYED_LAST_SIZE,
+}
+
+# columns of the historicalDataBulk() bars
+HISTORICAL_BAR_FIELDS = (
+    ("date", "U40"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("wap", "f8"),
+    ("barCount", "i8"),
+)
+
+# number of fields of a TICK_BY_TICK message per tick type
+TICK_BY_TICK_LENS = {1: 9, 2: 9, 3: 9, 4: 5}
+
+compiledSpecs = {}
+
+
+def floatSizeOf(s: bytes) -> float:
+    return UNSET_DOUBLE if s in UNSET_DECIMAL_STRS else float(s)
+
+
+def compileTickPrice(serverVersion, fastMarketData):
+    if serverVersion >= MIN_SERVER_VER_PRE_OPEN_BID_ASK:
+
+        def attribOf(mask):
+            attrib = TickAttrib()
+            attrib.canAutoExecute = mask & 1 != 0
+            attrib.pastLimit = mask & 2 != 0
+            attrib.preOpen = mask & 4 != 0
+            return attrib
+
+    elif serverVersion >= MIN_SERVER_VER_PAST_LIMIT:
+
+        def attribOf(mask):
+            attrib = TickAttrib()
+            attrib.canAutoExecute = mask & 1 != 0
+            attrib.pastLimit = mask & 2 != 0
+            return attrib
+
+    else:
+
+        def attribOf(mask):
+            attrib = TickAttrib()
+            attrib.canAutoExecute = mask == 1
+            return attrib
+
+    sizeTickTypes = SIZE_TICK_TYPES
+    sizeOf = decimalOf
+    if fastMarketData:
+        # the mask has 3 bits, share one prebuilt TickAttrib per value
+        attribs = tuple(attribOf(mask) for mask in range(8))
+        attribOf = lambda mask: attribs[mask & 7]
+        sizeOf = floatSizeOf
+
+    def processTickPrice(wrapper, fields):
+        if len(fields) < 7:
+            raise BadMessage("no more fields")
+        (_, _, reqId, tickType, price, size, mask) = fields[:7]
+        reqId = int(reqId or 0)
+        tickType = int(tickType or 0)
+
+        wrapper.tickPrice(reqId, tickType, float(price or 0), attribOf(int(mask or 0)))
+
+        sizeTickType = sizeTickTypes.get(tickType)
+        if sizeTickType is not None:
+            wrapper.tickSize(reqId, sizeTickType, sizeOf(size))
+
+    return processTickPrice
+
+
+def compileTickSize(serverVersion, fastMarketData):
+    sizeOf = floatSizeOf if fastMarketData else decimalOf
+
+    def processTickSize(wrapper, fields):
+        if len(fields) < 5:
+            raise BadMessage("no more fields")
+        (_, _, reqId, sizeTickType, size) = fields[:5]
+        sizeTickType = int(sizeTickType or 0)
+        if sizeTickType != TickTypeEnum.NOT_SET:
+            wrapper.tickSize(int(reqId or 0), sizeTickType, sizeOf(size))
+
+    return processTickSize
+
+
+def compileTickByTick(serverVersion, fastMarketData):
+    def lastAttribOf(mask):
+        tickAttribLast = TickAttribLast()
+        tickAttribLast.pastLimit = mask & 1 != 0
+        tickAttribLast.unreported = mask & 2 != 0
+        return tickAttribLast
+
+    def bidAskAttribOf(mask):
+        tickAttribBidAsk = TickAttribBidAsk()
+        tickAttribBidAsk.bidPastLow = mask & 1 != 0
+        tickAttribBidAsk.askPastHigh = mask & 2 != 0
+        return tickAttribBidAsk
+
+    sizeOf = decimalOf
+    if fastMarketData:
+        lastAttribs = tuple(lastAttribOf(mask) for mask in range(4))
+        lastAttribOf = lambda mask: lastAttribs[mask & 3]
+        bidAskAttribs = tuple(bidAskAttribOf(mask) for mask in range(4))
+        bidAskAttribOf = lambda mask: bidAskAttribs[mask & 3]
+        sizeOf = floatSizeOf
+
+    def processTickByTick(wrapper, fields):
+        if len(fields) < 4:
+            raise BadMessage("no more fields")
+        (_, reqId, tickType, time) = fields[:4]
+        reqId = int(reqId or 0)
+        tickType = int(tickType or 0)
+        time = int(time or 0)
+        if len(fields) < TICK_BY_TICK_LENS.get(tickType, 4):
+            raise BadMessage("no more fields")
+
+        if tickType == 1 or tickType == 2:
+            # Last or AllLast
+            (price, size, mask, exchange, specialConditions) = fields[4:9]
+            wrapper.tickByTickAllLast(
+                reqId,
+                tickType,
+                time,
+                float(price or 0),
+                sizeOf(size),
+                lastAttribOf(int(mask or 0)),
+                strOf(exchange),
+                strOf(specialConditions),
+            )
+        elif tickType == 3:
+            # BidAsk
+            (bidPrice, askPrice, bidSize, askSize, mask) = fields[4:9]
+            wrapper.tickByTickBidAsk(
+                reqId,
+                time,
+                float(bidPrice or 0),
+                float(askPrice or 0),
+                sizeOf(bidSize),
+                sizeOf(askSize),
+                bidAskAttribOf(int(mask or 0)),
+            )
+        elif tickType == 4:
+            # MidPoint
+            wrapper.tickByTickMidPoint(reqId, time, float(fields[4] or 0))
+
+    return processTickByTick
+
+
+def historicalDataLayout(serverVersion) -> tuple:
+    """index of the reqId field and number of fields per bar"""
+
+    if serverVersion >= MIN_SERVER_VER_SYNT_REALTIME_BARS:
+        # no version field, no hasGaps per bar
+        return (1, 8)
+    return (2, 9)
+
+
+def compileHistoricalData(serverVersion, fastMarketData):
+    (first, barLen) = historicalDataLayout(serverVersion)
+    sizeOf = floatSizeOf if fastMarketData else decimalOf
+
+    def processHistoricalData(wrapper, fields):
+        if len(fields) < first + 4:
+            raise BadMessage("no more fields")
+        (reqId, startDateStr, endDateStr, itemCount) = fields[first : first + 4]
+        reqId = int(reqId or 0)
+        itemCount = int(itemCount or 0)
+
+        start = first + 4
+        end = start + itemCount * barLen
+        if len(fields) < end:
+            raise BadMessage("no more fields")
+        for i in range(start, end, barLen):
+            bar = BarData()
+            bar.date = strOf(fields[i])
+            bar.open = float(fields[i + 1] or 0)
+            bar.high = float(fields[i + 2] or 0)
+            bar.low = float(fields[i + 3] or 0)
+            bar.close = float(fields[i + 4] or 0)
+            bar.volume = sizeOf(fields[i + 5])
+            bar.wap = sizeOf(fields[i + 6])
+            bar.barCount = int(fields[i + barLen - 1] or 0)
+            wrapper.historicalData(reqId, bar)
+
+        wrapper.historicalDataEnd(reqId, strOf(startDateStr), strOf(endDateStr))
+
+    return processHistoricalData
+
+
+def compileBulkHistoricalData(serverVersion):
+    (first, barLen) = historicalDataLayout(serverVersion)
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    def processHistoricalDataBulk(wrapper, fields):
+        if len(fields) < first + 4:
+            raise BadMessage("no more fields")
+        (reqId, startDateStr, endDateStr, itemCount) = fields[first : first + 4]
+        reqId = int(reqId or 0)
+
+        start = first + 4
+        end = start + int(itemCount or 0) * barLen
+        if len(fields) < end:
+            raise BadMessage("no more fields")
+        columns = {
+            "date": [strOf(s) for s in fields[start:end:barLen]],
+            "open": [float(s or 0) for s in fields[start + 1 : end : barLen]],
+            "high": [float(s or 0) for s in fields[start + 2 : end : barLen]],
+            "low": [float(s or 0) for s in fields[start + 3 : end : barLen]],
+            "close": [float(s or 0) for s in fields[start + 4 : end : barLen]],
+            "volume": list(map(floatSizeOf, fields[start + 5 : end : barLen])),
+            "wap": list(map(floatSizeOf, fields[start + 6 : end : barLen])),
+            "barCount": [int(s or 0) for s in fields[start + barLen - 1 : end : barLen]],
+        }
+        if numpy is not None:
+            bars = numpy.empty(len(columns["open"]), dtype=list(HISTORICAL_BAR_FIELDS))
+            for name, _ in HISTORICAL_BAR_FIELDS:
+                bars[name] = columns[name]
+        else:
+            bars = columns
+
+        wrapper.historicalDataBulk(reqId, bars, strOf(startDateStr), strOf(endDateStr))
+        wrapper.historicalDataEnd(reqId, strOf(startDateStr), strOf(endDateStr))
+
+    return processHistoricalDataBulk
+
+
+SPEC_COMPILERS = {
+    IN.TICK_PRICE: compileTickPrice,
+    IN.TICK_SIZE: compileTickSize,
+    IN.TICK_BY_TICK: compileTickByTick,
+    IN.HISTORICAL_DATA: compileHistoricalData,
+}
+
+
+def compileSpecs(serverVersion, fastMarketData=False, bulkHistoricalData=False) -> dict:
+    """msgId -> compiled decoder for serverVersion, shared by every Decoder"""
+
+    if serverVersion is None:
+        # not known before the handshake, use the generic decoders
+        return {}
+    key = (serverVersion, fastMarketData, bulkHistoricalData)
+    specs = compiledSpecs.get(key)
+    if specs is None:
+        specs = {
+            msgId: compiler(serverVersion, fastMarketData)
+            for (msgId, compiler) in SPEC_COMPILERS.items()
+        }
+        if bulkHistoricalData:
+            specs[IN.HISTORICAL_DATA] = compileBulkHistoricalData(serverVersion)
+        compiledSpecs[key] = specs
+    return specs
@@ -0,0 +1,168 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+A bounded queue between the EReader thread and EClient.run(), with depth and
+latency metrics. What happens when run() falls behind is up to the policy:
+
+BLOCK: the reader waits for room, TWS then buffers on its side.
+DROP_STALE: when the queue is full an older market data message of the same
+    reqId (else of any reqId) is dropped to make room for the new one.
+    Other messages are never dropped, the reader waits for them.
+CONFLATE: a TICK_PRICE replaces the queued TICK_PRICE of the same reqId and
+    tick type, in its place in the queue; when full it behaves as BLOCK.
+
+Messages are looked at without decoding, only the first fields are split.
+"""
+
+import collections
+import queue
+import time
+
+from ibapi.message import IN
+
+BLOCK = "block"
+DROP_STALE = "drop_stale"
+CONFLATE = "conflate"
+POLICIES = (BLOCK, DROP_STALE, CONFLATE)
+
+# market data msgId -> index of the reqId field
+MARKET_DATA_REQID_IDX = {
+    IN.TICK_PRICE: 2,
+    IN.TICK_SIZE: 2,
+    IN.TICK_GENERIC: 2,
+    IN.TICK_STRING: 2,
+    IN.TICK_BY_TICK: 1,
+}
+
+
+def peekFields(msg, n: int) -> list:
+    """the first n fields of a raw message"""
+    return msg.split(b"\0", n)[:n]
+
+
+def marketDataReqId(msg):
+    """the reqId of a market data message, None for anything else"""
+
+    if msg is None:
+        return None
+    fields = peekFields(msg, 3)
+    if not fields[0].isdigit():
+        return None
+    idx = MARKET_DATA_REQID_IDX.get(int(fields[0]))
+    if idx is None or idx >= len(fields):
+        return None
+    return fields[idx]
+
+
+def tickPriceKey(msg):
+    """(reqId, tickType) of a TICK_PRICE message, None for anything else"""
+
+    if msg is None or not msg.startswith(b"1\0"):
+        return None
+    fields = peekFields(msg, 4)
+    if len(fields) < 4:
+        return None
+    return (fields[2], fields[3])
+
+
+class MsgQueue(queue.Queue):
+    """queue.Queue of raw messages with a size bound policy and metrics"""
+
+    def __init__(self, maxsize=0, policy=BLOCK):
+        if policy not in POLICIES:
+            raise ValueError("unknown queue policy %s" % policy)
+        self.policy = policy
+        queue.Queue.__init__(self, maxsize)
+
+    def _init(self, maxsize):
+        # [msg, time queued]; lists so that conflation can swap the msg
+        self.queue = collections.deque()
+        # (reqId, tickType) -> queued TICK_PRICE entry
+        self.conflated = {}
+        self.highWater = 0
+        self.nGot = 0
+        self.nDropped = 0
+        self.nConflated = 0
+        self.lastAge = 0.0
+        self.maxAge = 0.0
+        self.totalAge = 0.0
+
+    def _put(self, item):
+        entry = [item, time.monotonic()]
+        self.queue.append(entry)
+        if len(self.queue) > self.highWater:
+            self.highWater = len(self.queue)
+        if self.policy == CONFLATE:
+            key = tickPriceKey(item)
+            if key is not None:
+                self.conflated[key] = entry
+
+    def _get(self):
+        entry = self.queue.popleft()
+        (item, queued) = entry
+        if self.conflated:
+            key = tickPriceKey(item)
+            if key is not None and self.conflated.get(key) is entry:
+                del self.conflated[key]
+        age = time.monotonic() - queued
+        self.nGot += 1
+        self.lastAge = age
+        self.totalAge += age
+        if age > self.maxAge:
+            self.maxAge = age
+        return item
+
+    def put(self, item, block=True, timeout=None):
+        if self.policy == CONFLATE:
+            with self.mutex:
+                key = tickPriceKey(item)
+                entry = self.conflated.get(key) if key is not None else None
+                if entry is not None:
+                    # newer price, same place in the queue
+                    entry[0] = item
+                    self.nConflated += 1
+                    return
+        elif self.policy == DROP_STALE and self.maxsize > 0:
+            with self.mutex:
+                if self._qsize() >= self.maxsize:
+                    self.dropStale(marketDataReqId(item))
+        queue.Queue.put(self, item, block, timeout)
+
+    def dropStale(self, reqId):
+        """With the mutex held: drops the oldest queued market data message
+        of reqId, else the oldest of any reqId. Nothing is dropped to make
+        room for other messages (reqId None)."""
+
+        if reqId is None:
+            return
+        oldest = None
+        for entry in self.queue:
+            queuedReqId = marketDataReqId(entry[0])
+            if queuedReqId is None:
+                continue
+            if queuedReqId == reqId:
+                oldest = entry
+                break
+            if oldest is None:
+                oldest = entry
+        if oldest is not None:
+            self.queue.remove(oldest)
+            self.nDropped += 1
+            # every put() is matched by a get(), keep task_done() balanced
+            self.unfinished_tasks -= 1
+
+    def metrics(self) -> dict:
+        with self.mutex:
+            return {
+                "depth": len(self.queue),
+                "highWater": self.highWater,
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                "got": self.nGot,
+                "dropped": self.nDropped,
+                "conflated": self.nConflated,
+                "lastAgeSecs": self.lastAge,
+                "maxAgeSecs": self.maxAge,
+                "avgAgeSecs": self.totalAge / self.nGot if self.nGot else 0.0,
+            }
@@ -0,0 +1,103 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+A precompiled PLACE_ORDER message.
+The static part of the message (contract and every order attribute but the
+ids, quantity and prices) is encoded once, at compile time. Placing the
+order then only formats the variable fields and joins the pieces, which
+avoids building an Order and running the full field encoder per order.
+The variable fields are formatted the way _encodePlaceOrder formats them for
+the server version the template was compiled for.
+"""
+
+import struct
+
+from ibapi.const import UNSET_INTEGER, UNSET_DOUBLE, DOUBLE_INFINITY, INFINITY_STR
+from ibapi.object_implem import Object
+
+SLOT_MARK = "\x01"
+
+
+class OrderTemplateSlot(Object):
+    """Stands in for a variable order attribute while the template is encoded."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return SLOT_MARK + self.name + SLOT_MARK
+
+
+def formatSlotValue(val) -> bytes:
+    # same rules as comm.make_field_handle_empty
+    if val == UNSET_INTEGER or val == UNSET_DOUBLE:
+        return b""
+    if val == DOUBLE_INFINITY:
+        return INFINITY_STR.encode()
+    if type(val) is bool:
+        val = int(val)
+    return str(val).encode()
+
+
+def formatLegacyPrice(val) -> bytes:
+    # servers before MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE / _TRAILING_PERCENT
+    # read an unset price as 0
+    return b"0" if val == UNSET_DOUBLE else str(val).encode()
+
+
+def formatWholeQuantity(val) -> bytes:
+    # servers before MIN_SERVER_VER_FRACTIONAL_POSITIONS take whole shares
+    return str(int(val)).encode()
+
+
+def formatQuantity(val) -> bytes:
+    return str(val).encode()
+
+
+class OrderTemplate(Object):
+    SLOTS = ("orderId", "totalQuantity", "lmtPrice", "auxPrice", "parentId")
+
+    def __init__(
+        self,
+        text: str,
+        transmit: bool = True,
+        wholeQuantity: bool = False,
+        zeroLmtPrice: bool = False,
+        zeroAuxPrice: bool = False,
+    ):
+        self.transmit = transmit
+        self.formatQuantity = formatWholeQuantity if wholeQuantity else formatQuantity
+        self.formatLmtPrice = formatLegacyPrice if zeroLmtPrice else formatSlotValue
+        self.formatAuxPrice = formatLegacyPrice if zeroAuxPrice else formatSlotValue
+        pieces = text.split(SLOT_MARK)
+        self.chunks = [piece.encode() for piece in pieces[0::2]]
+        self.slotIdx = tuple(self.SLOTS.index(name) for name in pieces[1::2])
+
+    def render(
+        self,
+        orderId,
+        totalQuantity,
+        lmtPrice=UNSET_DOUBLE,
+        auxPrice=UNSET_DOUBLE,
+        parentId=0,
+    ) -> bytes:
+        """Returns the full length prefixed message"""
+
+        values = (
+            str(orderId).encode(),
+            self.formatQuantity(totalQuantity),
+            self.formatLmtPrice(lmtPrice),
+            self.formatAuxPrice(auxPrice),
+            str(parentId).encode(),
+        )
+        chunks = self.chunks
+        parts = [chunks[0]]
+        for i, idx in enumerate(self.slotIdx, 1):
+            parts.append(values[idx])
+            parts.append(chunks[i])
+        body = b"".join(parts)
+        return struct.pack("!I", len(body)) + body
+
+    def __str__(self):
+        return "OrderTemplate slots: %s" % ",".join(self.SLOTS[i] for i in self.slotIdx)
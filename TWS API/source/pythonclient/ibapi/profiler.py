@@ -0,0 +1,153 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Per message type profiling of Decoder.interpret().
+For every IN message id it counts the messages and their bytes, and splits
+the time spent in interpret() into decode time and time spent in the
+wrapper's callbacks. Decoder.setProfiler() (or EClient.setProfiler())
+turns it on; when it is off the decoder runs unchanged.
+"""
+
+import logging
+import time
+
+from ibapi.message import IN
+from ibapi.object_implem import Object
+
+logger = logging.getLogger(__name__)
+
+MSG_NAMES = {
+    msgId: name
+    for (name, msgId) in vars(IN).items()
+    if not name.startswith("_") and isinstance(msgId, int)
+}
+
+
+class TimedWrapper(Object):
+    """Forwards every callback to the wrapper and adds its duration to the
+    profiler's callback time of the current message"""
+
+    def __init__(self, wrapper, profiler):
+        self.wrapper = wrapper
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        meth = getattr(self.wrapper, name)
+        if not callable(meth):
+            return meth
+        profiler = self.profiler
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return meth(*args, **kwargs)
+            finally:
+                profiler.callbackSecs += time.perf_counter() - start
+
+        # looked up once per callback name
+        setattr(self, name, timed)
+        return timed
+
+
+class MsgProfiler(Object):
+    """msgId -> [count, bytes, decode secs, callback secs]
+
+    dumpEvery: seconds between two dump() calls, made from the decoding
+        thread after a message, None to dump only on request.
+    dumpPath: dump() appends the snapshot as a JSON line to this file;
+        without it the table is logged."""
+
+    def __init__(self, dumpEvery=None, dumpPath=None):
+        self.dumpEvery = dumpEvery
+        self.dumpPath = dumpPath
+        self.callbackSecs = 0.0
+        self.reset()
+
+    def reset(self):
+        self.stats = {}
+        self.started = time.perf_counter()
+        self.nextDump = self.started + self.dumpEvery if self.dumpEvery else None
+
+    def timed(self, interpret):
+        """Returns interpret (a Decoder's bound interpret()) with profiling"""
+
+        def profiledInterpret(fields):
+            if not fields:
+                return interpret(fields)
+            msgId = int(fields[0])
+            self.callbackSecs = 0.0
+            start = time.perf_counter()
+            try:
+                return interpret(fields)
+            finally:
+                end = time.perf_counter()
+                entry = self.stats.get(msgId)
+                if entry is None:
+                    entry = self.stats[msgId] = [0, 0, 0.0, 0.0]
+                entry[0] += 1
+                # payload plus the NULL terminators
+                entry[1] += sum(map(len, fields)) + len(fields)
+                entry[2] += end - start - self.callbackSecs
+                entry[3] += self.callbackSecs
+                if self.nextDump is not None and end >= self.nextDump:
+                    self.nextDump = end + self.dumpEvery
+                    self.dump()
+
+        return profiledInterpret
+
+    def snapshot(self) -> dict:
+        """message name -> counters, plus the averages per message"""
+
+        elapsed = time.perf_counter() - self.started
+        snapshot = {}
+        # the decode thread may add message types while we iterate
+        for msgId, (count, nBytes, decodeSecs, callbackSecs) in list(self.stats.items()):
+            snapshot[MSG_NAMES.get(msgId, str(msgId))] = {
+                "msgId": msgId,
+                "count": count,
+                "bytes": nBytes,
+                "decodeSecs": decodeSecs,
+                "callbackSecs": callbackSecs,
+                "decodeUs": decodeSecs / count * 1e6,
+                "callbackUs": callbackSecs / count * 1e6,
+                "msgsPerSec": count / elapsed if elapsed > 0 else 0.0,
+            }
+        return snapshot
+
+    def table(self) -> str:
+        """The snapshot as text, the most expensive message types first"""
+
+        lines = [
+            "%-28s %10s %12s %10s %10s %10s %10s"
+            % ("msg", "count", "bytes", "decode s", "callbk s", "decode us", "callbk us")
+        ]
+        snapshot = self.snapshot()
+        for name in sorted(
+            snapshot,
+            key=lambda name: snapshot[name]["decodeSecs"] + snapshot[name]["callbackSecs"],
+            reverse=True,
+        ):
+            s = snapshot[name]
+            lines.append(
+                "%-28s %10d %12d %10.3f %10.3f %10.1f %10.1f"
+                % (
+                    name,
+                    s["count"],
+                    s["bytes"],
+                    s["decodeSecs"],
+                    s["callbackSecs"],
+                    s["decodeUs"],
+                    s["callbackUs"],
+                )
+            )
+        return "\n".join(lines)
+
+    def dump(self):
+        if self.dumpPath is not None:
+            import json
+
+            with open(self.dumpPath, "a") as f:
+                f.write(json.dumps({"time": time.time(), "stats": self.snapshot()}) + "\n")
+        else:
+            logger.info("message profile:\n%s", self.table())
@@ -25,25 +25,41 @@ class EReader(Thread):
     def run(self):
         try:
             logger.debug("EReader thread started")
-            buf = b""
+            buf = bytearray(self.conn.recvBufSize)
+            end = 0
+            useSelector = self.conn.selector is not None
             while self.conn.isConnected():
-                data = self.conn.recvMsg()
-                logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
-
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    # logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug(
-                        "size:%d msg.size:%d msg:|%s| buf:%s|", size, len(msg), buf, "|"
-                    )
-
-                    if msg:
-                        self.msg_queue.put(msg)
-                    else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
+                if useSelector and not self.conn.waitReadable():
+                    break
+                end = self.conn.recvInto(buf, end)
+
+                pos = self.putMsgs(buf, end)
+                if pos < end:
+                    logger.debug("more incoming packet(s) are needed ")
+                if pos:
+                    # move the partial message, all that is left, to the front
+                    buf[: end - pos] = buf[pos:end]
+                    end -= pos
 
             logger.debug("EReader thread finished")
         except:
             logger.exception("unhandled exception in EReader thread")
+        finally:
+            if self.conn.selector is not None:
+                self.conn.closeSelector()
+                # EClient.run() waits without a timeout in this mode, wake it up
+                self.msg_queue.put(None)
+
+    def putMsgs(self, buf: bytearray, end: int = None) -> int:
+        """Queues every complete message in buf[:end] and returns the offset
+        of the first byte that still belongs to an incomplete one"""
+
+        pos = 0
+        with memoryview(buf)[:end] as view:
+            while True:
+                (size, msg, pos) = comm.read_msg_from(view, pos)
+                if msg is None:
+                    break
+                if msg:
+                    self.msg_queue.put(msg)
+        return pos
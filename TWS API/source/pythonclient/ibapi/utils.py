@@ -5,7 +5,6 @@ Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is su
 
 import sys
 import logging
-import inspect
 
 from decimal import Decimal
 
@@ -17,6 +16,7 @@ from ibapi.const import (
     DOUBLE_INFINITY,
     INFINITY_STR,
 )
+from ibapi.object_implem import Object
 
 """
 Collection of misc tools
@@ -50,6 +50,8 @@ class LogFunction(object):
     def __call__(self, fn):
         def newFn(origSelf, *args, **kwargs):
             if logger.isEnabledFor(self.logLevel):
+                import inspect
+
                 argNames = [
                     argName
                     for argName in inspect.getfullargspec(fn)[0]
@@ -82,6 +84,22 @@ def setattr_log(self, var_name, var_value):
 SHOW_UNSET = True
 
 
+# the strings decode(Decimal, ...) maps to UNSET_DECIMAL
+UNSET_DECIMAL_STRS = frozenset(
+    (b"", b"2147483647", b"9223372036854775807", b"1.7976931348623157E308")
+)
+
+
+def decimalOf(s: bytes) -> Decimal:
+    """decode(Decimal, ...) of a single field"""
+    return UNSET_DECIMAL if s in UNSET_DECIMAL_STRS else Decimal(s.decode())
+
+
+def strOf(s: bytes) -> str:
+    """decode(str, ...) of a single field"""
+    return s.decode("UTF-8", errors="backslashreplace")
+
+
 def decode(the_type, fields, show_unset=False, use_unicode=False):
     try:
         s = next(fields)
@@ -91,15 +109,9 @@ def decode(the_type, fields, show_unset=False, use_unicode=False):
     logger.debug("decode %s %s", the_type, s)
 
     if the_type is Decimal:
-        if (
-            s is None
-            or len(s) == 0
-            or s.decode() == "2147483647"
-            or s.decode() == "9223372036854775807"
-            or s.decode() == "1.7976931348623157E308"
-        ):
+        if s is None:
             return UNSET_DECIMAL
-        return the_type(s.decode())
+        return decimalOf(s)
 
     if the_type is str:
         if type(s) is str:
@@ -141,6 +153,7 @@ def decode(the_type, fields, show_unset=False, use_unicode=False):
 
 
 def ExerciseStaticMethods(klass):
+    import inspect
     import types
 
     # import code; code.interact(local=dict(globals(), **locals()))
@@ -167,6 +180,9 @@ def intMaxString(val):
 
 
 def isAsciiPrintable(val):
+    if val.isascii() and val.isprintable():
+        # single pass in C for the common case
+        return True
     return all(ord(c) >= 32 and ord(c) < 127 or ord(c) == 9 or ord(c) == 10 or ord(c) == 13 for c in val)
 
 
@@ -192,3 +208,33 @@ def log_(func, params, action):
             params = dict(params)
             del params["self"]
         logger.info(f"{action} {func} {params}")
+
+
+class ApiLogging(Object):
+    """Switch for the REQUEST/ANSWER/SENDING logs of EClient and EWrapper.
+    The call sites test the plain `on` attribute before calling
+    current_fn_name() and vars(), so with logging off a request or a
+    callback pays a single attribute check."""
+
+    __slots__ = ("on", "pinned")
+
+    def __init__(self):
+        self.on = False
+        self.pinned = False
+
+    def refresh(self):
+        """follow the level of this module's logger, EClient.connect() calls it"""
+        if not self.pinned:
+            self.on = logger.isEnabledFor(logging.INFO)
+
+    def set(self, on):
+        """True/False forces the logs on/off, None follows the logger level again"""
+        self.pinned = on is not None
+        if self.pinned:
+            self.on = bool(on)
+        else:
+            self.refresh()
+
+
+apiLogging = ApiLogging()
+apiLogging.refresh()
@@ -0,0 +1,61 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Messages/sec through Decoder.interpret() for the hot market data messages,
+with the generic field by field decoders, the compiled ones and the compiled
+ones in fast market data mode.
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_decoder.py
+"""
+
+import time
+
+from ibapi.decoder import Decoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+from test_decoder_specs import MESSAGES, historicalData
+
+N = 50000
+
+
+class NullWrapper(EWrapper):
+    def tickPrice(self, reqId, tickType, price, attrib):
+        pass
+
+    def tickSize(self, reqId, tickType, size):
+        pass
+
+    def tickByTickAllLast(self, reqId, tickType, time, price, size, tickAttribLast, exchange, specialConditions):
+        pass
+
+    def tickByTickBidAsk(self, reqId, time, bidPrice, askPrice, bidSize, askSize, tickAttribBidAsk):
+        pass
+
+    def tickByTickMidPoint(self, reqId, time, midPoint):
+        pass
+
+    def historicalData(self, reqId, bar):
+        pass
+
+    def historicalDataEnd(self, reqId, start, end):
+        pass
+
+
+def main():
+    msgs = MESSAGES + (historicalData(MAX_CLIENT_VER),)
+    rounds = N // len(msgs)
+    for name in ("generic", "compiled", "fast"):
+        decoder = Decoder(NullWrapper(), MAX_CLIENT_VER, fastMarketData=name == "fast")
+        if name == "generic":
+            decoder.compiledProcs = {}
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for msg in msgs:
+                decoder.interpret(msg)
+        secs = time.perf_counter() - start
+        print(f"{name:10s} {rounds * len(msgs) / secs:12.0f} msgs/s")
+
+
+if "__main__" == __name__:
+    main()
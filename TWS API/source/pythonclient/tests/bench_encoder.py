@@ -0,0 +1,48 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Encoding cost of a burst of reqMktData() subscriptions, as sent at the open.
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_encoder.py
+"""
+
+import time
+
+from ibapi.contract import Contract
+
+from test_order_template import connectedClient
+
+SYMBOLS = 500
+ROUNDS = 20
+
+
+def main():
+    client = connectedClient()
+    contracts = []
+    for i in range(SYMBOLS):
+        contract = Contract()
+        contract.symbol = "SYM%d" % i
+        contract.secType = "STK"
+        contract.exchange = "SMART"
+        contract.currency = "USD"
+        contracts.append(contract)
+
+    for name in ("cold", "warm"):
+        start = time.perf_counter()
+        for reqId, contract in enumerate(contracts):
+            client.reqMktData(reqId, contract, "", False, False, [])
+        secs = time.perf_counter() - start
+        print(f"{name:10s} {secs / SYMBOLS * 1e6:8.1f} us/request")
+        client.conn.sent.clear()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for reqId, contract in enumerate(contracts):
+            client.reqMktData(reqId, contract, "", False, False, [])
+        client.conn.sent.clear()
+    secs = time.perf_counter() - start
+    print(f"{'sustained':10s} {secs / (SYMBOLS * ROUNDS) * 1e6:8.1f} us/request")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,46 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Replays tick messages through Decoder.interpret() into the default EWrapper
+callbacks, with the REQUEST/ANSWER logging off and on (into a NullHandler).
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_logging.py [ticks]
+"""
+
+import logging
+import sys
+import time
+
+from ibapi.decoder import Decoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import apiLogging
+from ibapi.wrapper import EWrapper
+
+from test_decoder_specs import MESSAGES
+
+N = 1000000
+
+
+def replay(decoder, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for msg in MESSAGES:
+            decoder.interpret(msg)
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    rounds = n // len(MESSAGES)
+    logging.getLogger("ibapi").addHandler(logging.NullHandler())
+    logging.getLogger("ibapi").propagate = False
+    decoder = Decoder(EWrapper(), MAX_CLIENT_VER)
+    for on in (False, True):
+        apiLogging.set(on)
+        secs = replay(decoder, rounds)
+        print(f"logging {'on ' if on else 'off'} {rounds * len(MESSAGES) / secs:12.0f} ticks/s")
+    apiLogging.set(None)
+
+
+if "__main__" == __name__:
+    main()
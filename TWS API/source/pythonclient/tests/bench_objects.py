@@ -0,0 +1,65 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Memory and construction time of 1M BarData and 100k Order objects, against
+the previous layouts: a __dict__ per bar, and every Order default assigned
+in __init__.
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_objects.py
+"""
+
+import time
+import tracemalloc
+
+from ibapi.common import BarData
+from ibapi.const import UNSET_DECIMAL
+from ibapi.order import Order
+
+N_BARS = 1000000
+N_ORDERS = 100000
+
+ORDER_DEFAULTS = {
+    name: value
+    for (name, value) in vars(Order).items()
+    if not name.startswith("__") and not callable(value)
+}
+
+
+class DictBarData:
+    def __init__(self):
+        self.date = ""
+        self.open = 0.0
+        self.high = 0.0
+        self.low = 0.0
+        self.close = 0.0
+        self.volume = UNSET_DECIMAL
+        self.wap = UNSET_DECIMAL
+        self.barCount = 0
+
+
+def eagerOrder():
+    order = Order()
+    order.__dict__.update(ORDER_DEFAULTS)
+    return order
+
+
+def measure(name, factory, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    objs = [factory() for _ in range(n)]
+    secs = time.perf_counter() - start
+    (size, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:12s} {n:8d} objs {secs / n * 1e9:8.0f} ns/obj {size / n:8.0f} bytes/obj")
+    del objs
+
+
+def main():
+    measure("dict bar", DictBarData, N_BARS)
+    measure("BarData", BarData, N_BARS)
+    measure("eager order", eagerOrder, N_ORDERS)
+    measure("Order", Order, N_ORDERS)
+
+
+if "__main__" == __name__:
+    main()
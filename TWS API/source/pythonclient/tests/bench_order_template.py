@@ -0,0 +1,51 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Compares placing a bracket leg with placeOrder() against placeOrderTemplate().
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_order_template.py
+"""
+
+import timeit
+
+from ibapi.contract import Contract
+from ibapi.order import Order
+
+from test_order_template import connectedClient
+
+N = 20000
+
+
+def main():
+    client = connectedClient()
+    contract = Contract()
+    contract.symbol = "AMD"
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+
+    def placeOrder():
+        order = Order()
+        order.action = "SELL"
+        order.orderType = "LMT"
+        order.totalQuantity = 250
+        order.lmtPrice = 11.56
+        order.parentId = 17
+        client.placeOrder(19, contract, order)
+
+    proto = Order()
+    proto.action = "SELL"
+    proto.orderType = "LMT"
+    template = client.compileOrderTemplate(contract, proto)
+
+    def placeOrderTemplate():
+        client.placeOrderTemplate(template, 19, 250, lmtPrice=11.56, parentId=17)
+
+    for name, fn in (("placeOrder", placeOrder), ("placeOrderTemplate", placeOrderTemplate)):
+        client.conn.sent.clear()
+        secs = timeit.timeit(fn, number=N)
+        print(f"{name:20s} {secs / N * 1e6:8.1f} us/order")
+
+
+if "__main__" == __name__:
+    main()
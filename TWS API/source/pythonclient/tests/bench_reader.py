@@ -0,0 +1,57 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Splits a burst of tick messages received in a single recv into frames, with
+the old bytes slicing loop (comm.read_msg) and with EReader.putMsgs.
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_reader.py
+"""
+
+import queue
+import time
+
+from ibapi import comm
+from ibapi.reader import EReader
+
+N = 100000
+# the slicing loop is quadratic, keep its burst small
+N_READ_MSG = 10000
+
+
+def burst(n):
+    tick = comm.make_msg("1\x006\x001\x004\x0012.34\x00100\x000\x00")
+    return tick * n
+
+
+def readMsgLoop(data):
+    msg_queue = queue.Queue()
+    buf = data
+    while len(buf) > 0:
+        (size, msg, buf) = comm.read_msg(buf)
+        if msg:
+            msg_queue.put(msg)
+        else:
+            break
+    return msg_queue.qsize()
+
+
+def putMsgs(data):
+    msg_queue = queue.Queue()
+    buf = bytearray(data)
+    pos = EReader(None, msg_queue).putMsgs(buf)
+    del buf[:pos]
+    return msg_queue.qsize()
+
+
+def main():
+    for name, fn, n in (("read_msg", readMsgLoop, N_READ_MSG), ("putMsgs", putMsgs, N)):
+        data = burst(n)
+        start = time.perf_counter()
+        count = fn(data)
+        secs = time.perf_counter() - start
+        assert count == n
+        print(f"{name:10s} {n:7d} msgs {secs:8.3f} s {n / secs:12.0f} msgs/s")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,48 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Startup cost of a fresh process: importing EClient, then what connect()
+adds (importing the decoder and building the first and a second Decoder).
+Run from the pythonclient directory: PYTHONPATH=. python tests/bench_startup.py
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 7
+
+PROBE = """
+import time
+import logging, socket
+t0 = time.perf_counter()
+from ibapi.client import EClient
+t1 = time.perf_counter()
+from ibapi.decoder import Decoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+t2 = time.perf_counter()
+Decoder(EWrapper(), MAX_CLIENT_VER)
+t3 = time.perf_counter()
+Decoder(EWrapper(), MAX_CLIENT_VER)
+t4 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+"""
+
+STEPS = ("import EClient", "import decoder", "first Decoder", "next Decoder")
+
+
+def main():
+    runs = []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+        ).stdout
+        runs.append([float(secs) for secs in out.split()])
+    for i, step in enumerate(STEPS):
+        print(f"{step:16s} {statistics.median(run[i] for run in runs) * 1e3:8.2f} ms")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,49 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import logging
+import unittest
+
+from ibapi import utils
+from ibapi.utils import apiLogging
+from ibapi.wrapper import EWrapper
+
+
+class ApiLoggingTestCase(unittest.TestCase):
+    def tearDown(self):
+        utils.logger.setLevel(logging.NOTSET)
+        apiLogging.set(None)
+
+    def test_off_skips_the_log(self):
+        apiLogging.set(False)
+        with self.assertNoLogs(utils.logger, logging.INFO):
+            EWrapper().tickSize(1, 8, 100)
+
+    def test_on_logs_the_answer(self):
+        apiLogging.set(True)
+        with self.assertLogs(utils.logger, logging.INFO) as logs:
+            EWrapper().tickSize(1, 8, 100)
+        self.assertEqual(1, len(logs.output))
+        self.assertIn("ANSWER tickSize", logs.output[0])
+        self.assertNotIn("'self'", logs.output[0])
+
+    def test_refresh_follows_the_logger_level(self):
+        apiLogging.set(None)
+        utils.logger.setLevel(logging.WARNING)
+        apiLogging.refresh()
+        self.assertFalse(apiLogging.on)
+        utils.logger.setLevel(logging.INFO)
+        apiLogging.refresh()
+        self.assertTrue(apiLogging.on)
+
+    def test_pinned_ignores_the_logger_level(self):
+        apiLogging.set(False)
+        utils.logger.setLevel(logging.INFO)
+        apiLogging.refresh()
+        self.assertFalse(apiLogging.on)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import asyncio
+import unittest
+
+from ibapi import comm
+from ibapi.async_client import AsyncEClient
+from ibapi.contract import Contract
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import ClientException
+from ibapi.wrapper import EWrapper
+
+
+class RecordingWrapper(EWrapper):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def connectAck(self):
+        self.calls.append(("connectAck",))
+
+    def currentTime(self, time: int):
+        self.calls.append(("currentTime", time))
+
+    def contractDetailsEnd(self, reqId: int):
+        self.calls.append(("contractDetailsEnd", reqId))
+
+
+def fieldsMsg(*fields):
+    return comm.make_msg("".join(comm.make_field(field) for field in fields))
+
+
+class FakeTws:
+    """Answers the handshake and, after startApi, sends `answers` split in two writes"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.received = asyncio.Queue()
+
+    async def handle(self, reader, writer):
+        await reader.readexactly(4)  # API\0
+        size = int.from_bytes(await reader.readexactly(4), "big")
+        await reader.readexactly(size)
+        writer.write(fieldsMsg(MAX_CLIENT_VER, "20240102 09:30:00 EST"))
+        size = int.from_bytes(await reader.readexactly(4), "big")
+        await reader.readexactly(size)  # startApi
+        wire = b"".join(self.answers)
+        writer.write(wire[:7])
+        await writer.drain()
+        writer.write(wire[7:])
+        await writer.drain()
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                break
+            await self.received.put(data)
+        writer.close()
+
+
+class AsyncClientTestCase(unittest.TestCase):
+    async def connected(self, answers):
+        self.tws = FakeTws(answers)
+        self.server = await asyncio.start_server(self.tws.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.wrapper = RecordingWrapper()
+        self.client = AsyncEClient(self.wrapper)
+        await self.client.connectAsync("127.0.0.1", port, 0)
+
+    async def closed(self):
+        self.client.disconnect()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def test_connect_and_dispatch(self):
+        async def scenario():
+            await self.connected([fieldsMsg(49, 1, 1704205800)])
+            self.assertTrue(self.client.isConnected())
+            self.assertEqual(self.client.serverVersion(), MAX_CLIENT_VER)
+            while len(self.wrapper.calls) < 2:
+                await asyncio.sleep(0.01)
+            self.assertEqual(
+                self.wrapper.calls, [("connectAck",), ("currentTime", 1704205800)]
+            )
+            await self.closed()
+
+        asyncio.run(scenario())
+
+    def test_request_future(self):
+        async def scenario():
+            await self.connected([])
+            contract = Contract()
+            contract.symbol = "AMD"
+            contract.secType = "STK"
+            contract.exchange = "SMART"
+            contract.currency = "USD"
+
+            future = asyncio.ensure_future(self.client.reqContractDetailsAsync(7, contract))
+            await asyncio.sleep(0)
+            self.client.requests.contractDetails(7, "details")
+            self.client.requests.contractDetailsEnd(7)
+            self.assertEqual(await future, ["details"])
+            self.assertIn(("contractDetailsEnd", 7), self.wrapper.calls)
+
+            future = asyncio.ensure_future(self.client.reqContractDetailsAsync(8, contract))
+            await asyncio.sleep(0)
+            self.client.requests.error(8, 200, "No security definition has been found")
+            with self.assertRaises(ClientException):
+                await future
+            await self.closed()
+
+        asyncio.run(scenario())
+
+    def test_connection_lost_fails_pending(self):
+        async def scenario():
+            await self.connected([])
+            future = self.client.requests.expect(9)
+            self.client.conn.transport.abort()
+            with self.assertRaises(ClientException):
+                await future
+            self.assertFalse(self.client.isConnected())
+            self.server.close()
+            await self.server.wait_closed()
+
+        asyncio.run(scenario())
+
+    def test_run_points_to_connect_async(self):
+        client = AsyncEClient(RecordingWrapper())
+        with self.assertRaisesRegex(RuntimeError, "connectAsync"):
+            client.run()
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import socket
+import unittest
+
+from ibapi import comm, decoder
+from ibapi.client import EClient
+from ibapi.connection import Connection
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class LoopClient(EWrapper, EClient):
+    def __init__(self):
+        EWrapper.__init__(self)
+        EClient.__init__(self, self)
+        self.times = []
+        self.nMsgLoopRec = 0
+        self.serverVersion_ = MAX_CLIENT_VER
+        self.decoder = decoder.Decoder(self, MAX_CLIENT_VER)
+
+    def currentTime(self, time: int):
+        self.times.append(time)
+
+    def msgLoopRec(self):
+        self.nMsgLoopRec += 1
+
+
+class CountingConnection(Connection):
+    def __init__(self, *args):
+        Connection.__init__(self, *args)
+        self.writes = []
+
+    def _sendAll(self, msg):
+        self.writes.append(bytes(msg))
+        return Connection._sendAll(self, msg)
+
+
+class EchoClient(LoopClient):
+    def currentTime(self, time: int):
+        LoopClient.currentTime(self, time)
+        self.reqCurrentTime()
+
+
+class DisconnectingClient(LoopClient):
+    def currentTime(self, time: int):
+        LoopClient.currentTime(self, time)
+        self.disconnect()
+
+
+def currentTimeMsg(time):
+    return comm.make_msg(comm.make_field(49) + comm.make_field(1) + comm.make_field(time))
+
+
+class ClientLoopTestCase(unittest.TestCase):
+    def test_batch_drain(self):
+        client = LoopClient()
+        client.setMsgBatchSize(3)
+        for time in range(5):
+            (size, msg, rest) = comm.read_msg(currentTimeMsg(time))
+            client.msg_queue.put(msg)
+
+        # not connected: run() drains the queue and returns
+        client.run()
+
+        self.assertEqual(client.times, list(range(5)))
+        self.assertEqual(client.nMsgLoopRec, 2)
+
+    def test_inline_decode(self):
+        (ours, theirs) = socket.socketpair()
+        client = LoopClient()
+        client.setInlineDecode(True)
+        client.conn = Connection("127.0.0.1", 0, recvBufSize=16)
+        client.conn.socket = ours
+        client.conn.socket.settimeout(0.2)
+        client.setConnState(EClient.CONNECTED)
+        theirs.sendall(b"".join(currentTimeMsg(time) for time in range(100)))
+        theirs.close()
+
+        # runs until the closed peer disconnects
+        client.run()
+
+        self.assertEqual(client.times, list(range(100)))
+        self.assertFalse(client.isConnected())
+        self.assertIsNone(client.reader)
+
+    def test_send_batching(self):
+        (ours, theirs) = socket.socketpair()
+        client = EchoClient()
+        client.setInlineDecode(True)
+        client.setSendBatching(True)
+        conn = CountingConnection("127.0.0.1", 0)
+        conn.socket = ours
+        client.conn = conn
+        client.conn.socket.settimeout(0.2)
+        client.setConnState(EClient.CONNECTED)
+        theirs.sendall(b"".join(currentTimeMsg(time) for time in range(100)))
+        # keep reading what the client sends
+        theirs.shutdown(socket.SHUT_WR)
+
+        client.run()
+
+        reqs = comm.make_msg(comm.make_field(49) + comm.make_field(1)) * 100
+        self.assertEqual(b"".join(conn.writes), reqs)
+        self.assertEqual(len(conn.writes), 1, "requests should be coalesced")
+        theirs.settimeout(1)
+        received = b""
+        while len(received) < len(reqs):
+            received += theirs.recv(len(reqs))
+        self.assertEqual(received, reqs)
+        theirs.close()
+
+    def test_disconnect_from_callback(self):
+        (ours, theirs) = socket.socketpair()
+        client = DisconnectingClient()
+        client.setMsgBatchSize(1)
+        client.setSendBatching(True)
+        client.conn = Connection("127.0.0.1", 0)
+        client.conn.socket = ours
+        client.setConnState(EClient.CONNECTED)
+        for time in range(3):
+            (size, msg, rest) = comm.read_msg(currentTimeMsg(time))
+            client.msg_queue.put(msg)
+
+        # the messages queued after the disconnect are still dispatched
+        client.run()
+
+        self.assertEqual(client.times, list(range(3)))
+        self.assertIsNone(client.conn)
+        theirs.close()
+
+
+if "__main__" == __name__:
+    unittest.main()
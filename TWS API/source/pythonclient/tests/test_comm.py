@@ -6,6 +6,8 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 import unittest
 import struct
 from ibapi import comm
+from ibapi.contract import Contract
+from ibapi.utils import ClientException
 
 
 class CommTestCase(unittest.TestCase):
@@ -42,6 +44,24 @@ class CommTestCase(unittest.TestCase):
         self.assertEqual(text2.decode(), text, "msg payload not good")
         self.assertEqual(len(rest), 0, "there should be no remainder msg")
 
+    def test_read_msg_from(self):
+        buf = bytearray(comm.make_msg("ABCD") + comm.make_msg("EF"))
+
+        (size, text, pos) = comm.read_msg_from(buf, 0)
+        self.assertEqual(size, 4, "msg size not good")
+        self.assertEqual(text, b"ABCD", "msg payload not good")
+
+        (size, text, pos) = comm.read_msg_from(buf, pos)
+        self.assertEqual(text, b"EF", "msg payload not good")
+        self.assertEqual(pos, len(buf), "offset should be at the end")
+
+    def test_read_msg_from_partial(self):
+        buf = bytearray(comm.make_msg("ABCD")[:6])
+
+        (size, text, pos) = comm.read_msg_from(buf, 0)
+        self.assertIsNone(text, "partial msg should not be returned")
+        self.assertEqual(pos, 0, "offset should not move")
+
     def test_readFields(self):
         text1 = "ABCD"
         text2 = "123"
@@ -55,6 +75,46 @@ class CommTestCase(unittest.TestCase):
         self.assertEqual(fields[0].decode(), text1)
         self.assertEqual(fields[1].decode(), text2)
 
+    def test_readFields_empty_fields(self):
+        fields = comm.read_fields(b"1\0\0abc\0\0")
+
+        self.assertEqual(list(fields), [b"1", b"", b"abc", b""])
+
+    def test_make_msg_bytes(self):
+        self.assertEqual(comm.make_msg(b"ABCD"), comm.make_msg("ABCD"))
+
+    def test_make_field_invalid_symbol(self):
+        self.assertEqual(comm.make_field("A\tB"), "A\tB\0")
+        with self.assertRaises(ClientException):
+            comm.make_field("AB\x01")
+        with self.assertRaises(ClientException):
+            comm.make_field("AB\u00e9")
+
+    def test_make_contract_fields(self):
+        contract = Contract()
+        contract.symbol = "AMD"
+        contract.secType = "STK"
+        contract.exchange = "SMART"
+        contract.currency = "USD"
+        expected = "".join(
+            comm.make_field(val)
+            for val in ("AMD", "STK", "", 0.0, "", "", "SMART", "", "USD", "")
+        )
+
+        self.assertEqual(comm.make_contract_fields(contract), expected)
+        self.assertEqual(comm.make_contract_fields(contract), expected, "cached fragment not good")
+
+        contract.symbol = "TSM"
+        self.assertEqual(
+            comm.make_contract_fields(contract),
+            expected.replace("AMD", "TSM"),
+            "changed contract should not hit the cache",
+        )
+
+        contract.symbol = None
+        with self.assertRaises(ValueError):
+            comm.make_contract_fields(contract)
+
 
 if "__main__" == __name__:
     unittest.main()
@@ -0,0 +1,73 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.conflation import MarketDataConflator, conflationKey
+from ibapi.message import IN
+
+from test_msg_queue import ORDER_STATUS, raw, tickPrice
+
+
+def tickSize(reqId, tickType, size):
+    return raw(IN.TICK_SIZE, 6, reqId, tickType, size)
+
+
+def tickByTick(reqId, tickType, *values):
+    return raw(IN.TICK_BY_TICK, reqId, tickType, 1704205800, *values)
+
+
+EXEC_DATA = raw(IN.EXECUTION_DATA, 7, "0001f4e8.01")
+
+
+class ConflationTestCase(unittest.TestCase):
+    def test_key(self):
+        self.assertEqual(conflationKey(tickPrice(3, 1, 10.0)), conflationKey(tickPrice(3, 1, 10.5)))
+        self.assertNotEqual(conflationKey(tickPrice(3, 1, 10.0)), conflationKey(tickPrice(3, 2, 10.0)))
+        self.assertNotEqual(conflationKey(tickPrice(3, 1, 10.0)), conflationKey(tickSize(3, 1, 100)))
+        self.assertIsNone(conflationKey(ORDER_STATUS))
+        self.assertIsNone(conflationKey(None))
+        # trades are never conflated
+        self.assertIsNone(conflationKey(tickByTick(3, 2, 12.5, 100, 0, "ARCA", "")))
+        self.assertIsNotNone(conflationKey(tickByTick(3, 4, 12.5)))
+
+    def test_latest_per_key(self):
+        conflator = MarketDataConflator()
+        msgs = conflator.conflate([
+            tickPrice(1, 1, 10.0),
+            tickSize(1, 0, 100),
+            tickPrice(1, 1, 10.1),
+            tickPrice(2, 1, 20.0),
+            tickPrice(1, 1, 10.2),
+        ])
+
+        self.assertEqual(msgs, [tickPrice(1, 1, 10.2), tickSize(1, 0, 100), tickPrice(2, 1, 20.0)])
+        self.assertEqual(conflator.metrics()["conflated"], 2)
+
+    def test_orders_keep_order(self):
+        conflator = MarketDataConflator()
+        msgs = conflator.conflate([
+            tickPrice(1, 4, 10.0),
+            tickPrice(1, 4, 10.1),
+            ORDER_STATUS,
+            tickPrice(1, 4, 10.2),
+            EXEC_DATA,
+            tickPrice(1, 4, 10.3),
+            tickPrice(1, 4, 10.4),
+            None,
+        ])
+
+        self.assertEqual(msgs, [
+            tickPrice(1, 4, 10.1),
+            ORDER_STATUS,
+            tickPrice(1, 4, 10.2),
+            EXEC_DATA,
+            tickPrice(1, 4, 10.4),
+            None,
+        ])
+
+
+if "__main__" == __name__:
+    unittest.main()
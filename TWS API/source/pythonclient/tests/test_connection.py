@@ -0,0 +1,82 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import socket
+import threading
+import unittest
+
+from ibapi.connection import Connection
+
+
+class PartialSocket:
+    """send() takes at most 3 bytes at a time"""
+
+    def __init__(self):
+        self.data = b""
+
+    def send(self, view):
+        chunk = bytes(view[:3])
+        self.data += chunk
+        return len(chunk)
+
+
+class ConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        (ours, self.theirs) = socket.socketpair()
+        self.theirs.settimeout(1)
+        self.conn = Connection("127.0.0.1", 0)
+        self.conn.socket = ours
+
+    def tearDown(self):
+        self.conn.disconnect()
+        self.theirs.close()
+
+    def received(self):
+        self.theirs.setblocking(False)
+        try:
+            return self.theirs.recv(4096)
+        except BlockingIOError:
+            return b""
+        finally:
+            self.theirs.settimeout(1)
+
+    def test_sendMsg_partial_writes(self):
+        self.conn.socket.close()
+        self.conn.socket = PartialSocket()
+
+        self.assertEqual(self.conn.sendMsg(b"0123456789"), 10)
+        self.assertEqual(self.conn.socket.data, b"0123456789")
+        self.conn.socket = None
+
+    def test_batch(self):
+        self.conn.startBatch()
+        self.conn.sendMsg(b"a")
+        self.conn.sendMsg(b"b")
+        self.assertEqual(self.received(), b"", "batch should be held back")
+
+        self.conn.flush()
+        self.assertEqual(self.received(), b"ab")
+
+        self.conn.sendMsg(b"c")
+        self.conn.endBatch()
+        self.assertEqual(self.received(), b"c")
+
+        self.conn.sendMsg(b"d")
+        self.assertEqual(self.received(), b"d", "sends after endBatch should go out")
+
+    def test_batch_other_thread_keeps_order(self):
+        self.conn.startBatch()
+        self.conn.sendMsg(b"a")
+        sender = threading.Thread(target=self.conn.sendMsg, args=(b"b",))
+        sender.start()
+        sender.join()
+        self.assertEqual(self.received(), b"ab")
+
+        self.conn.endBatch()
+        self.assertEqual(self.received(), b"")
+
+
+if "__main__" == __name__:
+    unittest.main()
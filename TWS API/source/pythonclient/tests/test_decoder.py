@@ -0,0 +1,85 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class RecordingWrapper(EWrapper):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def nextValidId(self, orderId: int):
+        self.calls.append(("nextValidId", orderId))
+
+    def tickGeneric(self, reqId: int, tickType: int, value: float):
+        self.calls.append(("tickGeneric", reqId, tickType, value))
+
+    def updateAccountValue(self, key: str, val: str, currency: str, accountName: str):
+        self.calls.append(("updateAccountValue", key, val, currency, accountName))
+
+    def verifyCompleted(self, isSuccessful: bool, errorText: str):
+        self.calls.append(("verifyCompleted", isSuccessful, errorText))
+
+
+def fields(*values):
+    return [str(value).encode() for value in values]
+
+
+class DecoderSignatureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = RecordingWrapper()
+        self.decoder = Decoder(self.wrapper, MAX_CLIENT_VER)
+
+    def test_converted_args(self):
+        self.decoder.interpret(fields(IN.NEXT_VALID_ID, 1, 17))
+        self.decoder.interpret(fields(IN.TICK_GENERIC, 6, 3, 49, 0.5))
+        self.decoder.interpret(fields(IN.ACCT_VALUE, 2, "NetLiquidation", "1000.5", "USD", "DU1"))
+        self.decoder.interpret(fields(IN.VERIFY_COMPLETED, 1, "false", ""))
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [
+                ("nextValidId", 17),
+                ("tickGeneric", 3, 49, 0.5),
+                ("updateAccountValue", "NetLiquidation", "1000.5", "USD", "DU1"),
+                ("verifyCompleted", False, ""),
+            ],
+        )
+
+    def test_compiled_once_per_server_version(self):
+        self.decoder.interpret(fields(IN.NEXT_VALID_ID, 1, 17))
+        self.decoder.interpret(fields(IN.NEXT_VALID_ID, 1, 18))
+        self.assertEqual(len(self.decoder.signatures), 1)
+
+        self.decoder.serverVersion = MAX_CLIENT_VER - 1
+        self.assertEqual(self.decoder.signatures, {})
+
+    def test_wrong_field_count(self):
+        self.decoder.interpret(fields(IN.NEXT_VALID_ID, 1, 17, 18))
+        self.assertEqual(self.wrapper.calls, [])
+
+    def test_params_match_inspect(self):
+        import inspect
+
+        Decoder(RecordingWrapper(), MAX_CLIENT_VER)
+        for handleInfo in Decoder.msgId2handleInfo.values():
+            if handleInfo.wrapperMeth is None:
+                continue
+            expected = [
+                (name, None if param.annotation is param.empty else param.annotation)
+                for (name, param) in inspect.signature(handleInfo.wrapperMeth).parameters.items()
+            ]
+            params = [(name, param.annotation) for (name, param) in handleInfo.wrapperParams.items()]
+            self.assertEqual(params, expected, handleInfo.wrapperMeth.__name__)
+
+
+if "__main__" == __name__:
+    unittest.main()
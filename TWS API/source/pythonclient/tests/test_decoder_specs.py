@@ -0,0 +1,145 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.decoder import Decoder
+from ibapi.decoder_specs import compileSpecs
+from ibapi.message import IN
+from ibapi.server_versions import (
+    MAX_CLIENT_VER,
+    MIN_SERVER_VER_PAST_LIMIT,
+    MIN_SERVER_VER_SYNT_REALTIME_BARS,
+)
+from ibapi.utils import BadMessage
+
+
+class RecordingWrapper:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.append((name,) + tuple(
+                arg if isinstance(arg, (int, float, str)) else str(arg) for arg in args
+            ))
+
+        return record
+
+
+def fields(*values):
+    return tuple(str(value).encode() for value in values)
+
+
+MESSAGES = (
+    fields(IN.TICK_PRICE, 6, 3, 1, 12.34, 100, 3),
+    fields(IN.TICK_PRICE, 6, 3, 2, "Infinity", "", 0),
+    fields(IN.TICK_PRICE, 6, 3, 9, 12.0, 2147483647, 1),
+    fields(IN.TICK_SIZE, 6, 3, 8, 1250),
+    fields(IN.TICK_SIZE, 6, 3, 8, "9223372036854775807"),
+    fields(IN.TICK_BY_TICK, 3, 1, 1704205800, 12.5, 300, 2, "ARCA", " T"),
+    fields(IN.TICK_BY_TICK, 3, 3, 1704205800, 12.49, 12.51, 100, 200, 1),
+    fields(IN.TICK_BY_TICK, 3, 4, 1704205800, 12.5),
+)
+
+
+def historicalData(serverVersion):
+    head = (IN.HISTORICAL_DATA,)
+    if serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
+        head += (3,)
+    bars = ()
+    for i in range(3):
+        bar = ("2024010%d" % (i + 1), 10.0 + i, 11.5, 9.75, 11.0, 12000, 10.6)
+        if serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
+            bar += ("false",)
+        bars += bar + (57,)
+    return fields(*head, 4, "20240101", "20240104", 3, *bars)
+
+
+class DecoderSpecsTestCase(unittest.TestCase):
+    def decodeBoth(self, serverVersion, msg):
+        generic = RecordingWrapper()
+        decoder = Decoder(generic, serverVersion)
+        decoder.compiledProcs = {}
+        decoder.interpret(msg)
+
+        compiled = RecordingWrapper()
+        Decoder(compiled, serverVersion).interpret(msg)
+        return (generic.calls, compiled.calls)
+
+    def test_same_callbacks_as_generic_decode(self):
+        for serverVersion in (MIN_SERVER_VER_PAST_LIMIT - 1, MAX_CLIENT_VER):
+            for msg in MESSAGES + (historicalData(serverVersion),):
+                with self.subTest(serverVersion=serverVersion, msg=msg):
+                    (generic, compiled) = self.decodeBoth(serverVersion, msg)
+                    self.assertTrue(compiled)
+                    self.assertEqual(compiled, generic)
+
+    def test_fast_market_data(self):
+        wrapper = RecordingWrapper()
+        attribs = []
+        wrapper.tickPrice = lambda reqId, tickType, price, attrib: attribs.append(attrib)
+        decoder = Decoder(wrapper, MAX_CLIENT_VER, fastMarketData=True)
+        decoder.interpret(MESSAGES[0])
+        decoder.interpret(MESSAGES[0])
+        decoder.interpret(MESSAGES[3])
+
+        self.assertIs(attribs[0], attribs[1], "attrib should be shared")
+        self.assertTrue(attribs[0].canAutoExecute and attribs[0].pastLimit)
+        self.assertEqual(
+            wrapper.calls,
+            [("tickSize", 3, 0, 100.0), ("tickSize", 3, 0, 100.0), ("tickSize", 3, 8, 1250.0)],
+        )
+        self.assertIs(type(wrapper.calls[0][3]), float)
+
+    def test_bulk_historical_data(self):
+        msg = historicalData(MAX_CLIENT_VER)
+        generic = RecordingWrapper()
+        decoder = Decoder(generic, MAX_CLIENT_VER)
+        decoder.compiledProcs = {}
+        decoder.interpret(msg)
+
+        bulk = RecordingWrapper()
+        responses = []
+        bulk.historicalDataBulk = lambda reqId, bars, start, end: responses.append(bars)
+        Decoder(bulk, MAX_CLIENT_VER, bulkHistoricalData=True).interpret(msg)
+
+        (bars,) = responses
+        self.assertEqual(list(bars["date"]), ["20240101", "20240102", "20240103"])
+        self.assertEqual(list(bars["open"]), [10.0, 11.0, 12.0])
+        self.assertEqual(list(bars["volume"]), [12000.0] * 3)
+        self.assertEqual(list(bars["barCount"]), [57] * 3)
+        self.assertEqual(bulk.calls, generic.calls[-1:], "historicalDataEnd")
+
+    def test_bulk_historical_data_empty_fields(self):
+        msg = fields(IN.HISTORICAL_DATA, 4, "20240101", "20240102", 1, "20240101", "", "", "", "", "", "", "")
+        generic = RecordingWrapper()
+        generic.historicalData = lambda reqId, bar: generic.calls.append(bar)
+        decoder = Decoder(generic, MAX_CLIENT_VER, fastMarketData=True)
+        decoder.interpret(msg)
+
+        bulk = RecordingWrapper()
+        responses = []
+        bulk.historicalDataBulk = lambda reqId, bars, start, end: responses.append(bars)
+        Decoder(bulk, MAX_CLIENT_VER, fastMarketData=True, bulkHistoricalData=True).interpret(msg)
+
+        (bar, _) = generic.calls
+        (bars,) = responses
+        for name in ("open", "high", "low", "close", "volume", "wap", "barCount"):
+            with self.subTest(name=name):
+                self.assertEqual(list(bars[name]), [getattr(bar, name)])
+
+    def test_short_message(self):
+        decoder = Decoder(RecordingWrapper(), MAX_CLIENT_VER)
+        with self.assertRaises(BadMessage):
+            decoder.interpret(fields(IN.TICK_PRICE, 6, 3, 1))
+
+    def test_compiled_once_per_server_version(self):
+        self.assertIs(compileSpecs(MAX_CLIENT_VER), compileSpecs(MAX_CLIENT_VER))
+        self.assertEqual(compileSpecs(None), {})
+
+
+if "__main__" == __name__:
+    unittest.main()
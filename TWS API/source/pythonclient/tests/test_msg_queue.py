@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import queue
+import unittest
+
+from ibapi.message import IN
+from ibapi.msg_queue import BLOCK, CONFLATE, DROP_STALE, MsgQueue
+
+
+def raw(*values):
+    return b"".join(str(value).encode() + b"\0" for value in values)
+
+
+def tickPrice(reqId, tickType, price):
+    return raw(IN.TICK_PRICE, 6, reqId, tickType, price, 100, 0)
+
+
+ORDER_STATUS = raw(IN.ORDER_STATUS, 7, "Filled", 100)
+
+
+def drain(q):
+    items = []
+    while True:
+        try:
+            items.append(q.get_nowait())
+        except queue.Empty:
+            return items
+
+
+class MsgQueueTestCase(unittest.TestCase):
+    def test_block(self):
+        q = MsgQueue(2, BLOCK)
+        q.put(tickPrice(1, 1, 10.0))
+        q.put(tickPrice(1, 1, 10.1))
+        with self.assertRaises(queue.Full):
+            q.put(tickPrice(1, 1, 10.2), timeout=0.01)
+
+        metrics = q.metrics()
+        self.assertEqual(metrics["depth"], 2)
+        self.assertEqual(metrics["highWater"], 2)
+
+    def test_drop_stale_same_reqId(self):
+        q = MsgQueue(3, DROP_STALE)
+        for msg in (tickPrice(1, 1, 10.0), tickPrice(2, 1, 20.0), ORDER_STATUS):
+            q.put(msg)
+        q.put(tickPrice(2, 1, 20.5))
+
+        self.assertEqual(
+            drain(q), [tickPrice(1, 1, 10.0), ORDER_STATUS, tickPrice(2, 1, 20.5)]
+        )
+        self.assertEqual(q.metrics()["dropped"], 1)
+
+    def test_drop_stale_other_reqId(self):
+        q = MsgQueue(2, DROP_STALE)
+        for msg in (ORDER_STATUS, tickPrice(1, 1, 10.0)):
+            q.put(msg)
+        q.put(tickPrice(3, 1, 30.0))
+
+        self.assertEqual(drain(q), [ORDER_STATUS, tickPrice(3, 1, 30.0)])
+
+    def test_drop_stale_never_drops_orders(self):
+        q = MsgQueue(1, DROP_STALE)
+        q.put(tickPrice(1, 1, 10.0))
+        with self.assertRaises(queue.Full):
+            q.put(ORDER_STATUS, timeout=0.01)
+
+    def test_conflate(self):
+        q = MsgQueue(0, CONFLATE)
+        for msg in (
+            tickPrice(1, 1, 10.0),
+            ORDER_STATUS,
+            tickPrice(1, 2, 10.2),
+            tickPrice(1, 1, 10.1),
+        ):
+            q.put(msg)
+
+        self.assertEqual(
+            drain(q), [tickPrice(1, 1, 10.1), ORDER_STATUS, tickPrice(1, 2, 10.2)]
+        )
+        self.assertEqual(q.metrics()["conflated"], 1)
+
+        # dequeued, so the next one is queued again
+        q.put(tickPrice(1, 1, 10.3))
+        self.assertEqual(drain(q), [tickPrice(1, 1, 10.3)])
+
+    def test_metrics_age(self):
+        q = MsgQueue()
+        q.put(None)
+        q.get()
+
+        metrics = q.metrics()
+        self.assertEqual(metrics["got"], 1)
+        self.assertGreaterEqual(metrics["maxAgeSecs"], metrics["lastAgeSecs"])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            MsgQueue(1, "lifo")
+
+
+if "__main__" == __name__:
+    unittest.main()
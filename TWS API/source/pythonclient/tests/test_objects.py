@@ -0,0 +1,43 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import copy
+import unittest
+
+from ibapi.common import BarData, RealTimeBar, TickAttrib
+from ibapi.const import UNSET_DOUBLE
+from ibapi.execution import Execution
+from ibapi.order import Order
+
+
+class ObjectsTestCase(unittest.TestCase):
+    def test_slots(self):
+        for obj in (BarData(), RealTimeBar(), TickAttrib(), Execution()):
+            with self.subTest(type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    obj.notAField = 1
+
+    def test_order_lazy_defaults(self):
+        order = Order()
+        self.assertEqual(order.lmtPrice, UNSET_DOUBLE)
+        self.assertTrue(order.transmit)
+        self.assertEqual(set(vars(order)), {"softDollarTier", "conditions"})
+
+        order.lmtPrice = 10.5
+        self.assertEqual(Order().lmtPrice, UNSET_DOUBLE, "default must not change")
+
+        clone = copy.copy(order)
+        self.assertEqual(clone.lmtPrice, 10.5)
+
+    def test_order_mutable_defaults_not_shared(self):
+        (first, second) = (Order(), Order())
+        first.conditions.append("cond")
+        self.assertEqual(second.conditions, [])
+        self.assertIsNot(first.softDollarTier, second.softDollarTier)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.client import EClient
+from ibapi.const import UNSET_DOUBLE
+from ibapi.contract import Contract
+from ibapi.order import Order
+from ibapi.server_versions import (
+    MAX_CLIENT_VER,
+    MIN_SERVER_VER_FRACTIONAL_POSITIONS,
+    MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
+)
+from ibapi.wrapper import EWrapper
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.sent.append(msg)
+        return len(msg)
+
+    def flush(self):
+        pass
+
+
+def connectedClient():
+    client = EClient(EWrapper())
+    client.conn = FakeConnection()
+    client.serverVersion_ = MAX_CLIENT_VER
+    client.setConnState(EClient.CONNECTED)
+    return client
+
+
+class OrderTemplateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = connectedClient()
+        self.contract = Contract()
+        self.contract.symbol = "AMD"
+        self.contract.secType = "STK"
+        self.contract.exchange = "SMART"
+        self.contract.currency = "USD"
+
+    def order(self, orderType, action, transmit):
+        order = Order()
+        order.action = action
+        order.orderType = orderType
+        order.transmit = transmit
+        return order
+
+    def test_render_matches_placeOrder(self):
+        stop = self.order("STP LMT", "BUY", False)
+        template = self.client.compileOrderTemplate(self.contract, stop)
+
+        stop.orderId = 17
+        stop.totalQuantity = 250
+        stop.auxPrice = 10.51
+        stop.lmtPrice = 10.62
+        self.client.placeOrder(stop.orderId, self.contract, stop)
+        self.client.placeOrderTemplate(template, 17, 250, 10.62, 10.51)
+
+        (expected, rendered) = self.client.conn.sent
+        self.assertEqual(rendered, expected)
+
+    def test_child_parent_id(self):
+        child = self.order("LMT", "SELL", True)
+        template = self.client.compileOrderTemplate(self.contract, child)
+
+        child.orderId = 19
+        child.parentId = 17
+        child.totalQuantity = 250
+        child.lmtPrice = 11.56
+        self.client.placeOrder(child.orderId, self.contract, child)
+        self.client.placeOrderTemplate(template, 19, 250, lmtPrice=11.56, parentId=17)
+
+        (expected, rendered) = self.client.conn.sent
+        self.assertEqual(rendered, expected)
+
+    def assertRenderMatchesPlaceOrder(self, serverVersion, orderType, lmtPrice, auxPrice):
+        self.client.serverVersion_ = serverVersion
+        order = self.order(orderType, "BUY", False)
+        # the UNSET_DOUBLE default counts as a cash quantity on these versions
+        order.cashQty = 0
+        template = self.client.compileOrderTemplate(self.contract, order)
+        self.assertIsNotNone(template)
+
+        order.orderId = 17
+        order.totalQuantity = 250
+        order.lmtPrice = lmtPrice
+        order.auxPrice = auxPrice
+        self.client.placeOrder(order.orderId, self.contract, order)
+        self.client.placeOrderTemplate(template, 17, 250, lmtPrice, auxPrice)
+
+        (expected, rendered) = self.client.conn.sent
+        self.assertEqual(rendered, expected)
+
+    def test_whole_quantity_before_fractional_positions(self):
+        self.assertRenderMatchesPlaceOrder(
+            MIN_SERVER_VER_FRACTIONAL_POSITIONS - 1, "STP LMT", 10.62, 10.51
+        )
+
+    def test_unset_prices_before_combo_legs_price(self):
+        self.assertRenderMatchesPlaceOrder(
+            MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE - 1, "MKT", UNSET_DOUBLE, UNSET_DOUBLE
+        )
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.profiler import MsgProfiler
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+from test_decoder_specs import RecordingWrapper, fields
+
+TICK_PRICE = fields(IN.TICK_PRICE, 6, 3, 1, 12.34, 100, 3)
+ACCT_VALUE = fields(IN.ACCT_VALUE, 2, "NetLiquidation", "1000", "USD", "DU1")
+
+
+class SlowWrapper(EWrapper):
+    def tickPrice(self, reqId, tickType, price, attrib):
+        time.sleep(0.01)
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def test_counts(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+        profiler = MsgProfiler()
+        decoder.setProfiler(profiler)
+        for msg in (TICK_PRICE, TICK_PRICE, ACCT_VALUE):
+            decoder.interpret(msg)
+
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot["TICK_PRICE"]["count"], 2)
+        self.assertEqual(snapshot["TICK_PRICE"]["bytes"], 2 * len(b"\0".join(TICK_PRICE) + b"\0"))
+        self.assertEqual(snapshot["ACCT_VALUE"]["count"], 1)
+        self.assertIn("TICK_PRICE", profiler.table())
+        # tickPrice + tickSize per message, then updateAccountValue
+        self.assertEqual([call[0] for call in wrapper.calls],
+                         ["tickPrice", "tickSize"] * 2 + ["updateAccountValue"])
+
+    def test_callback_time(self):
+        decoder = Decoder(SlowWrapper(), MAX_CLIENT_VER)
+        profiler = MsgProfiler()
+        decoder.setProfiler(profiler)
+        decoder.interpret(TICK_PRICE)
+
+        stats = profiler.snapshot()["TICK_PRICE"]
+        self.assertGreaterEqual(stats["callbackSecs"], 0.01)
+        self.assertLess(stats["decodeSecs"], 0.01)
+
+    def test_stop(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+        profiler = MsgProfiler()
+        decoder.setProfiler(profiler)
+        decoder.setProfiler(None)
+        decoder.interpret(ACCT_VALUE)
+
+        self.assertIs(decoder.wrapper, wrapper)
+        self.assertEqual(profiler.snapshot(), {})
+        self.assertEqual(len(wrapper.calls), 1)
+
+    def test_periodic_dump(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.jsonl")
+            decoder = Decoder(RecordingWrapper(), MAX_CLIENT_VER)
+            profiler = MsgProfiler(dumpEvery=0.01, dumpPath=path)
+            decoder.setProfiler(profiler)
+            decoder.interpret(TICK_PRICE)
+            time.sleep(0.02)
+            decoder.interpret(TICK_PRICE)
+
+            with open(path) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 1)
+            self.assertEqual(json.loads(lines[0])["stats"]["TICK_PRICE"]["count"], 2)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import queue
+import socket
+import unittest
+
+from ibapi import comm
+from ibapi.connection import Connection
+from ibapi.reader import EReader
+
+
+class ReaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.msg_queue = queue.Queue()
+        self.reader = EReader(None, self.msg_queue)
+
+    def queued(self):
+        msgs = []
+        while not self.msg_queue.empty():
+            msgs.append(self.msg_queue.get_nowait())
+        return msgs
+
+    def test_putMsgs(self):
+        buf = bytearray(comm.make_msg("1\x002\x00") + comm.make_msg("3\x00"))
+
+        pos = self.reader.putMsgs(buf)
+
+        self.assertEqual(pos, len(buf))
+        self.assertEqual(self.queued(), [b"1\x002\x00", b"3\x00"])
+
+    def test_putMsgs_split_frame(self):
+        wire = comm.make_msg("1\x002\x00") + comm.make_msg("3\x004\x00")
+        buf = bytearray(wire[:10])
+
+        pos = self.reader.putMsgs(buf)
+        self.assertEqual(self.queued(), [b"1\x002\x00"])
+
+        del buf[:pos]
+        buf += wire[10:]
+        pos = self.reader.putMsgs(buf)
+        self.assertEqual(self.queued(), [b"3\x004\x00"])
+        self.assertEqual(pos, len(buf))
+
+    def test_run_recvInto(self):
+        (ours, theirs) = socket.socketpair()
+        conn = Connection("127.0.0.1", 0, recvBufSize=8)
+        conn.socket = ours
+        conn.socket.settimeout(1)
+        msgs = [("%d\0" % i * i).encode() for i in range(1, 40)]
+        theirs.sendall(b"".join(comm.make_msg(msg.decode()) for msg in msgs))
+        theirs.close()
+
+        # runs until the closed peer makes recvInto() disconnect
+        EReader(conn, self.msg_queue).run()
+
+        self.assertFalse(conn.isConnected())
+        self.assertEqual(self.queued(), msgs)
+
+    def test_run_selector_wakeup(self):
+        (ours, theirs) = socket.socketpair()
+        conn = Connection("127.0.0.1", 0)
+        conn.socket = ours
+        conn.startSelector()
+        theirs.sendall(comm.make_msg("1\x002\x00"))
+
+        reader = EReader(conn, self.msg_queue)
+        reader.start()
+        self.assertEqual(self.msg_queue.get(timeout=1), b"1\x002\x00")
+
+        # the peer stays open, only the wakeup pipe can end the wait
+        conn.disconnect()
+        reader.join(timeout=1)
+
+        self.assertFalse(reader.is_alive())
+        self.assertIsNone(self.msg_queue.get(timeout=1))
+        self.assertIsNone(conn.selector)
+        theirs.close()
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,187 @@
+from ibapi.client import EClient
+from ibapi.wrapper import EWrapper
+from ibapi.contract import Contract
+from subscriptionScheduler import TokenBucket, MAX_MSG_PER_SEC
+import argparse
+import csv
+import sqlite3
+import time as time_module
+import logging
+
+DEFAULT_DB = 'contracts.db'
+# contract ids don't change, trading hours do; refresh weekly
+DEFAULT_MAX_AGE_DAYS = 7
+# primary exchanges preferred when a symbol resolves to several SMART/USD stocks
+PRIMARY_EXCHANGES = ('NASDAQ', 'NYSE', 'AMEX', 'ARCA', 'BATS')
+WARM_REQ_ID_OFFSET = 40000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS contracts (
+    symbol TEXT PRIMARY KEY,
+    conId INTEGER NOT NULL,
+    primaryExchange TEXT,
+    currency TEXT,
+    minTick REAL,
+    longName TEXT,
+    timeZoneId TEXT,
+    tradingHours TEXT,
+    liquidHours TEXT,
+    updated REAL NOT NULL
+)
+'''
+COLUMNS = ('symbol', 'conId', 'primaryExchange', 'currency', 'minTick', 'longName',
+           'timeZoneId', 'tradingHours', 'liquidHours', 'updated')
+
+
+class ContractCache:
+    """Symbol -> resolved SMART/USD stock details from reqContractDetails, kept in SQLite.
+
+    Contracts built from a cached entry carry the conId and primary exchange,
+    so TWS doesn't have to resolve (and possibly find ambiguous) the bare
+    symbol on every reqMktData and placeOrder. Entries older than
+    `maxAgeDays` count as missing and are refreshed by the next warm()."""
+
+    def __init__(self, path=DEFAULT_DB, maxAgeDays=DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.maxAge = maxAgeDays * 86400
+        # built on the main thread, used from the message loop thread
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(SCHEMA)
+        self.db.commit()
+
+    def get(self, symbol):
+        row = self.db.execute('SELECT * FROM contracts WHERE symbol = ?', (symbol,)).fetchone()
+        if row is None or time_module.time() - row['updated'] > self.maxAge:
+            return None
+        return dict(row)
+
+    def missing(self, symbols):
+        return [symbol for symbol in dict.fromkeys(symbols) if self.get(symbol) is None]
+
+    def put(self, symbol, contractDetails):
+        contract = contractDetails.contract
+        self.db.execute(
+            f"INSERT OR REPLACE INTO contracts ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            (symbol, contract.conId, contract.primaryExchange, contract.currency, contractDetails.minTick,
+             contractDetails.longName, contractDetails.timeZoneId, contractDetails.tradingHours,
+             contractDetails.liquidHours, time_module.time()))
+        self.db.commit()
+
+    def contract(self, symbol):
+        """A SMART routed contract pinned to the cached conId, None if not cached"""
+        entry = self.get(symbol)
+        if entry is None:
+            return None
+        contract = Contract()
+        contract.conId = entry['conId']
+        contract.symbol = symbol
+        contract.secType = 'STK'
+        contract.exchange = 'SMART'
+        contract.primaryExchange = entry['primaryExchange']
+        contract.currency = entry['currency']
+        return contract
+
+    def close(self):
+        self.db.close()
+
+
+class ContractCacheWarmer(EClient, EWrapper):
+    """Resolves the symbols missing from a ContractCache with reqContractDetails,
+    paced like the bot's subscriptions, then disconnects."""
+
+    def __init__(self, cache, symbols, msgRate=MAX_MSG_PER_SEC):
+        EClient.__init__(self, self)
+        self.cache = cache
+        self.symbols = cache.missing(symbols)
+        self.bucket = TokenBucket(msgRate, msgRate)
+        self.queued = []
+        self.matches = {}
+        self.outstanding = set()
+        self.resolved = 0
+
+    def nextValidId(self, orderId):
+        logging.info(f'warming the contract cache with {len(self.symbols)} symbols')
+        self.queued = list(enumerate(self.symbols))
+        self.pump()
+
+    def msgLoopTmo(self):
+        self.pump()
+
+    def msgLoopRec(self):
+        self.pump()
+
+    def pump(self):
+        while self.queued and self.bucket.consume():
+            index, symbol = self.queued.pop()
+            contract = Contract()
+            contract.symbol = symbol
+            contract.secType = 'STK'
+            contract.exchange = 'SMART'
+            contract.currency = 'USD'
+            reqId = WARM_REQ_ID_OFFSET + index
+            self.outstanding.add(reqId)
+            self.reqContractDetails(reqId, contract)
+        if not self.queued and not self.outstanding and self.isConnected():
+            logging.info(f'contract cache warm: {self.resolved} of {len(self.symbols)} symbols resolved')
+            self.disconnect()
+
+    def contractDetails(self, reqId, contractDetails):
+        self.matches.setdefault(reqId, []).append(contractDetails)
+
+    def contractDetailsEnd(self, reqId):
+        self.outstanding.discard(reqId)
+        matches = self.matches.pop(reqId, [])
+        if not matches:
+            return
+        symbol = self.symbols[reqId - WARM_REQ_ID_OFFSET]
+        matches.sort(key=lambda details: details.contract.primaryExchange not in PRIMARY_EXCHANGES)
+        if len(matches) > 1:
+            logging.info(f'{symbol} is ambiguous, using {matches[0].contract.primaryExchange}')
+        self.cache.put(symbol, matches[0])
+        self.resolved += 1
+
+    def error(self, reqId, errorCode, errorString, advancedOrderRejectJson=""):
+        if reqId in self.outstanding:
+            # 200: no security definition found
+            logging.info(f'{self.symbols[reqId - WARM_REQ_ID_OFFSET]} not resolved: {errorCode} {errorString}')
+            self.outstanding.discard(reqId)
+            self.matches.pop(reqId, None)
+        else:
+            # connection errors (502, 504, 1100) and notices, keep a failed warm-up visible
+            EWrapper.error(self, reqId, errorCode, errorString, advancedOrderRejectJson)
+
+
+def symbols_from_csv(path, date=None):
+    """Tickers from the pre-market scraper's CSV, the latest date unless `date` is given"""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return []
+    date = date or max(row['date'] for row in rows)
+    return [row['ticker'] for row in rows if row['date'] == date]
+
+
+def warm(cache, symbols, host='127.0.0.1', port=7497, clientId=99):
+    warmer = ContractCacheWarmer(cache, symbols)
+    if not warmer.symbols:
+        logging.info('contract cache already warm')
+        return 0
+    warmer.connect(host, port, clientId=clientId)
+    warmer.run()
+    return warmer.resolved
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Warm the contract cache before the open')
+    parser.add_argument('csv', nargs='?', default='premarket_gainers1.csv', help="pre-market scraper output")
+    parser.add_argument('--date', help='scrape date to load, defaults to the latest one')
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--port', type=int, default=7497)
+    parser.add_argument('--clientId', type=int, default=99)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    contractCache = ContractCache(args.db)
+    warm(contractCache, symbols_from_csv(args.csv, args.date), port=args.port, clientId=args.clientId)
+    contractCache.close()
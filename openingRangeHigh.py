@@ -2,8 +2,22 @@ from ibapi.client import EClient
 from ibapi.wrapper import EWrapper
 from ibapi.contract import Contract
 from ibapi.order import *
+from ibapi.order_cancel import OrderCancel
 from ibapi.common import TickerId
-from datetime import datetime, time
+from ibapi.execution import ExecutionFilter
+from ibapi.const import UNSET_DOUBLE
+from ibapi.profiler import MsgProfiler
+from datetime import datetime, time, timedelta
+from subscriptionScheduler import (
+    SubscriptionScheduler,
+    BAR_REQ_ID_OFFSET,
+    TICK_BY_TICK_REQ_ID_OFFSET,
+    DEFAULT_MAX_LINES,
+    DEFAULT_MAX_TICK_BY_TICK,
+    DEFAULT_MAX_BARS,
+)
+from reconnectManager import ReconnectManager
+from contractCache import ContractCache
 from threading import Thread
 import time as time_module
 import logging
@@ -15,39 +29,145 @@ logging.basicConfig(
     filemode='a' 
 )
 
+# reqExecutions id used to collect the fills made before this connection (restart or reconnect)
+RECONCILE_EXEC_REQ_ID = 30000
+# order statuses of entries that no longer work at TWS
+DEAD_ORDER_STATUSES = ('Cancelled', 'ApiCancelled', 'PendingCancel', 'Inactive')
+
 class OpeningRangeHigh(EClient, EWrapper): 
-    def __init__(self, stock_symbols, testFlow):
+    # tickByTick: None (aggregated reqMktData only), 'BidAsk' or 'AllLast'
+    # tickByTickProximity: fraction below the range high at which a symbol gets tick-by-tick data
+    # preStage: None (client side breakout detection), 'STP' or 'STP LMT' parent parked at the range high;
+    #     staged with the range's first tick, good after the range closes, modified as the high moves
+    #     (paced by the scheduler) and cancelled when the breakout window closes unfilled
+    # stopLimitOffset: how far above the stop a 'STP LMT' parent may fill
+    # fillReporter: optional callable receiving a dict per execution
+    # inlineDecode: decode on the run() thread straight off the socket, no reader thread hand-off
+    # fastMarketData: shared tick attribs and float sizes, the bot only reads prices
+    # sendBatching: requests sent from one pass of the message loop (the reqMktData burst in
+    #     nextValidId, bracket legs) go out in one socket write; transmitting legs flush at once
+    # profileEvery: log a per message type decode/callback time table every profileEvery seconds
+    # conflateMarketData: only the latest tick per (reqId, tickType) of each socket read reaches
+    #     tickPrice; off by default since the opening range high would miss the skipped prices
+    # maxBars: symbols that are done keep 5 second bars (and their market data line) up to this
+    #     many, the others are cancelled so their line goes to the next symbol
+    # contractCacheDb: SQLite file warmed by contractCache.py before the open; cached symbols are
+    #     subscribed and traded by conId, the others are resolved by TWS from the symbol as before
+    def __init__(self, stock_symbols, testFlow, maxLines=DEFAULT_MAX_LINES, tickByTick=None,
+                 tickByTickProximity=0.01, maxTickByTick=DEFAULT_MAX_TICK_BY_TICK, preStage=None,
+                 stopLimitOffset=0.01, fillReporter=None, inlineDecode=True,
+                 fastMarketData=True, sendBatching=True, profileEvery=None,
+                 conflateMarketData=False, contractCacheDb=None, maxBars=DEFAULT_MAX_BARS):
         EClient.__init__(self, self)
+        self.setInlineDecode(inlineDecode)
+        self.setFastMarketData(fastMarketData)
+        self.setSendBatching(sendBatching)
+        self.setConflation(conflateMarketData)
+        if profileEvery:
+            self.setProfiler(MsgProfiler(dumpEvery=profileEvery))
         self.symbols = stock_symbols
+        self.symbol_tickers = {symbol['symbol']: i for i, symbol in enumerate(stock_symbols)}
+        # a path rather than a ContractCache so shard options stay picklable
+        self.contractCache = ContractCache(contractCacheDb) if contractCacheDb else None
         self.contracts = {}
         self.ticker_data = {}
         self.testFlow = testFlow
         self.next_order_id = 1
+        self.tickByTick = tickByTick
+        self.tickByTickProximity = tickByTickProximity
+        self.preStage = preStage
+        self.stopLimitOffset = stopLimitOffset
+        self.fillReporter = fillReporter
+        self.order_tickers = {}
+        self.bracket_templates = {}
+        self.rangesStaged = False
+        self.stagesCancelled = False
+        # answers still missing before orders may be staged or entered, see reconcile
+        self.reconciling = set()
+        self.scheduler = SubscriptionScheduler(self, maxLines, maxTickByTick=maxTickByTick, maxBars=maxBars)
 
         for i, symbol in enumerate(stock_symbols):
             self.ticker_data[i] = {
                 'symbol': symbol['symbol'],
                 'positionSize': symbol['positionSize'],
+                'premarket_change': symbol.get('premarket_change'),
+                'premarket_volume': symbol.get('premarket_volume'),
                 'open': None,
                 'high': float('-inf'),
                 'low': float('inf'),
                 'close': None,
-                'breakout_triggered': False
+                'breakout_triggered': False,
+                'staged_order_id': None,
+                'staged_high': None
             }
         print(f'this is tickers = ', self.ticker_data)
 
     def nextValidId(self, orderId):
+        if self.contracts:
+            # reconnected: never hand out an order id twice
+            self.next_order_id = max(orderId, self.next_order_id)
+            self.resync()
+            return
+        # TWS keeps order ids per clientId, instances with their own clientIds never collide
         self.next_order_id = orderId
         print(f"Next valid order ID: {orderId}")
 
         for tickerId, symbol in self.ticker_data.items():
             print(f'symbol[symbol] = {symbol['symbol']}')
-            contract = self.create_contract(symbol['symbol'])
-            self.contracts[tickerId] = contract
-            self.reqMktData(tickerId, contract, '', False, False, [])
+            self.contracts[tickerId] = self.create_contract(symbol['symbol'])
+            self.bracket_templates[tickerId] = self.compile_bracket(self.contracts[tickerId])
+        self.reconcile()
+
+        # market data lines are handed out by the scheduler from the message loop
+        self.scheduler.start(list(self.ticker_data))
+        self.scheduler.pump()
+
+    def resync(self):
+        """Brings the bot back in line after a reconnect: the streams are replayed
+        by the scheduler, working orders come back through openOrder/orderStatus
+        and fills missed while disconnected through execDetails"""
+        logging.info(f'resynchronising after reconnect, next order id {self.next_order_id}')
+        for tickerId, contract in self.contracts.items():
+            self.bracket_templates[tickerId] = self.compile_bracket(contract)
+        self.scheduler.resubscribe()
+        self.reconcile()
+        self.scheduler.pump()
+
+    def reconcile(self):
+        """Asks TWS for this client's working orders and today's fills, which may come from
+        an earlier run with the same clientId (a restarted bot or shard). Nothing is staged
+        or entered until both have arrived and been mapped back to their tickers."""
+        self.reconciling = {'orders', 'executions'}
+        self.reqOpenOrders()
+        self.reqExecutions(RECONCILE_EXEC_REQ_ID, ExecutionFilter())
+        self.scheduler.sendNow(2)
+
+    def reconciled(self, answer):
+        if answer not in self.reconciling:
+            return
+        self.reconciling.discard(answer)
+        if not self.reconciling:
+            entered = [data['symbol'] for data in self.ticker_data.values() if data['breakout_triggered']]
+            staged = [data['symbol'] for data in self.ticker_data.values() if data['staged_order_id'] is not None]
+            logging.info(f'reconciled with TWS, entered {entered}, staged {staged}')
+            # stages found after the breakout window closed are cancelled again
+            self.stagesCancelled = False
+
+    def msgLoopTmo(self):
+        self.stageClosedRanges()
+        self.cancelStagedEntries()
+        self.scheduler.pump()
+
+    def msgLoopRec(self):
+        self.stageClosedRanges()
+        self.cancelStagedEntries()
+        self.scheduler.pump()
     
     def create_contract(self, symbol):
         print(f'create contract symbol = {symbol}')
+        contract = self.contractCache.contract(symbol) if self.contractCache else None
+        if contract is not None:
+            return contract
         contract = Contract()
         contract.symbol = symbol
         contract.secType = 'STK'
@@ -58,8 +178,32 @@ class OpeningRangeHigh(EClient, EWrapper):
     def inOpeningRange(self, now):
         return True if self.testFlow else time(23, 30) <= now.time() < time(23, 35)
 
+    def openingRangeEnd(self, now):
+        end = now.replace(hour=23, minute=35, second=0, microsecond=0)
+        return end - timedelta(days=1) if now.time() < time(6, 0) else end
+
     def isMarketOpen(self, now):
         return True if self.testFlow else (time(23,30) <= now.time() <= time(23,59,59)) or (time(0,0) <= now.time() < time(6,0))
+
+    def inBreakoutWindow(self, now):
+        return True if self.testFlow else (time(23,35) <= now.time() <= time(23,59,59)) or (time(0,0) <= now.time() < time(0,35))
+
+    def openingRangeStarted(self):
+        return False if self.testFlow else self.isMarketOpen(datetime.now())
+
+    def needsTickData(self, tickerId):
+        """None while undecided, False once the symbol can live on 5 second bars"""
+        data = self.ticker_data[tickerId]
+        now = datetime.now()
+        if data['breakout_triggered']:
+            return False
+        if self.inOpeningRange(now):
+            return None
+        if data['open'] is None and self.isMarketOpen(now):
+            return False  # subscribed too late to see the opening range
+        if self.inBreakoutWindow(now):
+            return None
+        return False if self.isMarketOpen(now) else None
     
     # field is equal to tickType
     def tickPrice(self, tickerId: TickerId, field, price: float, attrib):
@@ -79,12 +223,44 @@ class OpeningRangeHigh(EClient, EWrapper):
             data['low'] = min(data['low'], price)
             data['close'] = price
             logging.info(f'data set to {data}')
-        elif self.isMarketOpen(now) and not data['breakout_triggered']:
+            if (self.preStage and not self.reconciling and not data['breakout_triggered']
+                    and data['high'] != data['staged_high']):
+                self.scheduler.restage(tickerId)
+        elif self.preStage:
+            return  # entry is parked at the exchange, see stageClosedRanges
+        elif self.isMarketOpen(now) and not data['breakout_triggered'] and data['open'] is not None:
             # Begin monitoring for breakout
-            if price > data['high']:
-                logging.info(f"\n🚀 {data['symbol']} breakout above opening range at {price:.2f}")
-                self.place_bracket_order(tickerId, data['symbol'], price)
-                data['breakout_triggered'] = True
+            self.checkBreakout(tickerId, price)
+            if self.tickByTick and not data['breakout_triggered']:
+                self.updateTickByTick(tickerId, price)
+
+    def checkBreakout(self, tickerId, price):
+        data = self.ticker_data[tickerId]
+        if data['breakout_triggered'] or self.reconciling or price <= data['high']:
+            return
+        logging.info(f"\n🚀 {data['symbol']} breakout above opening range at {price:.2f}")
+        self.place_bracket_order(tickerId, data['symbol'], price)
+        data['breakout_triggered'] = True
+        self.scheduler.demoteTickByTick(tickerId)
+
+    def updateTickByTick(self, tickerId, price):
+        # promote when the ask gets close to the range high, and only give the
+        # slot back once it has clearly fallen away again
+        high = self.ticker_data[tickerId]['high']
+        if price >= high * (1 - self.tickByTickProximity):
+            self.scheduler.promoteTickByTick(tickerId, self.tickByTick)
+        elif price < high * (1 - 2 * self.tickByTickProximity):
+            self.scheduler.demoteTickByTick(tickerId)
+
+    def tickByTickBidAsk(self, reqId, time, bidPrice, askPrice, bidSize, askSize, tickAttribBidAsk):
+        tickerId = reqId - TICK_BY_TICK_REQ_ID_OFFSET
+        if tickerId in self.ticker_data and askPrice > 0:
+            self.checkBreakout(tickerId, askPrice)
+
+    def tickByTickAllLast(self, reqId, tickType, time, price, size, tickAttribLast, exchange, specialConditions):
+        tickerId = reqId - TICK_BY_TICK_REQ_ID_OFFSET
+        if tickerId in self.ticker_data and price > 0:
+            self.checkBreakout(tickerId, price)
 
     
     def place_bracket_order(self, tickerId, symbol, entry_price):
@@ -95,38 +271,187 @@ class OpeningRangeHigh(EClient, EWrapper):
         logging.info(f'entering purchase order to buy {numOfShares} of {symbol} at {entry_price}')
         logging.info(f'ticker data at time of purchase = {self.ticker_data[tickerId]}')
 
+        self.send_bracket(tickerId, self.next_order_id, numOfShares, entry_price)
+        self.next_order_id += 3
+
+    def compile_bracket(self, contract):
+        """Pre-encodes the parent, take profit and stop loss orders for a contract
+        so a breakout only fills in ids, quantity and prices"""
         parent = Order()
-        parent.orderId = self.next_order_id
         parent.action = "BUY"
-        parent.orderType = "MKT"
-        parent.totalQuantity = numOfShares
+        parent.orderType = self.preStage or "MKT"
         parent.transmit = False
+        if self.preStage and not self.testFlow:
+            # staged while the range is still forming, the stop must not trigger inside it;
+            # without a zone TWS reads the time in its local time zone, the one the bot runs in
+            parent.goodAfterTime = self.openingRangeEnd(datetime.now()).strftime('%Y%m%d %H:%M:%S')
 
         take_profit = Order()
-        take_profit.orderId = self.next_order_id + 1
         take_profit.action = "SELL"
         take_profit.orderType = "LMT"
-        take_profit.totalQuantity = numOfShares
-        take_profit.lmtPrice = round(entry_price * 1.1, 2)
-        take_profit.parentId = parent.orderId
         take_profit.transmit = False
 
         stop_loss = Order()
-        stop_loss.orderId = self.next_order_id + 2
         stop_loss.action = "SELL"
         stop_loss.orderType = "STP"
-        stop_loss.auxPrice = round(entry_price * 0.95, 2)
-        stop_loss.totalQuantity = numOfShares
-        stop_loss.parentId = parent.orderId
         stop_loss.transmit = True
 
-        contract = self.contracts[tickerId]
+        templates = tuple(self.compileOrderTemplate(contract, order) for order in (parent, take_profit, stop_loss))
+        return None if None in templates else templates
 
-        self.placeOrder(parent.orderId, contract, parent)
-        self.placeOrder(take_profit.orderId, contract, take_profit)
-        self.placeOrder(stop_loss.orderId, contract, stop_loss)
+    def send_bracket(self, tickerId, parentId, numOfShares, entry_price, stopPrice=None):
+        """MKT parent, or STP / STP LMT parent triggering at stopPrice, with TP/SL children.
+        Re-sending with the same parentId modifies the working bracket."""
+        templates = self.bracket_templates.get(tickerId)
+        if templates is None:
+            logging.info(f'no order templates for tickerId {tickerId}, bracket not sent')
+            return
 
-        self.next_order_id += 3
+        parent, take_profit, stop_loss = templates
+        parentLmtPrice = UNSET_DOUBLE
+        if stopPrice is not None and self.preStage == "STP LMT":
+            parentLmtPrice = round(stopPrice * (1 + self.stopLimitOffset), 2)
+        parentAuxPrice = UNSET_DOUBLE if stopPrice is None else stopPrice
+
+        self.placeOrderTemplate(parent, parentId, numOfShares, parentLmtPrice, parentAuxPrice)
+        self.placeOrderTemplate(take_profit, parentId + 1, numOfShares,
+                                lmtPrice=round(entry_price * 1.1, 2), parentId=parentId)
+        self.placeOrderTemplate(stop_loss, parentId + 2, numOfShares,
+                                auxPrice=round(entry_price * 0.95, 2), parentId=parentId)
+        self.scheduler.sendNow(3)
+
+    def stage_bracket_order(self, tickerId):
+        """Parks a stop entry one cent above the range high so the breakout fills at the exchange.
+        Called again as the high moves, which modifies the staged bracket."""
+        data = self.ticker_data[tickerId]
+        stopPrice = round(data['high'] + 0.01, 2)
+        numOfShares = int(data['positionSize'] / stopPrice)
+        if numOfShares <= 0:
+            return
+
+        modify = data['staged_order_id'] is not None
+        parentId = data['staged_order_id'] if modify else self.next_order_id
+        logging.info(f"{'modifying' if modify else 'staging'} {self.preStage} entry for {numOfShares} "
+                     f"of {data['symbol']} at {stopPrice}")
+
+        self.send_bracket(tickerId, parentId, numOfShares, stopPrice, stopPrice)
+        data['staged_order_id'] = parentId
+        data['staged_high'] = data['high']
+        self.order_tickers[parentId] = tickerId
+        if not modify:
+            self.next_order_id += 3
+
+    def restage(self, tickerId):
+        """Called by the scheduler for a symbol marked with scheduler.restage"""
+        data = self.ticker_data[tickerId]
+        if self.reconciling or self.stagesCancelled or data['breakout_triggered']:
+            return
+        if data['high'] == data['staged_high']:
+            return
+        self.stage_bracket_order(tickerId)
+
+    def stageClosedRanges(self):
+        if not self.preStage or self.rangesStaged or self.reconciling:
+            return
+        now = datetime.now()
+        if self.inOpeningRange(now) or not self.isMarketOpen(now):
+            return
+        # catches the ranges whose staging failed or came after their last tick
+        for tickerId, data in self.ticker_data.items():
+            if data['staged_high'] != data['high'] and data['open'] is not None and not data['breakout_triggered']:
+                self.scheduler.restage(tickerId)
+        self.rangesStaged = True
+
+    def cancelStagedEntries(self):
+        """Client side detection takes no breakouts after the breakout window,
+        neither may an entry parked at the exchange"""
+        if not self.preStage or self.stagesCancelled or self.reconciling:
+            return
+        now = datetime.now()
+        if not self.isMarketOpen(now) or self.inOpeningRange(now) or self.inBreakoutWindow(now):
+            return
+        for tickerId, data in self.ticker_data.items():
+            if data['staged_order_id'] is not None and not data['breakout_triggered']:
+                logging.info(f"breakout window closed, cancelling the staged entry of {data['symbol']}")
+                # cancelling the parent cancels its bracket legs
+                self.scheduler.submit(self.cancelOrder, data['staged_order_id'], OrderCancel())
+                data['staged_order_id'] = None
+        self.stagesCancelled = True
+
+    def entryFilled(self, orderId, price):
+        tickerId = self.order_tickers.get(orderId)
+        if tickerId is None:
+            return
+        data = self.ticker_data[tickerId]
+        if not data['breakout_triggered']:
+            logging.info(f"\n🚀 {data['symbol']} staged entry filled at {price}")
+            data['breakout_triggered'] = True
+            self.scheduler.demoteTickByTick(tickerId)
+
+    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId, parentId,
+                    lastFillPrice, clientId, whyHeld, mktCapPrice):
+        if status == 'Filled':
+            self.entryFilled(orderId, avgFillPrice)
+
+    def openOrder(self, orderId, contract, order, orderState):
+        if order.clientId != self.clientId:
+            return
+        # ids of our working orders stay taken
+        self.next_order_id = max(self.next_order_id, orderId + 1)
+        tickerId = self.symbol_tickers.get(contract.symbol)
+        if tickerId is None or order.parentId or order.action != 'BUY':
+            return
+        if orderState.status in DEAD_ORDER_STATUSES:
+            return
+        # an entry placed by an earlier run or connection, its bracket legs hold the next two ids
+        self.next_order_id = max(self.next_order_id, orderId + 3)
+        data = self.ticker_data[tickerId]
+        self.order_tickers[orderId] = tickerId
+        if orderState.status == 'Filled':
+            self.entryFilled(orderId, order.auxPrice)
+        elif order.orderType in ('STP', 'STP LMT'):
+            if data['staged_order_id'] != orderId:
+                # echoes of our own modifications may be older than the current stage
+                data['staged_order_id'] = orderId
+                data['staged_high'] = round(order.auxPrice - 0.01, 2)
+        else:
+            data['breakout_triggered'] = True
+
+    def openOrderEnd(self):
+        self.reconciled('orders')
+
+    def execDetails(self, reqId, contract, execution):
+        if execution.clientId == self.clientId:
+            self.next_order_id = max(self.next_order_id, execution.orderId + 1)
+            tickerId = self.symbol_tickers.get(contract.symbol)
+            if execution.side == 'BOT' and tickerId is not None:
+                # entries from before a restart aren't in order_tickers yet
+                self.order_tickers.setdefault(execution.orderId, tickerId)
+                self.next_order_id = max(self.next_order_id, execution.orderId + 3)
+            self.entryFilled(execution.orderId, execution.price)
+        if self.fillReporter is None:
+            return
+        self.fillReporter({
+            'execId': execution.execId,
+            'orderId': execution.orderId,
+            'symbol': contract.symbol,
+            'side': execution.side,
+            'shares': float(execution.shares),
+            'price': execution.price,
+            'time': execution.time,
+        })
+
+    def execDetailsEnd(self, reqId):
+        if reqId == RECONCILE_EXEC_REQ_ID:
+            self.reconciled('executions')
+
+    def realtimeBar(self, reqId: TickerId, time, open_, high, low, close, volume, wap, count):
+        tickerId = reqId - BAR_REQ_ID_OFFSET
+        data = self.ticker_data.get(tickerId)
+        if data is None:
+            return
+        data['close'] = close
+        logging.info(f"{data['symbol']} 5s bar high {high} low {low} close {close}")
 
         
 
@@ -135,13 +460,9 @@ def run_bot(symbols):
     livePort = 7496
     paperTradePort = 7497
     app = OpeningRangeHigh(symbols, False)
-    app.connect('127.0.0.1', paperTradePort, clientId=1)
-
-
-    def run_loop():
-        app.run()
+    manager = ReconnectManager(app, '127.0.0.1', paperTradePort, clientId=1)
 
-    thread = Thread(target=app.run)
+    thread = Thread(target=manager.run)
     thread.start()
     time_module.sleep(1)
     # thread = threading.Thread(target=run_loop, daemon=True)
@@ -0,0 +1,73 @@
+import threading
+import time as time_module
+import logging
+
+INITIAL_BACKOFF_SECS = 1.0
+MAX_BACKOFF_SECS = 30.0
+# a session that lasted this long counts as healthy, the backoff starts over
+STABLE_SESSION_SECS = 60.0
+
+
+class ReconnectManager:
+    """Keeps an EClient connected.
+
+    run() connects and runs the client's message loop; when the connection
+    drops (socket error, TWS restart, nightly reset) it reconnects with
+    exponential backoff until stop() is called or `maxRetries` consecutive
+    attempts failed. A socket error raised out of the message loop (a send
+    from a callback hitting a dead connection) counts as a dropped
+    connection too. The client options set through the EClient setters
+    survive the reconnect, and TWS answers every connect with nextValidId,
+    which is where the client resynchronises its subscriptions and orders
+    (see OpeningRangeHigh.resync)."""
+
+    def __init__(self, app, host='127.0.0.1', port=7497, clientId=1, maxRetries=None,
+                 initialBackoff=INITIAL_BACKOFF_SECS, maxBackoff=MAX_BACKOFF_SECS):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.clientId = clientId
+        self.maxRetries = maxRetries
+        self.initialBackoff = initialBackoff
+        self.maxBackoff = maxBackoff
+        self.attempt = 0
+        self.sessions = 0
+        self.stopping = threading.Event()
+
+    def backoff(self):
+        return min(self.maxBackoff, self.initialBackoff * 2 ** (self.attempt - 1))
+
+    def run_session(self):
+        """One connect and message loop, returns once the connection is gone"""
+        self.app.connect(self.host, self.port, clientId=self.clientId)
+        if not self.app.isConnected():
+            return False
+        self.sessions += 1
+        started = time_module.monotonic()
+        logging.info(f'connected to {self.host}:{self.port} (session {self.sessions})')
+        self.app.run()
+        if time_module.monotonic() - started >= STABLE_SESSION_SECS:
+            self.attempt = 0
+        return True
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                self.run_session()
+            except OSError as e:
+                # EClient.run only handles receive errors, sends raise through it
+                logging.warning(f'connection to {self.host}:{self.port} failed: {e!r}')
+                self.app.disconnect()
+            if self.stopping.is_set():
+                break
+            self.attempt += 1
+            if self.maxRetries is not None and self.attempt > self.maxRetries:
+                logging.error(f'giving up after {self.maxRetries} reconnect attempts')
+                break
+            delay = self.backoff()
+            logging.warning(f'not connected to {self.host}:{self.port}, reconnect attempt {self.attempt} in {delay:.1f}s')
+            self.stopping.wait(delay)
+
+    def stop(self):
+        self.stopping.set()
+        self.app.disconnect()
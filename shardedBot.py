@@ -0,0 +1,159 @@
+from multiprocessing import Process, Queue
+import queue
+import time as time_module
+import logging
+
+from openingRangeHigh import OpeningRangeHigh
+from reconnectManager import ReconnectManager
+from subscriptionScheduler import SubscriptionScheduler, DEFAULT_MAX_LINES
+
+FIRST_CLIENT_ID = 1
+MAX_RESTARTS = 5
+RESTART_BACKOFF_SECS = 2.0
+SUMMARY_SECS = 30.0
+
+
+def run_shard(index, symbols, host, port, clientId, fills, botOptions):
+    """Worker process: one OpeningRangeHigh with its own connection and decode thread,
+    reconnecting on its own; the supervisor only restarts shards that crash"""
+    app = OpeningRangeHigh(symbols, False, fillReporter=lambda fill: fills.put((index, fill)), **botOptions)
+    ReconnectManager(app, host, port, clientId).run()
+
+
+class ShardSupervisor:
+    """Splits the symbol list over `numShards` worker processes.
+
+    Symbols are dealt out best first in round robin so every shard gets a
+    share of the strongest gappers, and the account's market data lines are
+    divided evenly between the shards. Fills come back over a
+    multiprocessing queue and are aggregated into per symbol positions and
+    realized PnL. A shard that exits before stop() is restarted with the
+    same clientId up to MAX_RESTARTS times, and reconciles the orders and
+    fills of the crashed worker on its first connect.
+
+    Every shard connects with its own clientId (FIRST_CLIENT_ID + index).
+    TWS keeps order ids per clientId, so the shards can't collide on ids
+    however far the account's nextValidId has grown."""
+
+    def __init__(self, symbols, numShards, host='127.0.0.1', port=7497, maxLines=DEFAULT_MAX_LINES, **botOptions):
+        self.host = host
+        self.port = port
+        self.fills = Queue()
+        self.botOptions = dict(botOptions, maxLines=max(1, maxLines // numShards))
+        ranked = sorted(symbols, key=SubscriptionScheduler.priority, reverse=True)
+        self.shards = [ranked[i::numShards] for i in range(numShards)]
+        self.processes = [None] * numShards
+        self.restarts = [0] * numShards
+        # monotonic time a crashed shard is due to be restarted, None while it runs
+        self.restartAt = [None] * numShards
+        self.seenExecIds = set()
+        self.positions = {}
+        self.realizedPnl = {}
+        self.stopping = False
+
+    def start_shard(self, index):
+        process = Process(target=run_shard, name=f'orb-shard-{index}',
+                          args=(index, self.shards[index], self.host, self.port,
+                                FIRST_CLIENT_ID + index, self.fills, self.botOptions))
+        process.start()
+        self.processes[index] = process
+        logging.info(f'shard {index} started (pid {process.pid}) with {len(self.shards[index])} symbols')
+
+    def start(self):
+        for index, shard in enumerate(self.shards):
+            if shard:
+                self.start_shard(index)
+
+    def check_shards(self):
+        for index, process in enumerate(self.processes):
+            if process is None or process.is_alive() or self.stopping:
+                continue
+            if self.restartAt[index] is None:
+                if self.restarts[index] >= MAX_RESTARTS:
+                    logging.error(f'shard {index} exited with {process.exitcode}, giving up after {MAX_RESTARTS} restarts')
+                    self.processes[index] = None
+                    continue
+                self.restarts[index] += 1
+                backoff = RESTART_BACKOFF_SECS * self.restarts[index]
+                logging.warning(f'shard {index} exited with {process.exitcode}, restart {self.restarts[index]} in {backoff}s')
+                # don't sleep here, fills from the other shards keep draining meanwhile
+                self.restartAt[index] = time_module.monotonic() + backoff
+            if time_module.monotonic() >= self.restartAt[index]:
+                self.restartAt[index] = None
+                self.start_shard(index)
+
+    def record_fill(self, index, fill):
+        # reqExecutions replays and corrections can deliver an execId twice
+        if fill['execId'] in self.seenExecIds:
+            return
+        self.seenExecIds.add(fill['execId'])
+
+        symbol = fill['symbol']
+        shares, cost = self.positions.get(symbol, (0.0, 0.0))
+        if fill['side'] == 'BOT':
+            shares, cost = shares + fill['shares'], cost + fill['shares'] * fill['price']
+        else:
+            avgCost = cost / shares if shares else fill['price']
+            pnl = (fill['price'] - avgCost) * fill['shares']
+            self.realizedPnl[symbol] = self.realizedPnl.get(symbol, 0.0) + pnl
+            shares, cost = shares - fill['shares'], cost - avgCost * fill['shares']
+        self.positions[symbol] = (shares, cost)
+        logging.info(f"shard {index} fill {fill['side']} {fill['shares']} {symbol} @ {fill['price']}")
+
+    def drain_fills(self, timeout):
+        try:
+            index, fill = self.fills.get(timeout=timeout)
+        except queue.Empty:
+            return
+        self.record_fill(index, fill)
+        while True:
+            try:
+                index, fill = self.fills.get_nowait()
+            except queue.Empty:
+                return
+            self.record_fill(index, fill)
+
+    def summary(self):
+        open_positions = {symbol: shares for symbol, (shares, _) in self.positions.items() if shares}
+        return {
+            'open_positions': open_positions,
+            'realized_pnl': round(sum(self.realizedPnl.values()), 2),
+            'pnl_by_symbol': {symbol: round(pnl, 2) for symbol, pnl in self.realizedPnl.items()},
+        }
+
+    def run(self):
+        self.start()
+        lastSummary = time_module.monotonic()
+        try:
+            while not self.stopping and any(self.processes):
+                self.drain_fills(timeout=1.0)
+                self.check_shards()
+                if time_module.monotonic() - lastSummary >= SUMMARY_SECS:
+                    logging.info(f'sharded bot summary {self.summary()}')
+                    lastSummary = time_module.monotonic()
+        finally:
+            self.stop()
+
+    def stop(self):
+        self.stopping = True
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+                process.join()
+
+
+if __name__ == '__main__':
+    ShardSupervisor([
+        {
+            'symbol': 'RRGB',
+            'positionSize': 700
+        },
+        {
+            'symbol': 'TIRX',
+            'positionSize': 900
+        },
+        {
+            'symbol': 'TSM',
+            'positionSize': 300
+        }
+    ], numShards=2).run()
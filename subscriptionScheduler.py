@@ -0,0 +1,214 @@
+from collections import deque
+import time as time_module
+import logging
+
+# TWS rejects clients that send more than 50 messages per second, keep some headroom
+MAX_MSG_PER_SEC = 45
+# default number of simultaneous reqMktData lines on a standard account
+DEFAULT_MAX_LINES = 100
+# real-time bars and tick-by-tick streams use their own request ids so they never clash with tickerIds
+BAR_REQ_ID_OFFSET = 10000
+TICK_BY_TICK_REQ_ID_OFFSET = 20000
+# TWS grants few simultaneous tick-by-tick subscriptions (3 on a base account)
+DEFAULT_MAX_TICK_BY_TICK = 3
+# how often streaming symbols are checked for demotion
+DEMOTE_CHECK_SECS = 1.0
+# done symbols kept on 5 second bars; 0 cancels their market data outright
+DEFAULT_MAX_BARS = 0
+# real-time bars are paced like historical data requests: 60 per 10 minutes
+BAR_REQ_PER_SEC = 60 / 600
+BAR_REQ_BURST = 60
+# a staged entry is re-sent at most this often while its range high keeps moving
+RESTAGE_INTERVAL_SECS = 1.0
+# parent, take profit and stop loss
+BRACKET_MSGS = 3
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`.
+
+    Forced consumption may drive the bucket negative, so latency critical
+    messages (orders) are never delayed but still slow down the scheduled
+    requests that follow them."""
+
+    def __init__(self, rate, capacity, clock=time_module.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.last = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def consume(self, tokens=1, force=False):
+        self.refill()
+        if self.tokens >= tokens or force:
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class SubscriptionScheduler:
+    """Hands out market data lines to the bot's symbols.
+
+    Symbols are subscribed best first (premarket change, then premarket
+    volume) while lines are free, and every request goes through a token
+    bucket so a few hundred scraped gappers don't trip the IB pacing limit.
+    Once a symbol no longer needs tick data (breakout taken or breakout
+    window over) its market data is cancelled, which frees its line for the
+    next symbol in the queue. Up to `maxBars` of those symbols are moved to
+    5 second real-time bars instead; a bar stream takes a line as well and
+    its requests go through a second bucket for the historical data pacing.
+    Symbols still queued when the opening range starts are dropped, they
+    would miss the range."""
+
+    def __init__(self, app, maxLines=DEFAULT_MAX_LINES, msgRate=MAX_MSG_PER_SEC,
+                 maxTickByTick=DEFAULT_MAX_TICK_BY_TICK, maxBars=DEFAULT_MAX_BARS,
+                 clock=time_module.monotonic):
+        self.app = app
+        self.maxLines = maxLines
+        self.maxTickByTick = maxTickByTick
+        self.maxBars = maxBars
+        self.clock = clock
+        self.bucket = TokenBucket(msgRate, msgRate, clock)
+        self.barBucket = TokenBucket(BAR_REQ_PER_SEC, BAR_REQ_BURST, clock)
+        self.pending = deque()
+        self.streaming = set()
+        self.barStreams = set()
+        self.tickByTick = set()
+        self.requests = deque()
+        self.barRequests = deque()
+        # tickerIds whose staged entry is to be re-sent, in marking order
+        self.restaging = {}
+        self.lastRestaged = {}
+        self.lastDemoteCheck = 0.0
+
+    @staticmethod
+    def priority(data):
+        return (data.get('premarket_change') or 0, data.get('premarket_volume') or 0)
+
+    def start(self, tickerIds):
+        ranked = sorted(tickerIds, key=lambda t: self.priority(self.app.ticker_data[t]), reverse=True)
+        self.pending.extend(ranked)
+        logging.info(f'scheduling {len(ranked)} symbols on {self.maxLines} market data lines')
+
+    def linesInUse(self):
+        return len(self.streaming) + len(self.barStreams)
+
+    def submit(self, fn, *args):
+        self.requests.append((fn, args))
+
+    def sendNow(self, count=1):
+        """Accounts for messages the bot sends outside the scheduler (orders)."""
+        self.bucket.consume(count, force=True)
+
+    def restage(self, tickerId):
+        """Marks a staged entry for re-sending from pump(), through the bucket
+        and at most once per RESTAGE_INTERVAL_SECS per symbol"""
+        self.restaging[tickerId] = None
+
+    def pumpRestages(self):
+        now = self.clock()
+        for tickerId in list(self.restaging):
+            if now - self.lastRestaged.get(tickerId, float('-inf')) < RESTAGE_INTERVAL_SECS:
+                continue
+            self.bucket.refill()
+            if self.bucket.tokens < BRACKET_MSGS:
+                return
+            del self.restaging[tickerId]
+            self.lastRestaged[tickerId] = now
+            # sends the bracket, its sendNow takes the tokens
+            self.app.restage(tickerId)
+
+    def promoteTickByTick(self, tickerId, tickType):
+        """Adds a tick-by-tick stream on top of the aggregated one if a slot is free"""
+        if tickerId in self.tickByTick or tickerId not in self.streaming:
+            return True
+        if len(self.tickByTick) >= self.maxTickByTick:
+            return False
+        self.tickByTick.add(tickerId)
+        logging.info(f"tick-by-tick {tickType} on for {self.app.ticker_data[tickerId]['symbol']}")
+        self.submit(self.app.reqTickByTickData, tickerId + TICK_BY_TICK_REQ_ID_OFFSET,
+                    self.app.contracts[tickerId], tickType, 0, True)
+        return True
+
+    def demoteTickByTick(self, tickerId):
+        if tickerId not in self.tickByTick:
+            return
+        self.tickByTick.discard(tickerId)
+        logging.info(f"tick-by-tick off for {self.app.ticker_data[tickerId]['symbol']}")
+        self.submit(self.app.cancelTickByTickData, tickerId + TICK_BY_TICK_REQ_ID_OFFSET)
+
+    def demote(self, tickerId):
+        if tickerId not in self.streaming:
+            return
+        self.demoteTickByTick(tickerId)
+        self.streaming.discard(tickerId)
+        self.submit(self.app.cancelMktData, tickerId)
+        if len(self.barStreams) >= self.maxBars:
+            logging.info(f"market data off for {self.app.ticker_data[tickerId]['symbol']}")
+            return
+        self.barStreams.add(tickerId)
+        logging.info(f"moving {self.app.ticker_data[tickerId]['symbol']} to 5 second bars")
+        self.submitBars(tickerId)
+
+    def submitBars(self, tickerId):
+        self.barRequests.append((self.app.reqRealTimeBars, (tickerId + BAR_REQ_ID_OFFSET,
+                                 self.app.contracts[tickerId], 5, 'TRADES', False, [])))
+
+    def checkDemotions(self):
+        now = self.clock()
+        if now - self.lastDemoteCheck < DEMOTE_CHECK_SECS:
+            return
+        self.lastDemoteCheck = now
+        for tickerId in list(self.streaming):
+            if self.app.needsTickData(tickerId) is False:
+                self.demote(tickerId)
+
+    def resubscribe(self):
+        """After a reconnect: the old connection took every stream with it.
+
+        Replays the streams the bot had (best first, then bars, then
+        tick-by-tick) through the token bucket. Queued requests are dropped,
+        the sets already hold the state they were heading for."""
+        self.requests.clear()
+        self.barRequests.clear()
+        contracts = self.app.contracts
+        ranked = sorted(self.streaming, key=lambda t: self.priority(self.app.ticker_data[t]), reverse=True)
+        for tickerId in ranked:
+            self.submit(self.app.reqMktData, tickerId, contracts[tickerId], '', False, False, [])
+        for tickerId in self.barStreams:
+            self.submitBars(tickerId)
+        for tickerId in self.tickByTick:
+            self.submit(self.app.reqTickByTickData, tickerId + TICK_BY_TICK_REQ_ID_OFFSET,
+                        contracts[tickerId], self.app.tickByTick, 0, True)
+        logging.info(f'replaying {len(self.requests) + len(self.barRequests)} subscriptions')
+
+    def pump(self):
+        """Called from the message loop; issues whatever the bucket allows."""
+        self.checkDemotions()
+
+        if self.pending and self.app.openingRangeStarted():
+            # a symbol subscribed now would miss (part of) its range and be demoted right away
+            logging.info(f'opening range started, {len(self.pending)} symbols left without market data')
+            self.pending.clear()
+
+        while self.pending and self.linesInUse() < self.maxLines:
+            tickerId = self.pending.popleft()
+            self.streaming.add(tickerId)
+            self.submit(self.app.reqMktData, tickerId, self.app.contracts[tickerId], '', False, False, [])
+
+        # orders before subscriptions
+        self.pumpRestages()
+
+        while self.requests and self.bucket.consume():
+            fn, args = self.requests.popleft()
+            fn(*args)
+
+        while self.barRequests and self.barBucket.consume():
+            fn, args = self.barRequests.popleft()
+            fn(*args)
+            self.sendNow()
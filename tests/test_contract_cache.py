@@ -0,0 +1,153 @@
+import unittest
+from unittest import mock
+
+from ibapi.client import EClient
+from ibapi.contract import ContractDetails
+from ibapi.message import OUT
+from ibapi.server_versions import MAX_CLIENT_VER
+
+from contractCache import ContractCache, ContractCacheWarmer, WARM_REQ_ID_OFFSET
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.sent.append(msg)
+        return len(msg)
+
+    def flush(self):
+        pass
+
+
+def contractDetails(conId, primaryExchange, minTick=0.01):
+    details = ContractDetails()
+    details.contract.conId = conId
+    details.contract.primaryExchange = primaryExchange
+    details.contract.currency = 'USD'
+    details.minTick = minTick
+    details.longName = f'company {conId}'
+    details.timeZoneId = 'US/Eastern'
+    details.tradingHours = '20240305:0400-20240305:2000'
+    details.liquidHours = '20240305:0930-20240305:1600'
+    return details
+
+
+class ContractCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = ContractCache(':memory:', maxAgeDays=1)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get('AAA'))
+        self.assertIsNone(self.cache.contract('AAA'))
+        self.cache.put('AAA', contractDetails(101, 'NASDAQ', 0.0001))
+
+        entry = self.cache.get('AAA')
+        self.assertEqual((101, 'NASDAQ', 0.0001, 'US/Eastern'),
+                         (entry['conId'], entry['primaryExchange'], entry['minTick'], entry['timeZoneId']))
+        self.assertEqual('20240305:0930-20240305:1600', entry['liquidHours'])
+
+        contract = self.cache.contract('AAA')
+        self.assertEqual((101, 'AAA', 'STK', 'SMART', 'NASDAQ', 'USD'),
+                         (contract.conId, contract.symbol, contract.secType, contract.exchange,
+                          contract.primaryExchange, contract.currency))
+
+    def test_put_replaces(self):
+        self.cache.put('AAA', contractDetails(101, 'NASDAQ'))
+        self.cache.put('AAA', contractDetails(102, 'NYSE'))
+        self.assertEqual(102, self.cache.contract('AAA').conId)
+
+    def test_entries_expire(self):
+        with mock.patch('contractCache.time_module.time', return_value=1000.0):
+            self.cache.put('AAA', contractDetails(101, 'NASDAQ'))
+        with mock.patch('contractCache.time_module.time', return_value=1000.0 + 86400):
+            self.assertIsNotNone(self.cache.get('AAA'))
+        with mock.patch('contractCache.time_module.time', return_value=1001.0 + 86400):
+            self.assertIsNone(self.cache.get('AAA'))
+            self.assertIsNone(self.cache.contract('AAA'))
+            self.assertEqual(['AAA'], self.cache.missing(['AAA']))
+
+    def test_missing(self):
+        self.cache.put('BBB', contractDetails(102, 'NYSE'))
+        self.assertEqual(['AAA', 'CCC'], self.cache.missing(['AAA', 'BBB', 'CCC', 'AAA']))
+
+
+class ContractCacheWarmerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = ContractCache(':memory:')
+        self.cache.put('CCC', contractDetails(103, 'NYSE'))
+        self.warmer = ContractCacheWarmer(self.cache, ['AAA', 'BBB', 'CCC'])
+        self.warmer.conn = FakeConnection()
+        self.warmer.serverVersion_ = MAX_CLIENT_VER
+        self.warmer.setConnState(EClient.CONNECTED)
+        self.disconnects = 0
+        self.warmer.disconnect = self.disconnect
+
+    def tearDown(self):
+        self.cache.close()
+
+    def disconnect(self):
+        self.disconnects += 1
+
+    def reqIds(self):
+        reqIds = {}
+        for msg in self.warmer.conn.sent:
+            fields = msg[4:].split(b"\0")
+            if fields[0] == str(OUT.REQ_CONTRACT_DATA).encode():
+                reqIds[int(fields[2])] = fields[4].decode()
+        return {symbol: reqId for reqId, symbol in reqIds.items()}
+
+    def test_requests_missing_symbols_only(self):
+        self.warmer.nextValidId(1)
+        reqIds = self.reqIds()
+        self.assertEqual({'AAA', 'BBB'}, set(reqIds))
+        self.assertEqual(set(reqIds.values()), self.warmer.outstanding)
+        self.assertEqual(0, self.disconnects)
+
+    def test_ambiguous_symbol_prefers_primary_exchange(self):
+        self.warmer.nextValidId(1)
+        reqId = self.reqIds()['AAA']
+        self.warmer.contractDetails(reqId, contractDetails(201, 'PINK'))
+        self.warmer.contractDetails(reqId, contractDetails(202, 'NASDAQ'))
+        self.warmer.contractDetailsEnd(reqId)
+        self.assertEqual(202, self.cache.contract('AAA').conId)
+        self.assertEqual(1, self.warmer.resolved)
+
+    def test_unknown_symbol_skipped(self):
+        self.warmer.nextValidId(1)
+        reqId = self.reqIds()['BBB']
+        self.warmer.error(reqId, 200, 'No security definition has been found for the request')
+        self.assertNotIn(reqId, self.warmer.outstanding)
+        self.assertIsNone(self.cache.get('BBB'))
+        self.warmer.error(reqId, 200, 'No security definition has been found for the request')
+
+    def test_other_errors_logged(self):
+        self.warmer.nextValidId(1)
+        with self.assertLogs('ibapi.wrapper', 'ERROR') as logs:
+            self.warmer.error(-1, 1100, 'Connectivity between IB and Trader Workstation has been lost.')
+        self.assertIn('1100', logs.output[0])
+        self.assertEqual(2, len(self.warmer.outstanding))
+
+    def test_disconnects_when_done(self):
+        self.warmer.nextValidId(1)
+        reqIds = self.reqIds()
+        self.warmer.contractDetails(reqIds['AAA'], contractDetails(201, 'NASDAQ'))
+        self.warmer.contractDetailsEnd(reqIds['AAA'])
+        self.warmer.msgLoopRec()
+        self.assertEqual(0, self.disconnects)
+        self.warmer.error(reqIds['BBB'], 200, 'No security definition has been found for the request')
+        self.warmer.msgLoopRec()
+        self.assertEqual(1, self.disconnects)
+        self.assertEqual(1, self.warmer.resolved)
+        self.assertEqual(WARM_REQ_ID_OFFSET, min(reqIds.values()))
+
+
+if "__main__" == __name__:
+    unittest.main()
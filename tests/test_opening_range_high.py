@@ -0,0 +1,363 @@
+import unittest
+from datetime import datetime
+
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.execution import Execution
+from ibapi.message import OUT
+from ibapi.order import Order
+from ibapi.order_state import OrderState
+from ibapi.server_versions import MAX_CLIENT_VER
+
+from openingRangeHigh import OpeningRangeHigh, RECONCILE_EXEC_REQ_ID
+from subscriptionScheduler import (
+    TokenBucket,
+    BAR_REQ_ID_OFFSET,
+    TICK_BY_TICK_REQ_ID_OFFSET,
+    MAX_MSG_PER_SEC,
+    RESTAGE_INTERVAL_SECS,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.sent.append(msg)
+        return len(msg)
+
+    def flush(self):
+        pass
+
+
+def connect(app, clientId=1):
+    app.clientId = clientId
+    app.conn = FakeConnection()
+    app.serverVersion_ = MAX_CLIENT_VER
+    app.setConnState(EClient.CONNECTED)
+    return app.conn
+
+
+def pacedClock(app):
+    """puts the scheduler's pacing on a clock the test moves"""
+    clock = FakeClock()
+    app.scheduler.clock = clock
+    app.scheduler.bucket = TokenBucket(MAX_MSG_PER_SEC, MAX_MSG_PER_SEC, clock)
+    return clock
+
+
+def tick(app, tickerId, price):
+    """a new ask, then a later message loop pass that sends what it marked"""
+    app.tickPrice(tickerId, 2, price, None)
+    app.scheduler.clock.now += RESTAGE_INTERVAL_SECS
+    app.scheduler.pump()
+
+
+def sentFields(conn, msgId):
+    """fields of the messages of one type sent so far, without the msgId"""
+    messages = [msg[4:].split(b"\0")[:-1] for msg in conn.sent]
+    return [fields[1:] for fields in messages if fields[0] == str(msgId).encode()]
+
+
+def placedOrderIds(conn):
+    return [int(fields[0]) for fields in sentFields(conn, OUT.PLACE_ORDER)]
+
+
+def requestIds(conn, msgId):
+    """reqIds of the market data requests of one type sent so far"""
+    # reqTickByTickData has no version field
+    index = 0 if msgId == OUT.REQ_TICK_BY_TICK_DATA else 1
+    return sorted(int(fields[index]) for fields in sentFields(conn, msgId))
+
+
+def reconciled(app):
+    app.openOrderEnd()
+    app.execDetailsEnd(RECONCILE_EXEC_REQ_ID)
+
+
+def contractOf(symbol):
+    contract = Contract()
+    contract.symbol = symbol
+    return contract
+
+
+def entryOrder(orderType, auxPrice, clientId=1):
+    order = Order()
+    order.action = 'BUY'
+    order.orderType = orderType
+    order.auxPrice = auxPrice
+    order.clientId = clientId
+    return order
+
+
+def orderState(status):
+    state = OrderState()
+    state.status = status
+    return state
+
+
+def execution(orderId, side, clientId=1):
+    execution = Execution()
+    execution.execId = f'exec{orderId}'
+    execution.orderId = orderId
+    execution.side = side
+    execution.price = 10.0
+    execution.clientId = clientId
+    return execution
+
+
+SYMBOLS = [
+    {'symbol': 'AAA', 'positionSize': 1000},
+    {'symbol': 'BBB', 'positionSize': 1000},
+]
+
+
+class PreStageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = OpeningRangeHigh(SYMBOLS, True, preStage='STP')
+        self.clock = pacedClock(self.app)
+        self.conn = connect(self.app)
+        self.app.nextValidId(1)
+        reconciled(self.app)
+        self.conn.sent.clear()
+
+    def test_new_high_modifies_staged_bracket(self):
+        tick(self.app, 0, 10.0)
+        self.assertEqual([1, 2, 3], placedOrderIds(self.conn))
+        self.assertEqual(1, self.app.ticker_data[0]['staged_order_id'])
+
+        tick(self.app, 0, 10.5)
+        self.assertEqual([1, 2, 3, 1, 2, 3], placedOrderIds(self.conn))
+        self.assertEqual(10.5, self.app.ticker_data[0]['staged_high'])
+        self.assertEqual(4, self.app.next_order_id)
+
+    def test_lower_price_leaves_stage_alone(self):
+        tick(self.app, 0, 10.0)
+        tick(self.app, 0, 9.8)
+        self.assertEqual([1, 2, 3], placedOrderIds(self.conn))
+
+    def test_restaged_at_most_once_per_interval(self):
+        tick(self.app, 0, 10.0)
+        self.app.tickPrice(0, 2, 10.5, None)
+        self.app.scheduler.pump()
+        self.clock.now += RESTAGE_INTERVAL_SECS / 2
+        self.app.tickPrice(0, 2, 10.6, None)
+        self.app.scheduler.pump()
+        self.assertEqual([1, 2, 3], placedOrderIds(self.conn))
+        self.clock.now += RESTAGE_INTERVAL_SECS / 2
+        self.app.scheduler.pump()
+        self.assertEqual([1, 2, 3, 1, 2, 3], placedOrderIds(self.conn))
+        self.assertEqual(10.6, self.app.ticker_data[0]['staged_high'])
+
+    def test_restages_paced_by_bucket(self):
+        symbols = [{'symbol': f'S{i}', 'positionSize': 1000} for i in range(30)]
+        self.app = OpeningRangeHigh(symbols, True, preStage='STP')
+        self.clock = pacedClock(self.app)
+        self.conn = connect(self.app)
+        self.app.nextValidId(1)
+        reconciled(self.app)
+        self.clock.now += 1.0
+        self.app.scheduler.pump()
+        for tickerId in range(30):
+            self.app.tickPrice(tickerId, 2, 10.0, None)
+        self.app.scheduler.pump()
+        self.assertEqual(MAX_MSG_PER_SEC, len(placedOrderIds(self.conn)))
+        self.clock.now += 1.0
+        self.app.scheduler.pump()
+        self.assertEqual(90, len(placedOrderIds(self.conn)))
+
+    def test_staged_entries_cancelled_after_breakout_window(self):
+        tick(self.app, 0, 10.0)
+        tick(self.app, 1, 10.0)
+        self.app.entryFilled(4, 10.01)
+        self.app.testFlow = False
+        self.app.inOpeningRange = lambda now: False
+        self.app.inBreakoutWindow = lambda now: False
+        self.app.isMarketOpen = lambda now: True
+
+        self.app.cancelStagedEntries()
+        self.app.cancelStagedEntries()
+        self.app.scheduler.pump()
+        # version, orderId
+        self.assertEqual([1], [int(fields[1]) for fields in sentFields(self.conn, OUT.CANCEL_ORDER)])
+        self.assertIsNone(self.app.ticker_data[0]['staged_order_id'])
+
+        self.app.ticker_data[0]['high'] = 11.0
+        self.app.restage(0)
+        self.assertEqual([1, 2, 3, 4, 5, 6], placedOrderIds(self.conn))
+
+    def test_range_end(self):
+        self.assertEqual(datetime(2024, 3, 5, 23, 35), self.app.openingRangeEnd(datetime(2024, 3, 5, 23, 31)))
+        self.assertEqual(datetime(2024, 3, 5, 23, 35), self.app.openingRangeEnd(datetime(2024, 3, 6, 0, 20)))
+
+    def test_staged_entry_good_after_range_end(self):
+        self.app.testFlow = False
+        self.app.bracket_templates[0] = self.app.compile_bracket(self.app.contracts[0])
+        self.app.ticker_data[0]['high'] = 10.0
+        self.app.stage_bracket_order(0)
+        goodAfterTime = self.app.openingRangeEnd(datetime.now()).strftime('%Y%m%d %H:%M:%S').encode()
+        (parent, takeProfit, stopLoss) = sentFields(self.conn, OUT.PLACE_ORDER)
+        self.assertIn(goodAfterTime, parent)
+        self.assertNotIn(goodAfterTime, takeProfit)
+
+
+class ReconcileTestCase(unittest.TestCase):
+    """A restarted bot (or shard) must pick up the entries of the run before it"""
+
+    def restart(self, preStage=None):
+        self.app = OpeningRangeHigh(SYMBOLS, True, preStage=preStage)
+        self.clock = pacedClock(self.app)
+        self.conn = connect(self.app)
+        self.app.nextValidId(1)
+        for data in self.app.ticker_data.values():
+            data['open'] = data['high'] = 10.0
+
+    def test_first_connect_requests_orders_and_executions(self):
+        self.restart()
+        self.assertEqual(1, len(sentFields(self.conn, OUT.REQ_OPEN_ORDERS)))
+        self.assertEqual(1, len(sentFields(self.conn, OUT.REQ_EXECUTIONS)))
+
+    def test_nothing_entered_before_reconciled(self):
+        self.restart()
+        self.app.checkBreakout(0, 11.0)
+        self.assertEqual([], placedOrderIds(self.conn))
+        self.app.openOrderEnd()
+        self.app.checkBreakout(0, 11.0)
+        self.assertEqual([], placedOrderIds(self.conn))
+        self.app.execDetailsEnd(RECONCILE_EXEC_REQ_ID)
+        self.app.checkBreakout(0, 11.0)
+        self.assertEqual([1, 2, 3], placedOrderIds(self.conn))
+
+    def test_earlier_fill_blocks_second_entry(self):
+        self.restart()
+        self.app.execDetails(RECONCILE_EXEC_REQ_ID, contractOf('AAA'), execution(40, 'BOT'))
+        self.app.execDetails(RECONCILE_EXEC_REQ_ID, contractOf('BBB'), execution(45, 'SLD'))
+        reconciled(self.app)
+        self.assertTrue(self.app.ticker_data[0]['breakout_triggered'])
+        self.assertFalse(self.app.ticker_data[1]['breakout_triggered'])
+        self.assertEqual(46, self.app.next_order_id)
+
+        self.app.checkBreakout(0, 11.0)
+        self.assertEqual([], placedOrderIds(self.conn))
+        self.app.checkBreakout(1, 11.0)
+        self.assertEqual([46, 47, 48], placedOrderIds(self.conn))
+
+    def test_working_market_entry_blocks_second_entry(self):
+        self.restart()
+        self.app.openOrder(40, contractOf('AAA'), entryOrder('MKT', 0.0), orderState('Submitted'))
+        self.app.openOrder(50, contractOf('BBB'), entryOrder('MKT', 0.0), orderState('Cancelled'))
+        reconciled(self.app)
+        self.assertTrue(self.app.ticker_data[0]['breakout_triggered'])
+        self.assertFalse(self.app.ticker_data[1]['breakout_triggered'])
+
+    def test_other_clients_orders_ignored(self):
+        self.restart()
+        self.app.openOrder(40, contractOf('AAA'), entryOrder('MKT', 0.0, clientId=2), orderState('Submitted'))
+        self.app.execDetails(RECONCILE_EXEC_REQ_ID, contractOf('BBB'), execution(60, 'BOT', clientId=2))
+        reconciled(self.app)
+        self.assertFalse(self.app.ticker_data[0]['breakout_triggered'])
+        self.assertFalse(self.app.ticker_data[1]['breakout_triggered'])
+        self.assertEqual(1, self.app.next_order_id)
+
+    def test_staged_entry_is_modified_not_doubled(self):
+        self.restart(preStage='STP')
+        self.app.openOrder(40, contractOf('AAA'), entryOrder('STP', 10.01), orderState('PreSubmitted'))
+        reconciled(self.app)
+        data = self.app.ticker_data[0]
+        self.assertEqual((40, 10.0), (data['staged_order_id'], data['staged_high']))
+
+        tick(self.app, 0, 10.4)
+        self.assertEqual([40, 41, 42], placedOrderIds(self.conn))
+        # range closed
+        self.app.inOpeningRange = lambda now: False
+        self.app.stageClosedRanges()
+        self.clock.now += RESTAGE_INTERVAL_SECS
+        self.app.scheduler.pump()
+        self.assertEqual([40, 41, 42, 43, 44, 45], placedOrderIds(self.conn))
+        self.assertEqual(43, self.app.ticker_data[1]['staged_order_id'])
+
+
+class ResyncTestCase(unittest.TestCase):
+    """Reconnect of a running bot: nextValidId comes again on the new connection"""
+
+    def setUp(self):
+        self.app = OpeningRangeHigh(SYMBOLS + [{'symbol': 'CCC', 'positionSize': 1000}], True,
+                                    tickByTick='BidAsk', preStage='STP', maxBars=1)
+        self.clock = pacedClock(self.app)
+        self.conn = connect(self.app)
+        self.app.nextValidId(1)
+        reconciled(self.app)
+
+    def reconnect(self, orderId):
+        self.conn = connect(self.app)
+        self.app.nextValidId(orderId)
+
+    def test_order_id_never_goes_backwards(self):
+        tick(self.app, 0, 10.0)
+        self.assertEqual(4, self.app.next_order_id)
+        self.reconnect(2)
+        self.assertEqual(4, self.app.next_order_id)
+
+        takeProfit = entryOrder('LMT', 0.0)
+        takeProfit.action = 'SELL'
+        takeProfit.parentId = 1
+        self.app.openOrder(9, contractOf('AAA'), takeProfit, orderState('Submitted'))
+        self.assertEqual(10, self.app.next_order_id)
+        self.app.openOrder(3, contractOf('AAA'), takeProfit, orderState('Submitted'))
+        self.app.execDetails(RECONCILE_EXEC_REQ_ID, contractOf('AAA'), execution(2, 'SLD'))
+        self.assertEqual(10, self.app.next_order_id)
+        reconciled(self.app)
+
+        self.reconnect(5)
+        self.assertEqual(10, self.app.next_order_id)
+        self.reconnect(12)
+        self.assertEqual(12, self.app.next_order_id)
+
+    def test_replayed_streams_match_scheduler(self):
+        scheduler = self.app.scheduler
+        scheduler.promoteTickByTick(1, 'BidAsk')
+        scheduler.demote(2)
+        scheduler.pump()
+        self.assertEqual(({0, 1}, {2}, {1}), (scheduler.streaming, scheduler.barStreams, scheduler.tickByTick))
+
+        self.reconnect(4)
+        self.assertEqual([0, 1], requestIds(self.conn, OUT.REQ_MKT_DATA))
+        self.assertEqual([2 + BAR_REQ_ID_OFFSET], requestIds(self.conn, OUT.REQ_REAL_TIME_BARS))
+        self.assertEqual([1 + TICK_BY_TICK_REQ_ID_OFFSET], requestIds(self.conn, OUT.REQ_TICK_BY_TICK_DATA))
+        self.assertEqual([], requestIds(self.conn, OUT.CANCEL_MKT_DATA))
+
+    def test_resync_reconciles(self):
+        self.reconnect(4)
+        self.assertEqual(1, len(sentFields(self.conn, OUT.REQ_OPEN_ORDERS)))
+        self.assertEqual(1, len(sentFields(self.conn, OUT.REQ_EXECUTIONS)))
+        self.assertEqual({'orders', 'executions'}, self.app.reconciling)
+        self.assertEqual(3, len(self.app.bracket_templates))
+
+    def test_staged_entry_filled_while_disconnected(self):
+        tick(self.app, 0, 10.0)
+        self.assertEqual(1, self.app.ticker_data[0]['staged_order_id'])
+
+        self.reconnect(4)
+        self.app.execDetails(RECONCILE_EXEC_REQ_ID, contractOf('AAA'), execution(1, 'BOT'))
+        reconciled(self.app)
+        self.assertTrue(self.app.ticker_data[0]['breakout_triggered'])
+
+        self.conn.sent.clear()
+        tick(self.app, 0, 10.5)
+        self.assertEqual([], placedOrderIds(self.conn))
+
+
+if "__main__" == __name__:
+    unittest.main()
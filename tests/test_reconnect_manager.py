@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from reconnectManager import ReconnectManager
+
+
+class FakeApp:
+    """Plays one scripted outcome per connect: 'refused', 'dropped' or an exception
+    raised out of run(); stops the manager once the script is done"""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.manager = None
+        self.connected = False
+        self.connects = 0
+        self.disconnects = 0
+        self.outcome = None
+
+    def connect(self, host, port, clientId):
+        self.connects += 1
+        self.outcome = self.script.pop(0)
+        self.connected = self.outcome != 'refused'
+        if not self.script:
+            self.manager.stopping.set()
+
+    def isConnected(self):
+        return self.connected
+
+    def run(self):
+        self.connected = False
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+
+    def disconnect(self):
+        self.disconnects += 1
+        self.connected = False
+
+
+def manager(script, **kwargs):
+    app = FakeApp(script)
+    app.manager = ReconnectManager(app, initialBackoff=0, **kwargs)
+    return app.manager
+
+
+class ReconnectManagerTestCase(unittest.TestCase):
+    def test_send_error_reconnects(self):
+        m = manager([BrokenPipeError(32, 'Broken pipe'), 'dropped'])
+        m.run()
+        self.assertEqual(2, m.app.connects)
+        self.assertEqual(2, m.sessions)
+        self.assertEqual(1, m.app.disconnects)
+
+    def test_backoff_doubles_up_to_max(self):
+        m = ReconnectManager(FakeApp([]), initialBackoff=1, maxBackoff=5)
+        delays = []
+        for attempt in range(1, 6):
+            m.attempt = attempt
+            delays.append(m.backoff())
+        self.assertEqual([1, 2, 4, 5, 5], delays)
+
+    def test_gives_up_after_max_retries(self):
+        m = manager(['refused'] * 10, maxRetries=3)
+        m.run()
+        self.assertEqual(4, m.app.connects)
+        self.assertEqual(0, m.sessions)
+        self.assertEqual(4, m.attempt)
+
+    def test_unlimited_retries_until_stopped(self):
+        m = manager(['refused'] * 10)
+        m.run()
+        self.assertEqual(10, m.app.connects)
+
+    def record_attempts(self, m):
+        attempts = []
+        backoff = m.backoff
+        m.backoff = lambda: attempts.append(m.attempt) or backoff()
+        return attempts
+
+    def test_short_sessions_keep_backing_off(self):
+        m = manager(['refused', 'dropped', 'refused', 'dropped'])
+        attempts = self.record_attempts(m)
+        m.run()
+        self.assertEqual([1, 2, 3], attempts)
+
+    def test_stable_session_resets_backoff(self):
+        m = manager(['refused', 'refused', 'dropped', 'refused', 'dropped'])
+        attempts = self.record_attempts(m)
+        with mock.patch('reconnectManager.STABLE_SESSION_SECS', 0.0):
+            m.run()
+        self.assertEqual([1, 2, 1, 2], attempts)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest import mock
+
+from shardedBot import ShardSupervisor, MAX_RESTARTS, RESTART_BACKOFF_SECS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProcess:
+    def __init__(self, alive=True, exitcode=None):
+        self.alive = alive
+        self.exitcode = exitcode
+
+    def is_alive(self):
+        return self.alive
+
+
+def fill(execId, side, shares, price, symbol='AAA'):
+    return {'execId': execId, 'symbol': symbol, 'side': side, 'shares': shares, 'price': price}
+
+
+class RecordFillTestCase(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = ShardSupervisor([{'symbol': 'AAA'}, {'symbol': 'BBB'}], numShards=2)
+
+    def test_duplicate_exec_ids_ignored(self):
+        self.supervisor.record_fill(0, fill('e1', 'BOT', 100, 10.0))
+        self.supervisor.record_fill(0, fill('e1', 'BOT', 100, 10.0))
+        self.assertEqual((100, 1000.0), self.supervisor.positions['AAA'])
+
+    def test_realized_pnl_at_average_cost(self):
+        self.supervisor.record_fill(0, fill('e1', 'BOT', 100, 10.0))
+        self.supervisor.record_fill(0, fill('e2', 'BOT', 100, 12.0))
+        self.supervisor.record_fill(0, fill('e3', 'SLD', 50, 13.0))
+        self.supervisor.record_fill(1, fill('e4', 'BOT', 10, 5.0, symbol='BBB'))
+        self.supervisor.record_fill(1, fill('e5', 'SLD', 10, 4.5, symbol='BBB'))
+        self.assertEqual((150, 1650.0), self.supervisor.positions['AAA'])
+        self.assertEqual({
+            'open_positions': {'AAA': 150},
+            'realized_pnl': 95.0,
+            'pnl_by_symbol': {'AAA': 100.0, 'BBB': -5.0},
+        }, self.supervisor.summary())
+
+
+class CheckShardsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = ShardSupervisor([{'symbol': 'AAA'}, {'symbol': 'BBB'}], numShards=2)
+        self.supervisor.processes = [FakeProcess(), FakeProcess()]
+        self.started = []
+        self.supervisor.start_shard = self.start_shard
+        self.clock = FakeClock()
+        patcher = mock.patch('shardedBot.time_module.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start_shard(self, index):
+        self.started.append(index)
+        self.supervisor.processes[index] = FakeProcess()
+
+    def crash(self, index):
+        self.supervisor.processes[index] = FakeProcess(alive=False, exitcode=1)
+
+    def test_restart_after_backoff_without_blocking(self):
+        self.crash(1)
+        self.supervisor.check_shards()
+        self.assertEqual([], self.started)
+        self.assertEqual(RESTART_BACKOFF_SECS, self.supervisor.restartAt[1])
+
+        self.clock.now += RESTART_BACKOFF_SECS / 2
+        self.supervisor.check_shards()
+        self.assertEqual([], self.started)
+
+        self.clock.now += RESTART_BACKOFF_SECS / 2
+        self.supervisor.check_shards()
+        self.assertEqual([1], self.started)
+        self.assertEqual([0, 1], self.supervisor.restarts)
+        self.assertIsNone(self.supervisor.restartAt[1])
+
+    def test_backoff_grows_with_restarts(self):
+        self.supervisor.restarts[0] = 2
+        self.crash(0)
+        self.supervisor.check_shards()
+        self.assertEqual(3 * RESTART_BACKOFF_SECS, self.supervisor.restartAt[0])
+
+    def test_gives_up_after_max_restarts(self):
+        for _ in range(MAX_RESTARTS):
+            self.crash(0)
+            self.supervisor.check_shards()
+            self.clock.now += RESTART_BACKOFF_SECS * MAX_RESTARTS
+            self.supervisor.check_shards()
+        self.assertEqual([0] * MAX_RESTARTS, self.started)
+
+        self.crash(0)
+        self.supervisor.check_shards()
+        self.assertIsNone(self.supervisor.processes[0])
+        self.assertEqual([0] * MAX_RESTARTS, self.started)
+        self.assertTrue(any(self.supervisor.processes))
+
+    def test_no_restart_when_stopping(self):
+        self.crash(0)
+        self.supervisor.stopping = True
+        self.supervisor.check_shards()
+        self.clock.now += RESTART_BACKOFF_SECS
+        self.supervisor.check_shards()
+        self.assertEqual([], self.started)
+        self.assertEqual(0, self.supervisor.restarts[0])
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+
+from subscriptionScheduler import (
+    SubscriptionScheduler,
+    TokenBucket,
+    BAR_REQ_ID_OFFSET,
+    BAR_REQ_BURST,
+    TICK_BY_TICK_REQ_ID_OFFSET,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeApp:
+    """Records the requests the scheduler sends"""
+
+    def __init__(self, count):
+        self.ticker_data = {
+            i: {'symbol': f'SYM{i}', 'premarket_change': i, 'premarket_volume': 0} for i in range(count)
+        }
+        self.contracts = {i: f'contract{i}' for i in range(count)}
+        self.tickByTick = 'BidAsk'
+        self.done = set()
+        self.rangeStarted = False
+        self.sent = []
+
+    def openingRangeStarted(self):
+        return self.rangeStarted
+
+    def needsTickData(self, tickerId):
+        return False if tickerId in self.done else None
+
+    def reqMktData(self, reqId, *args):
+        self.sent.append(('reqMktData', reqId))
+
+    def cancelMktData(self, reqId):
+        self.sent.append(('cancelMktData', reqId))
+
+    def reqRealTimeBars(self, reqId, *args):
+        self.sent.append(('reqRealTimeBars', reqId))
+
+    def reqTickByTickData(self, reqId, *args):
+        self.sent.append(('reqTickByTickData', reqId))
+
+    def cancelTickByTickData(self, reqId):
+        self.sent.append(('cancelTickByTickData', reqId))
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(10, 5, self.clock)
+
+    def test_capacity(self):
+        self.assertEqual(5, sum(self.bucket.consume() for _ in range(8)))
+
+    def test_refill(self):
+        while self.bucket.consume():
+            pass
+        self.clock.now += 0.25
+        self.assertEqual(2, sum(self.bucket.consume() for _ in range(5)))
+        self.clock.now += 100
+        self.bucket.refill()
+        self.assertEqual(5, self.bucket.tokens)
+
+    def test_forced_consumption_goes_negative(self):
+        self.assertTrue(self.bucket.consume(8, force=True))
+        self.assertEqual(-3, self.bucket.tokens)
+        self.assertFalse(self.bucket.consume())
+        self.clock.now += 0.4
+        self.assertTrue(self.bucket.consume())
+
+
+class SubscriptionSchedulerTestCase(unittest.TestCase):
+    def scheduler(self, count, maxLines, maxBars=0, maxTickByTick=3):
+        self.clock = FakeClock()
+        self.app = FakeApp(count)
+        scheduler = SubscriptionScheduler(self.app, maxLines, msgRate=1000, maxTickByTick=maxTickByTick,
+                                          maxBars=maxBars, clock=self.clock)
+        scheduler.start(list(self.app.ticker_data))
+        scheduler.pump()
+        return scheduler
+
+    def demote(self, scheduler, *tickerIds):
+        self.app.done.update(tickerIds)
+        self.clock.now += 1.0
+        scheduler.pump()
+
+    def test_best_first_within_lines(self):
+        scheduler = self.scheduler(5, maxLines=3)
+        self.assertEqual([('reqMktData', 4), ('reqMktData', 3), ('reqMktData', 2)], self.app.sent)
+        self.assertEqual(3, scheduler.linesInUse())
+        self.assertEqual([1, 0], list(scheduler.pending))
+
+    def test_demote_cancels_and_frees_line(self):
+        scheduler = self.scheduler(5, maxLines=3)
+        self.app.sent.clear()
+        self.demote(scheduler, 4)
+        self.assertEqual([('cancelMktData', 4), ('reqMktData', 1)], self.app.sent)
+        self.assertEqual({3, 2, 1}, scheduler.streaming)
+        self.assertEqual(set(), scheduler.barStreams)
+        self.assertEqual(3, scheduler.linesInUse())
+
+    def test_no_promotion_once_range_started(self):
+        scheduler = self.scheduler(5, maxLines=3)
+        self.app.sent.clear()
+        self.app.rangeStarted = True
+        self.demote(scheduler, 4)
+        self.assertEqual([('cancelMktData', 4)], self.app.sent)
+        self.assertEqual(0, len(scheduler.pending))
+        self.assertEqual(2, scheduler.linesInUse())
+
+    def test_bar_streams_take_lines(self):
+        scheduler = self.scheduler(5, maxLines=3, maxBars=1)
+        self.app.sent.clear()
+        self.demote(scheduler, 4, 3)
+        self.assertEqual(1, len(scheduler.barStreams))
+        self.assertEqual(3, scheduler.linesInUse())
+        self.assertEqual({2, 1}, scheduler.streaming)
+        bars = [reqId - BAR_REQ_ID_OFFSET for name, reqId in self.app.sent if name == 'reqRealTimeBars']
+        self.assertEqual(list(scheduler.barStreams), bars)
+        self.assertIn(('cancelMktData', 4), self.app.sent)
+        self.assertIn(('cancelMktData', 3), self.app.sent)
+        self.assertEqual(1, self.app.sent.count(('reqMktData', 1)))
+        self.assertNotIn(('reqMktData', 0), self.app.sent)
+
+    def test_bar_requests_paced(self):
+        scheduler = self.scheduler(BAR_REQ_BURST + 2, maxLines=BAR_REQ_BURST + 2, maxBars=BAR_REQ_BURST + 2)
+        self.demote(scheduler, *self.app.ticker_data)
+        bars = [name for name, _ in self.app.sent if name == 'reqRealTimeBars']
+        self.assertEqual(BAR_REQ_BURST, len(bars))
+        self.assertEqual(2, len(scheduler.barRequests))
+        self.clock.now += 10
+        scheduler.pump()
+        self.assertEqual(1, len(scheduler.barRequests))
+
+    def test_tick_by_tick_slots(self):
+        scheduler = self.scheduler(3, maxLines=3, maxTickByTick=1)
+        self.app.sent.clear()
+        self.assertTrue(scheduler.promoteTickByTick(2, 'BidAsk'))
+        self.assertFalse(scheduler.promoteTickByTick(1, 'BidAsk'))
+        self.demote(scheduler, 2)
+        self.assertTrue(scheduler.promoteTickByTick(1, 'BidAsk'))
+        scheduler.pump()
+        self.assertEqual([
+            ('reqTickByTickData', 2 + TICK_BY_TICK_REQ_ID_OFFSET),
+            ('cancelTickByTickData', 2 + TICK_BY_TICK_REQ_ID_OFFSET),
+            ('cancelMktData', 2),
+            ('reqTickByTickData', 1 + TICK_BY_TICK_REQ_ID_OFFSET),
+        ], self.app.sent)
+
+
+if "__main__" == __name__:
+    unittest.main()